@@ -1,4 +1,18 @@
-import re
+import sys
+import sqlite3
+import argparse
+
+from batch_mode import BatchSession, add_batch_arguments, run_batch_cli
+from encoding_detect import read_text
+from field_extractor import FIELDS, STUDENT_FIELDS, normalize_name
+from instrumentation import add_instrument_arguments, configure as configure_instrumentation, run_profiled
+from parse_cache import DEFAULT_CACHE_FILE, ParseCache
+from readme_index import (append_record, find_record_by_id, find_record_by_name, get_index,
+                          suggest_records_by_name)
+from record_reader import iter_records
+
+# Функции, которые замеряет --instrument: поиск в файле пользователей, чтение и разбор полей
+INSTRUMENTED = ('find_user_in_file', 'find_user_by_id', 'extract_user_data', 'read_text')
 
 def create_user(): 
     """
@@ -13,19 +27,17 @@ def create_user():
     group = input("Введите группу/команду: ").strip()
     user_id = input("Введите ID: ").strip()
     
-    # Создаем содержимое файла
-    content = f"""Колледж: {college}
-Курс: {course}
-ФИО: {name}
-Команда: {group}
-ID: {user_id}"""
-    
-    # Сохраняем в файл
+    # Дописываем запись в конец файла, индекс обновляется сразу
     file_path = 'README002.md'
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(content)
-        print(f"Пользователь создан! Данные сохранены в файл: {file_path}")
+        append_record(file_path, {
+            'college': college,
+            'course': course,
+            'name': name,
+            'group': group,
+            'id': user_id,
+        })
+        print(f"Пользователь создан! Данные добавлены в файл: {file_path}")
         return college, course, name, group, user_id
     except Exception as e:
         print(f"Ошибка при сохранении файла: {e}")
@@ -37,27 +49,10 @@ def find_user_in_file(file_path, target_name):
     Возвращает данные пользователя если найден, иначе None.
     """
     try:
-        # Пробуем разные кодировки
-        encodings = ['utf-8']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    break
-            except UnicodeDecodeError:
-                continue
-        else:
-            return None
-
-              # Ищем пользователя по ФИО с помощью регулярных выражений
-        name_patterns = [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)']
-        
-        for pattern in name_patterns:  # Перебираем каждый шаблон из списка
-            matches = re.findall(pattern, content, re.IGNORECASE)  # Ищем ВСЕ совпадения с шаблоном в тексте
-            for match in matches:  # Перебираем найденные совпадения
-                if target_name.lower() in match.lower():  # Если искомое имя (в нижнем регистре) есть в найденной строке
-                    return extract_user_data(content) 
+        # По индексу ФИО -> смещение читаем с диска только найденную запись
+        record = find_record_by_name(file_path, target_name)
+        if record:
+            return record_to_tuple(record)
         
         return None  # Если ни одно совпадение не подошло, возвращаем None (не найдено)
                 
@@ -67,55 +62,84 @@ def find_user_in_file(file_path, target_name):
         print(f"Ошибка при чтении файла: {e}")
         return None
 
-def extract_user_data(content):
-    # Словарь, где ключ - название поля, значение - список шаблонов для его поиска
-    patterns = {
-        'college': [r'Колледж[:\s]*([^\n]+)', r'College[:\s]*([^\n]+)', r'Учебное заведение[:\s]*([^\n]+)'],
-        'course': [r'Курс[:\s]*([^\n]+)', r'Course[:\s]*([^\n]+)'],
-        'name': [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)'],
-        'group': [r'Команда[:\s]*([^\n]+)', r'Группа[:\s]*([^\n]+)', r'Group[:\s]*([^\n]+)', r'Team[:\s]*([^\n]+)'],
-        'id': [r'ID[:\s]*([^\n]+)', r'ИД[:\s]*([^\n]+)', r'Номер[:\s]*([^\n]+)', r'№[:\s]*([^\n]+)']
-    }
+def suggest_similar_users(file_path, target_name):
+    """
+    Функция для поиска пользователей с похожим ФИО (опечатки).
+    Показывает варианты и возвращает данные выбранного пользователя или None.
+    """
+    try:
+        suggestions = suggest_records_by_name(file_path, target_name)
+    except FileNotFoundError:
+        return None
+    if not suggestions:
+        return None
     
-    found_data = {}  # Создаем пустой словарь для хранения найденных данных
-    for field_name, field_patterns in patterns.items():  # Проходим по каждому полю и его шаблонам
-        for pattern in field_patterns:  # Для каждого шаблона в списке шаблонов для этого поля
-            match = re.search(pattern, content, re.IGNORECASE)  # Ищем ПЕРВОЕ совпадение в тексте
-            if match:  # Если нашли
-                found_data[field_name] = match.group(1).strip()  # Сохраняем найденное значение в словарь
-                break  # Прерываем цикл по шаблонам для этого поля, переходим к следующему полю
+    print("Возможно, вы имели в виду:")
+    for i, (distance, record) in enumerate(suggestions, 1):
+        print(f"{i}. {record['name']} ({record['group']}), ID: {record['id']} - отличий: {distance}")
     
+    choice = input(f"Номер пользователя (1-{len(suggestions)}) или Enter, чтобы пропустить: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+        return record_to_tuple(suggestions[int(choice) - 1][1])
+    return None
+
+def find_user_by_id(file_path, user_id):
+    """
+    Функция для поиска пользователя в файле по ID через индекс.
+    Возвращает данные пользователя если найден, иначе None.
+    """
+    try:
+        record = find_record_by_id(file_path, user_id)
+        if record:
+            return record_to_tuple(record)
+        return None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ошибка при чтении файла: {e}")
+        return None
+
+def extract_user_data(content):
+    # Все поля извлекаются одним проходом общего скомпилированного шаблона
+    found_data = STUDENT_FIELDS.extract(content)  # Словарь {поле: значение} для найденных полей
+    
+    return record_to_tuple(found_data)
+
+def record_to_tuple(record):
+    """
+    Превращает словарь полей записи в кортеж (колледж, курс, ФИО, группа, ID).
+    Возвращает None, если каких-то данных не хватает.
+    """
     # Проверяем, что все данные найдены
-    if all(key in found_data for key in ['college', 'course', 'name', 'group', 'id']):
+    if all(key in record for key in ['college', 'course', 'name', 'group', 'id']):
         return (  # Возвращаем кортеж, доставая значения из словаря по ключам
-            found_data['college'],
-            found_data['course'],
-            found_data['name'],
-            found_data['group'],
-            found_data['id']
+            record['college'],
+            record['course'],
+            record['name'],
+            record['group'],
+            record['id']
         )
     
     return None  # Если хотя бы одного ключа нет в словаре
 
-def main():
+def main(file_path='README002.md'):
     """
     Главная функция программы.
     """
     print("Программа для работы с пользовательскими данными")
     print("=" * 50)
     
-    file_path = 'README002.md'
-    
     while True:
         print("\nВыберите действие:")
         print("1. Поиск пользователя по ФИО")
         print("2. Создать нового пользователя")
         print("3. Показать всех пользователей в файле")
-        print("4. Выйти")
+        print("4. Поиск пользователя по ID")
+        print("5. Выйти")
         
-        choice = input("Ваш выбор (1-4): ").strip()
+        choice = input("Ваш выбор (1-5): ").strip()
         
-        if choice == '4':
+        if choice == '5':
             print("До свидания!")
             break
             
@@ -135,11 +159,17 @@ def main():
                 print_user_greeting(college, course, name, group, user_id)
             else:
                 print(f"\nПользователь '{target_name}' не найден в файле.")
-                create_new = input("Хотите создать нового пользователя? (да/нет): ").strip().lower()
-                if create_new in ['да', 'yes', 'y', 'д']:
-                    college, course, name, group, user_id = create_user()
-                    if all([college, course, name, group, user_id]):
-                        print_user_greeting(college, course, name, group, user_id)
+                # Перед созданием нового - варианты с похожим ФИО
+                user_data = suggest_similar_users(file_path, target_name)
+                if user_data:
+                    college, course, name, group, user_id = user_data
+                    print_user_greeting(college, course, name, group, user_id)
+                else:
+                    create_new = input("Хотите создать нового пользователя? (да/нет): ").strip().lower()
+                    if create_new in ['да', 'yes', 'y', 'д']:
+                        college, course, name, group, user_id = create_user()
+                        if all([college, course, name, group, user_id]):
+                            print_user_greeting(college, course, name, group, user_id)
         
         elif choice == '2':
             college, course, name, group, user_id = create_user()
@@ -151,6 +181,22 @@ def main():
             print("=" * 50)
             show_all_users(file_path)
         
+        elif choice == '4':
+            user_id = input("Введите ID для поиска: ").strip()
+            
+            if not user_id:
+                print("ID не может быть пустым!")
+                continue
+            
+            user_data = find_user_by_id(file_path, user_id)
+            
+            if user_data:
+                college, course, name, group, user_id = user_data
+                print(f"\nПользователь найден!")
+                print_user_greeting(college, course, name, group, user_id)
+            else:
+                print(f"\nПользователь с ID '{user_id}' не найден в файле.")
+        
         else:
             print("Неверный выбор. Попробуйте снова.")
             continue
@@ -166,32 +212,15 @@ def show_all_users(file_path):
     Показывает всех пользователей из файла.
     """
     try:
-        # Пробуем разные кодировки
-        encodings = ['utf-8', 'cp1251', 'koi8-r', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    break
-            except UnicodeDecodeError:
-                continue
-        else:
-            print("Не удалось прочитать файл")
-            return
-        
-        # Ищем все записи с ФИО
-        name_patterns = [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)']
-        all_names = []
+        # Читаем записи потоково и выводим каждое ФИО один раз
+        shown = set()
+        for record in iter_records(file_path):
+            name = record.get('name')
+            if name and name not in shown:
+                shown.add(name)
+                print(f"{len(shown)}. {name}")
         
-        for pattern in name_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            all_names.extend(matches)
-        
-        if all_names:
-            for i, name in enumerate(set(all_names), 1):
-                print(f"{i}. {name.strip()}")
-        else:
+        if not shown:
             print("В файле нет записей о пользователях")
             
     except FileNotFoundError:
@@ -213,179 +242,269 @@ def print_user_greeting(college, course, name, group, user_id):
     print("=" * 50)
     print("Добро пожаловать!")
 
-# Запуск программы
-if __name__ == "__main__":
-    main()
-        import re
-Импорт модуля регулярных выражений - необходим для поиска и извлечения данных по шаблонам
-
-2. Функция create_user()(create_user — это имя функции)
-python
-def create_user():
-    """
-    Функция для создания нового пользователя.
-    """
-Создание нового пользователя - функция запрашивает данные у пользователя и сохраняет их в файл
-
-python
-    print("\nСоздание нового пользователя")
-    print("=" * 40)
-Вывод заголовка - информирует пользователя о начале процесса создания
-
-python
-    college = input("Введите название колледжа: ").strip()
-    course = input("Введите название курса: ").strip()
-    name = input("Введите ФИО: ").strip()
-    group = input("Введите группу/команду: ").strip()
-    user_id = input("Введите ID: ").strip()
-Ввод данных - запрос информации у пользователя с удалением лишних пробелов
-
-python
-    content = f"""Колледж: {college}
-Курс: {course}
-ФИО: {name}
-Команда: {group}
-ID: {user_id}"""
-Форматирование содержимого - создание структурированного текста с данными пользователя
-
-python
-    file_path = 'README002.md'
-    try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(content)
-Сохранение в файл - запись данных в файл с указанием кодировки UTF-8
-
-python
-        print(f"Пользователь создан! Данные сохранены в файл: {file_path}")
-        return college, course, name, group, user_id
-Успешное завершение - вывод сообщения и возврат данных
-
-python
-    except Exception as e:
-        print(f"Ошибка при сохранении файла: {e}")
-        return None, None, None, None, None
-Обработка ошибок - перехват исключений при работе с файлом
-
-3. Функция find_user_in_file(file_path, target_name)
-python
-def find_user_in_file(file_path, target_name):
+class UserBatchSession(BatchSession):
     """
-    Функция для поиска пользователя в файле по ФИО.
-    Возвращает данные пользователя если найден, иначе None.
+    Пакетный режим (см. batch_mode) для файла пользователей.
+    Команды: lookup (по ФИО), lookup_id (по ID), suggest (ФИО с опечатками),
+    register, parse, stats.
     """
-Поиск пользователя - функция ищет пользователя по ФИО в указанном файле
-
-python
-    try:
-        encodings = ['utf-8']
-        
-        for encoding in encodings:
+    
+    def __init__(self, file_path, parse_cache_file=DEFAULT_CACHE_FILE):
+        super().__init__()
+        self.file_path = file_path
+        self.parse_cache_file = parse_cache_file
+        self.parse_cache = None
+    
+    def op_lookup(self, request):
+        return find_record_by_name(self.file_path, request['name'])
+    
+    def op_lookup_id(self, request):
+        return find_record_by_id(self.file_path, str(request['id']))
+    
+    def op_suggest(self, request):
+        found = suggest_records_by_name(self.file_path, request['name'])
+        return [{'distance': distance, 'record': record} for distance, record in found]
+    
+    def op_register(self, request):
+        fields = {key: str(request[key]).strip() for key in FIELDS}
+        append_record(self.file_path, fields)
+        return fields
+    
+    def op_parse(self, request):
+        # Неизменённые файлы берутся из кэша разбора (общего с Tarakan.py)
+        if self.parse_cache is None and self.parse_cache_file:
             try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    break
-            except UnicodeDecodeError:
-                continue
-        else:
-            return None
-Чтение файла с разными кодировками - попытка прочитать файл, перебирая возможные кодировки
-
-python
-        name_patterns = [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)']
-        
-        for pattern in name_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                if target_name.lower() in match.lower():
-                    return extract_user_data(content)
-Поиск по шаблонам - использование регулярных выражений для поиска ФИО в тексте
-
-4. Функция extract_user_data(content)
-python
-def extract_user_data(content):
-Извлечение данных - функция парсит текст и извлекает структурированные данные
-
-python
-    patterns = {
-        'college': [r'Колледж[:\s]*([^\n]+)', r'College[:\s]*([^\n]+)', r'Учебное заведение[:\s]*([^\n]+)'],
-        'course': [r'Курс[:\s]*([^\n]+)', r'Course[:\s]*([^\n]+)'],
-        'name': [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)'],
-        'group': [r'Команда[:\s]*([^\n]+)', r'Группа[:\s]*([^\n]+)', r'Group[:\s]*([^\n]+)', r'Team[:\s]*([^\n]+)'],
-        'id': [r'ID[:\s]*([^\n]+)', r'ИД[:\s]*([^\n]+)', r'Номер[:\s]*([^\n]+)', r'№[:\s]*([^\n]+)']
-    }
-Шаблоны поиска - словарь с регулярными выражениями для каждого поля данных
-
-python
-    found_data = {}
-    for field_name, field_patterns in patterns.items():
-        for pattern in field_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                found_data[field_name] = match.group(1).strip()
-                break
-Поиск данных - последовательный поиск каждого поля по всем доступным шаблонам
-
-5. Главная функция main()
-python
-def main():
+                self.parse_cache = ParseCache(self.parse_cache_file)
+            except (OSError, sqlite3.Error):
+                self.parse_cache_file = None
+        if self.parse_cache is not None:
+            parsed = self.parse_cache.parse(request['path'])
+            return dict(parsed.fields, encoding=parsed.encoding)
+        content, encoding = read_text(request['path'])
+        return dict(STUDENT_FIELDS.extract(content), encoding=encoding)
+    
+    def close(self):
+        super().close()
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+    
+    def op_stats(self, request):
+        index = get_index(self.file_path)
+        if index.usable:
+            return {'records': index.count, 'ids': len(index.by_id), 'names': len(index.by_name)}
+        records = list(iter_records(self.file_path))
+        return {'records': len(records),
+                'ids': len({record['id'] for record in records if record.get('id')}),
+                'names': len({normalize_name(record['name'])
+                              for record in records if record.get('name')})}
+
+def run_cli(argv=None):
     """
-    Главная функция программы.
+    Точка входа командной строки: без команды запускается интерактивное меню,
+    команда batch выполняет команды JSONL без вопросов.
     """
-Основной цикл программы - управляет всем workflow приложения
-
-python
-    while True:
-        print("\nВыберите действие:")
-        print("1. Поиск пользователя по ФИО")
-        print("2. Создать нового пользователя")
-        print("3. Показать всех пользователей в файле")
-        print("4. Выйти")
-Меню выбора - отображение доступных опций пользователю
-
-6. Вспомогательные функции
-python
-def show_all_users(file_path):
-Показать всех пользователей - отображает всех найденных пользователей в файле
- Import — системная команда, это ключевое слово в языках программирования,
- которое позволяет использовать код из одного модуля (файла) в другом модуле.
- Проще говоря, это способ "взять" уже готовые функции,
- классы или переменные из одного файла и "перенести" их в другой,
- чтобы не писать один и тот же код заново.
-
- def — это ключевое слово в Python, которое используется для объявления функций.
- Таким образом, def позволяет 
- структурировать код и создавать повторно используемые блоки действий,
- улучшая читаемость и организацию программы.
-
- операторы break и return
-
- content - содержание структуры данных
-
- encoding это способ представления символов текста в двоичном формате. 
-
- UTF-8: Наиболее распространённая схема кодирования Unicode,
- поддерживающая почти все языки мира и специальные символы.
- 
- Unicode — это международный стандарт кодирования символов,
- который присваивает уникальный номер
-
- except в Python — это ключевая часть конструкции обработки исключений вместе с try
-
- name_patterns или patterns - шаблоны именования
-
- re.IGNORECASE делает регулярные выражения более гибкими и удобными для работы
- с реальными данными, где регистр часто непоследователен!
-
- Функция open() используется для открытия файла и возвращает файловый объект.
-
- while — это одна из фундаментальных конструкций в Python
- (и не только) для управления потоком выполнения программы
- if и else Это условные операторы, которые позволяют программе принимать
- решения и выполнять разные действия в зависимости от условий.
-
- Цикл for последовательно перебирает элементы из какой-либо коллекции
- (например, списка, строки, диапазона чисел) и выполняет для каждого элемента блок кода.
+    parser = argparse.ArgumentParser(
+        description="Работа с пользовательскими данными. Без команды запускается интерактивное меню."
+    )
+    parser.add_argument('--file', default='README002.md',
+                        help="файл пользователей (по умолчанию README002.md)")
+    parser.add_argument('--parse-cache', default=DEFAULT_CACHE_FILE,
+                        help=f"файл кэша разбора для команды parse (по умолчанию {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help="разбирать файлы заново, не используя кэш")
+    add_instrument_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command')
+    batch = subparsers.add_parser('batch', help="пакетный режим: команды JSONL (lookup, lookup_id, "
+                                                 "register, parse, stats)")
+    add_batch_arguments(batch)
+    args = parser.parse_args(argv)
+    # Замеры поиска, чтения файла и разбора полей (--instrument, --profile)
+    profile = configure_instrumentation(args, sys.modules[__name__], INSTRUMENTED)
+    
+    if args.command is None:
+        command, command_args = main, (args.file,)
+    else:
+        parse_cache_file = None if args.no_parse_cache else args.parse_cache
+        command, command_args = run_batch_cli, (UserBatchSession(args.file, parse_cache_file), args)
+    if profile:
+        return run_profiled(command, *command_args, output=profile) or 0
+    return command(*command_args) or 0
 
-Класс — это шаблон для создания объектов. Он определяет:
-Атрибуты (данные, переменные внутри класса)
-Методы (функции внутри класса)
\ No newline at end of file
+# Запуск программы
+if __name__ == "__main__":
+    raise SystemExit(run_cli())
+
+# ─── Заметки к коду ───
+# import re
+# Импорт модуля регулярных выражений - необходим для поиска и извлечения данных по шаблонам
+#
+# 2. Функция create_user()(create_user — это имя функции)
+# python
+# def create_user():
+#     """
+#     Функция для создания нового пользователя.
+#     """
+# Создание нового пользователя - функция запрашивает данные у пользователя и сохраняет их в файл
+#
+# python
+#     print("\nСоздание нового пользователя")
+#     print("=" * 40)
+# Вывод заголовка - информирует пользователя о начале процесса создания
+#
+# python
+#     college = input("Введите название колледжа: ").strip()
+#     course = input("Введите название курса: ").strip()
+#     name = input("Введите ФИО: ").strip()
+#     group = input("Введите группу/команду: ").strip()
+#     user_id = input("Введите ID: ").strip()
+# Ввод данных - запрос информации у пользователя с удалением лишних пробелов
+#
+# python
+#     content = f"""Колледж: {college}
+# Курс: {course}
+# ФИО: {name}
+# Команда: {group}
+# ID: {user_id}"""
+# Форматирование содержимого - создание структурированного текста с данными пользователя
+#
+# python
+#     file_path = 'README002.md'
+#     try:
+#         with open(file_path, 'w', encoding='utf-8') as file:
+#             file.write(content)
+# Сохранение в файл - запись данных в файл с указанием кодировки UTF-8
+#
+# python
+#         print(f"Пользователь создан! Данные сохранены в файл: {file_path}")
+#         return college, course, name, group, user_id
+# Успешное завершение - вывод сообщения и возврат данных
+#
+# python
+#     except Exception as e:
+#         print(f"Ошибка при сохранении файла: {e}")
+#         return None, None, None, None, None
+# Обработка ошибок - перехват исключений при работе с файлом
+#
+# 3. Функция find_user_in_file(file_path, target_name)
+# python
+# def find_user_in_file(file_path, target_name):
+#     """
+#     Функция для поиска пользователя в файле по ФИО.
+#     Возвращает данные пользователя если найден, иначе None.
+#     """
+# Поиск пользователя - функция ищет пользователя по ФИО в указанном файле
+#
+# python
+#     try:
+#         encodings = ['utf-8']
+#
+#         for encoding in encodings:
+#             try:
+#                 with open(file_path, 'r', encoding=encoding) as file:
+#                     content = file.read()
+#                     break
+#             except UnicodeDecodeError:
+#                 continue
+#         else:
+#             return None
+# Чтение файла с разными кодировками - попытка прочитать файл, перебирая возможные кодировки
+#
+# python
+#         name_patterns = [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)']
+#
+#         for pattern in name_patterns:
+#             matches = re.findall(pattern, content, re.IGNORECASE)
+#             for match in matches:
+#                 if target_name.lower() in match.lower():
+#                     return extract_user_data(content)
+# Поиск по шаблонам - использование регулярных выражений для поиска ФИО в тексте
+#
+# 4. Функция extract_user_data(content)
+# python
+# def extract_user_data(content):
+# Извлечение данных - функция парсит текст и извлекает структурированные данные
+#
+# python
+#     patterns = {
+#         'college': [r'Колледж[:\s]*([^\n]+)', r'College[:\s]*([^\n]+)', r'Учебное заведение[:\s]*([^\n]+)'],
+#         'course': [r'Курс[:\s]*([^\n]+)', r'Course[:\s]*([^\n]+)'],
+#         'name': [r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)'],
+#         'group': [r'Команда[:\s]*([^\n]+)', r'Группа[:\s]*([^\n]+)', r'Group[:\s]*([^\n]+)', r'Team[:\s]*([^\n]+)'],
+#         'id': [r'ID[:\s]*([^\n]+)', r'ИД[:\s]*([^\n]+)', r'Номер[:\s]*([^\n]+)', r'№[:\s]*([^\n]+)']
+#     }
+# Шаблоны поиска - словарь с регулярными выражениями для каждого поля данных
+#
+# python
+#     found_data = {}
+#     for field_name, field_patterns in patterns.items():
+#         for pattern in field_patterns:
+#             match = re.search(pattern, content, re.IGNORECASE)
+#             if match:
+#                 found_data[field_name] = match.group(1).strip()
+#                 break
+# Поиск данных - последовательный поиск каждого поля по всем доступным шаблонам
+#
+# 5. Главная функция main()
+# python
+# def main():
+#     """
+#     Главная функция программы.
+#     """
+# Основной цикл программы - управляет всем workflow приложения
+#
+# python
+#     while True:
+#         print("\nВыберите действие:")
+#         print("1. Поиск пользователя по ФИО")
+#         print("2. Создать нового пользователя")
+#         print("3. Показать всех пользователей в файле")
+#         print("4. Выйти")
+# Меню выбора - отображение доступных опций пользователю
+#
+# 6. Вспомогательные функции
+# python
+# def show_all_users(file_path):
+# Показать всех пользователей - отображает всех найденных пользователей в файле
+#  Import — системная команда, это ключевое слово в языках программирования,
+#  которое позволяет использовать код из одного модуля (файла) в другом модуле.
+#  Проще говоря, это способ "взять" уже готовые функции,
+#  классы или переменные из одного файла и "перенести" их в другой,
+#  чтобы не писать один и тот же код заново.
+#
+#  def — это ключевое слово в Python, которое используется для объявления функций.
+#  Таким образом, def позволяет
+#  структурировать код и создавать повторно используемые блоки действий,
+#  улучшая читаемость и организацию программы.
+#
+#  операторы break и return
+#
+#  content - содержание структуры данных
+#
+#  encoding это способ представления символов текста в двоичном формате.
+#
+#  UTF-8: Наиболее распространённая схема кодирования Unicode,
+#  поддерживающая почти все языки мира и специальные символы.
+#
+#  Unicode — это международный стандарт кодирования символов,
+#  который присваивает уникальный номер
+#
+#  except в Python — это ключевая часть конструкции обработки исключений вместе с try
+#
+#  name_patterns или patterns - шаблоны именования
+#
+#  re.IGNORECASE делает регулярные выражения более гибкими и удобными для работы
+#  с реальными данными, где регистр часто непоследователен!
+#
+#  Функция open() используется для открытия файла и возвращает файловый объект.
+#
+#  while — это одна из фундаментальных конструкций в Python
+#  (и не только) для управления потоком выполнения программы
+#  if и else Это условные операторы, которые позволяют программе принимать
+#  решения и выполнять разные действия в зависимости от условий.
+#
+#  Цикл for последовательно перебирает элементы из какой-либо коллекции
+#  (например, списка, строки, диапазона чисел) и выполняет для каждого элемента блок кода.
+#
+# Класс — это шаблон для создания объектов. Он определяет:
+# Атрибуты (данные, переменные внутри класса)
+# Методы (функции внутри класса)
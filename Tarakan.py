@@ -5,10 +5,21 @@
 регистрации в базе данных и управления доступом.
 """
 
-import re
 import os
+import sys
 import json
+import sqlite3
+import argparse
 from datetime import datetime
+from itertools import islice
+
+from batch_mode import BatchSession, Pending, add_batch_arguments, run_batch_cli
+from encoding_detect import read_text
+from field_extractor import FIELDS, extract_fields, normalize_name
+from instrumentation import add_instrument_arguments, configure as configure_instrumentation, run_profiled
+from parse_cache import DEFAULT_CACHE_FILE, ParseCache
+from student_record import Student
+from student_store import BACKENDS, CorruptDatabaseError, detect_backend, open_store, record_key
 
 # ─────────────────────────────────────────────────────────────
 # КОНФИГУРАЦИЯ
@@ -16,25 +27,88 @@ from datetime import datetime
 
 DATABASE_FILE = 'students_database.json'
 
+# Тип хранилища: 'json', 'sqlite', 'sharded', 'binary' или None (по расширению файла:
+# .db/.sqlite/.sqlite3 - SQLite, .bin - двоичный снимок, .shards или каталог - шарды,
+# иначе JSON)
+DATABASE_BACKEND = None
+
+# Режим журнала: новые студенты дописываются в students_database.json.log,
+# а основной файл пересобирается только при сжатии журнала
+DATABASE_JOURNAL = False
+
+# Адрес сервера базы (см. student_server): если задан, программа
+# не открывает файл базы сама, а работает как клиент сервера
+DATABASE_SERVER = None
+
+# Нечёткий поиск «возможно, вы имели в виду» перед регистрацией:
+# сколько опечаток в ФИО допускается и сколько вариантов показывать
+FUZZY_MAX_DISTANCE = 2
+FUZZY_SUGGESTIONS = 5
+
+# Выборка по колледжу/курсу/группе/датам: сколько студентов показывать за раз
+QUERY_PAGE_SIZE = 20
+
+# Кэш разбора файлов студентов (см. parse_cache): повторный анализ
+# неизменённого файла не декодирует его и не запускает регулярные
+# выражения. Лежит в каталоге кэша пользователя; None - без кэша
+PARSE_CACHE_FILE = DEFAULT_CACHE_FILE
+PARSE_CACHE_MAX_ENTRIES = 10_000
+
+# Функции, которые замеряет --instrument (вместе с instrumentation.SHARED_TARGETS):
+# загрузка и сохранение базы, чтение файлов с определением кодировки, разбор полей
+INSTRUMENTED = ('load_database', 'save_database', 'find_student_in_database',
+                'add_student_to_database', 'read_student_file', 'extract_student_fields',
+                'parse_file', 'show_database_stats')
+
+# Хранилище создаётся при первом обращении (см. get_store)
+_store = None
+_store_config = None
+_parse_cache = None
+_parse_cache_config = None
+
 # ─────────────────────────────────────────────────────────────
 # ФУНКЦИИ РАБОТЫ С БАЗОЙ ДАННЫХ
 # ─────────────────────────────────────────────────────────────
 
+def get_store():
+    """
+    🗂️ Возвращает долгоживущее хранилище студентов (JSON или SQLite) для DATABASE_FILE
+    или клиент сервера базы, если задан DATABASE_SERVER.
+    """
+    global _store, _store_config
+    config = (DATABASE_FILE, DATABASE_BACKEND, DATABASE_JOURNAL, DATABASE_SERVER)
+    if _store is None or _store_config != config:
+        if _store is not None:
+            _store.close()
+        if DATABASE_SERVER:
+            from student_server import RemoteStore
+            _store = RemoteStore(DATABASE_SERVER)
+        else:
+            _store = open_store(DATABASE_FILE, backend=DATABASE_BACKEND, journal=DATABASE_JOURNAL)
+        _store_config = config
+    return _store
+
+def close_database():
+    """🗜️ Сжимает журнал базы данных (если он включён) и закрывает файлы."""
+    if _store is None:
+        return
+    try:
+        moved = _store.compact()
+        if moved:
+            print(f"🗜️ Журнал сжат: {moved} записей перенесено в базу данных")
+    except Exception as e:
+        print(f"❌ Ошибка при сжатии журнала: {e}")
+    finally:
+        _store.close()
+
 def load_database():
-    """📂 Загружает базу данных студентов из JSON файла."""
-    if os.path.exists(DATABASE_FILE):
-        try:
-            with open(DATABASE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
-    return []
+    """📂 Загружает базу данных студентов."""
+    return list(get_store().all())
 
 def save_database(data):
-    """💾 Сохраняет базу данных студентов в JSON файл."""
+    """💾 Сохраняет базу данных студентов."""
     try:
-        with open(DATABASE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        get_store().save(data)
         return True
     except Exception as e:
         print(f"❌ Ошибка при сохранении базы данных: {e}")
@@ -42,25 +116,16 @@ def save_database(data):
 
 def find_student_in_database(name, group, id):
     """🔍 Ищет студента в базе данных по комбинации имени, группы и ID."""
-    database = load_database()
-    for student in database:
-        if (student.get('name') == name and 
-            student.get('group') == group and 
-            student.get('id') == id):
-            return student
-    return None
+    return get_store().find(name, group, id)
 
 def add_student_to_database(college, course, name, group, id):
     """👨‍🎓 Добавляет нового студента в базу данных с проверкой на дубликаты."""
-    database = load_database()
-    
-    # Проверка на дубликаты
-    for student in database:
-        if (student.get('name') == name and 
-            student.get('group') == group and 
-            student.get('id') == id):
-            print("❌ Этот студент уже есть в базе данных!")
-            return False
+    store = get_store()
+    
+    # Проверка на дубликаты (O(1) по индексу)
+    if store.contains(name, group, id):
+        print("❌ Этот студент уже есть в базе данных!")
+        return False
     
     # Создание новой записи
     new_student = {
@@ -73,80 +138,71 @@ def add_student_to_database(college, course, name, group, id):
         'status': 'новый студент'
     }
     
-    database.append(new_student)
-    
-    if save_database(database):
-        print("✅ Новый студент успешно добавлен в базу данных!")
-        return True
-    else:
+    try:
+        added = store.add(new_student)
+    except Exception as e:
+        print(f"❌ Ошибка при сохранении базы данных: {e}")
         print("❌ Ошибка при добавлении в базу данных!")
         return False
+    
+    if not added:
+        print("❌ Этот студент уже есть в базе данных!")
+        return False
+    
+    print("✅ Новый студент успешно добавлен в базу данных!")
+    return True
 
 # ─────────────────────────────────────────────────────────────
 # ФУНКЦИИ АНАЛИЗА ФАЙЛОВ
 # ─────────────────────────────────────────────────────────────
 
+def read_student_file(file_path):
+    """📖 Читает файл один раз и определяет кодировку по байтам. Возвращает (текст, кодировка)."""
+    return read_text(file_path)
+
+def extract_student_fields(content):
+    """🔎 Извлекает (колледж, курс, ФИО, группа, ID) из текста файла за один проход."""
+    return extract_fields(content)
+
+def get_parse_cache():
+    """🗃️ Возвращает кэш разбора файлов для PARSE_CACHE_FILE или None, если он отключён."""
+    global _parse_cache, _parse_cache_config
+    config = (PARSE_CACHE_FILE, PARSE_CACHE_MAX_ENTRIES)
+    if _parse_cache_config != config:
+        if _parse_cache is not None:
+            _parse_cache.close()
+        _parse_cache = None
+        _parse_cache_config = config
+        if PARSE_CACHE_FILE:
+            try:
+                _parse_cache = ParseCache(PARSE_CACHE_FILE, PARSE_CACHE_MAX_ENTRIES)
+            except (OSError, sqlite3.Error):
+                # Без кэша файлы просто разбираются каждый раз
+                _parse_cache = None
+    return _parse_cache
+
+def analyze_student_file(file_path, with_text=True):
+    """
+    🗃️ Читает файл и извлекает поля, повторно - из кэша разбора.
+    Возвращает (текст или None без with_text, кодировка, (колледж, курс, ФИО, группа, ID)).
+    """
+    cache = get_parse_cache()
+    if cache is None:
+        content, encoding = read_student_file(file_path)
+        return content, encoding, extract_student_fields(content)
+    parsed = cache.parse(file_path, with_text=with_text)
+    return parsed.text, parsed.encoding, tuple(parsed.fields.get(field) for field in FIELDS)
+
 def parse_file(file_path):
     """📄 Анализирует текстовый файл и извлекает информацию о студенте."""
     college = course = name = group = id = None
     
     try:
-        # Попытка чтения с разными кодировками
-        encodings = ['utf-8', 'cp1251', 'koi8-r', 'iso-8859-1', 'windows-1251']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    print(f"✅ Файл успешно прочитан с кодировкой: {encoding}")
-                    break
-            except UnicodeDecodeError:
-                continue
-        else:
-            print("❌ Не удалось прочитать файл с доступными кодировками")
-            return college, course, name, group, id
-            
-        # Регулярные выражения для извлечения данных
-        patterns = {
-            'college': [
-                r'Колледж[:\s]*([^\n]+)', 
-                r'College[:\s]*([^\n]+)', 
-                r'Учебное заведение[:\s]*([^\n]+)'
-            ],
-            'course': [r'Курс[:\s]*([^\n]+)', r'Course[:\s]*([^\n]+)'],
-            'name': [
-                r'ФИ[:\s]*([^\n]+)', 
-                r'ФИО[:\s]*([^\n]+)', 
-                r'Name[:\s]*([^\n]+)', 
-                r'Имя[:\s]*([^\n]+)'
-            ],
-            r'Имя[:\s]*([^\n]+)'
-        'group': [
-                r'Команда[:\s]*([^\n]+)', 
-                r'Группа[:\s]*([^\n]+)', 
-                r'Group[:\s]*([^\n]+)', 
-                r'Team[:\s]*([^\n]+)'
-            ],
-        'id': [
-                r'ID[:\s]*([^\n]+)', 
-                r'ИД[:\s]*([^\n]+)', 
-                r'Номер[:\s]*([^\n]+)', 
-                r'№[:\s]*([^\n]+)'
-            ]
-        }
+        # Чтение с автоматическим определением кодировки (повторно - из кэша разбора)
+        content, encoding, fields = analyze_student_file(file_path)
+        print(f"✅ Файл успешно прочитан с кодировкой: {encoding}")
         
-        # Поиск данных в содержимом файла
-        for field_name, field_patterns in patterns.items():
-            for pattern in field_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    value = match.group(1).strip()
-                    if field_name == 'college': college = value
-                    elif field_name == 'course': course = value
-                    elif field_name == 'name': name = value
-                    elif field_name == 'group': group = value
-                    elif field_name == 'id': id = value
-                    break
+        college, course, name, group, id = fields
                 
         # Вывод результатов анализа
         print("\n📋 Найденные данные в файле:")
@@ -188,16 +244,92 @@ def manual_input_missing_data(college, course, name, group, id):
     return college, course, name, group, id
 
 def show_database_stats():
-    """📊 Показывает статистику базы данных."""
-    database = load_database()
+    """📊 Показывает статистику базы данных (без чтения всей базы)."""
+    stats = get_store().stats()
     print(f"\n📊 Статистика базы данных:")
-    print(f"Всего студентов: {len(database)}")
+    print(f"Всего студентов: {stats.total}")
     
-    if database:
+    if stats.total:
+        for field, title in (('college', '🏫 По колледжам'), ('course', '📚 По курсам'),
+                             ('group', '👥 По группам')):
+            top = ", ".join(f"{value or '—'}: {count}" for value, count in stats.top(field, 5))
+            print(f"{title}: {top}")
+        
         print("\nПоследние добавленные студенты:")
-        for i, student in enumerate(database[-3:], 1):
+        for i, student in enumerate(list(stats.recent)[-3:], 1):
             print(f"{i}. {student['name']} ({student['group']}) - {student['registration_date']}")
 
+def search_students_by_name():
+    """🔤 Поиск студентов по части ФИО: начало фамилии или имени, либо подстрока."""
+    query = input("🔤 Введите ФИО или его часть: ").strip()
+    if not query:
+        print("❌ Запрос не может быть пустым!")
+        return
+    
+    results = get_store().search_name(query, limit=10)
+    if not results:
+        print(f"❌ Студенты по запросу '{query}' не найдены.")
+        return
+    
+    print(f"\n🔤 Найденные студенты (лучшие совпадения первыми):")
+    print("═" * 50)
+    for i, student in enumerate(results, 1):
+        print(f"{i}. {student['name']} ({student['group']}), ID: {student['id']} - {student['college']}")
+    print("═" * 50)
+
+def query_students():
+    """🗃️ Выборка студентов по колледжу, курсу, группе и датам регистрации."""
+    print("\n🗃️ Условия выборки (Enter - без условия):")
+    college = input("🏫 Колледж: ").strip() or None
+    course = input("📚 Курс: ").strip() or None
+    group = input("👥 Группа: ").strip() or None
+    date_from = input("📅 Зарегистрированы с (ГГГГ-ММ-ДД): ").strip() or None
+    date_to = input("📅 Зарегистрированы по (ГГГГ-ММ-ДД): ").strip() or None
+    
+    try:
+        results = get_store().query(college, course, group, date_from, date_to)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    # Студенты выводятся по мере нахождения, страницами
+    shown = 0
+    print("═" * 50)
+    for student in results:
+        shown += 1
+        print(f"{shown}. {student['name']} ({student['group']}), ID: {student['id']} - "
+              f"{student['college']}, {student['course']}, {student['registration_date']}")
+        if shown % QUERY_PAGE_SIZE == 0:
+            more = input("➡️  Показать ещё? (да/нет): ").strip().lower()
+            if more not in ['да', 'yes', 'y', 'д']:
+                break
+    print("═" * 50)
+    if shown:
+        print(f"🗃️ Показано студентов: {shown}")
+    else:
+        print("❌ Студенты по заданным условиям не найдены.")
+
+def suggest_existing_student(name):
+    """
+    🤔 Студент не найден: предлагает похожие ФИО из базы (опечатки,
+    переставленные буквы). Возвращает выбранного студента или None.
+    """
+    suggestions = get_store().suggest_names(name, FUZZY_MAX_DISTANCE, FUZZY_SUGGESTIONS)
+    if not suggestions:
+        return None
+    
+    print("\n🤔 Возможно, вы имели в виду:")
+    print("═" * 50)
+    for i, (distance, student) in enumerate(suggestions, 1):
+        print(f"{i}. {student['name']} ({student['group']}), ID: {student['id']} - "
+              f"{student['college']} [отличий: {distance}]")
+    print("═" * 50)
+    
+    choice = input(f"➡️  Номер студента (1-{len(suggestions)}) или Enter для регистрации: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+        return suggestions[int(choice) - 1][1]
+    return None
+
 def register_new_student(college, course, name, group, id):
     """🎯 Процедура регистрации нового студента."""
     print("\n❌ ОШИБКА: СТУДЕНТ НЕ НАЙДЕН В БАЗЕ ДАННЫХ!")
@@ -259,18 +391,29 @@ def main():
         print("\n📝 Выберите действие:")
         print("1. Анализировать файл студента")
         print("2. Показать статистику базы данных")
-        print("3. Выйти")
+        print("3. Найти студента по ФИО")
+        print("4. Выборка студентов (колледж, курс, группа, даты)")
+        print("5. Выйти")
         
-        choice = input("➡️  Ваш выбор (1-3): ").strip()
+        choice = input("➡️  Ваш выбор (1-5): ").strip()
         
-        if choice == '3':
+        if choice == '5':
             print("\n👋 До свидания!")
+            close_database()
             break
             
         if choice == '2':
             show_database_stats()
             continue
             
+        if choice == '3':
+            search_students_by_name()
+            continue
+            
+        if choice == '4':
+            query_students()
+            continue
+            
         if choice == '1':
             print("\n📁 Выберите источник файла:")
             print("1. Ввести путь к файлу")
@@ -311,6 +454,9 @@ def main():
         
         # Поиск студента в базе
         existing_student = find_student_in_database(name, group, id)
+        if not existing_student:
+            # Перед регистрацией - проверка на опечатку в ФИО
+            existing_student = suggest_existing_student(name)
         
         if existing_student:
             print("\n✅ СТУДЕНТ НАЙДЕН В БАЗЕ ДАННЫХ!")
@@ -333,11 +479,457 @@ def main():
         another = input("\n🔄 Хотите проанализировать другой файл? (да/нет): ").strip().lower()
         if another not in ['да', 'yes', 'y', 'д']:
             print("👋 До свидания!")
+            close_database()
             break
 
+# ─────────────────────────────────────────────────────────────
+# ПАКЕТНЫЙ РЕЖИМ
+# ─────────────────────────────────────────────────────────────
+
+class StudentBatchSession(BatchSession):
+    """
+    Пакетный режим (см. batch_mode): команды lookup, search, suggest,
+    query, register, parse, stats и count над одним загруженным хранилищем. Регистрации копятся
+    и записываются в базу одной пачкой (перед stats/count или когда их
+    накопится много); lookup видит и ещё не записанных студентов.
+    """
+    
+    deferred_ops = ('register', 'lookup', 'parse')
+    
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self._queued = {}
+        self._queued_by_name = {}
+    
+    def op_lookup(self, request):
+        """{"op": "lookup", "name": ФИО[, "group": группа, "id": ID]}"""
+        name = request['name']
+        if request.get('group') is not None and request.get('id') is not None:
+            key = (name, request['group'], request['id'])
+            if key in self._queued:
+                return self._queued[key][0].to_dict()
+            student = self.store.lookup(*key)
+            return student.to_dict() if student is not None else None
+        # Индекс ФИО хранилища перестраивается вместе с базой, когда её
+        # меняют другие процессы, - своего словаря у сессии нет
+        students = (self.store.students_named(name)
+                    + self._queued_by_name.get(normalize_name(name), []))
+        return [student.to_dict() for student in students]
+    
+    def op_register(self, request):
+        """{"op": "register", "college": ..., "course": ..., "name": ..., "group": ..., "id": ...}"""
+        student = Student(request['college'], request['course'], request['name'],
+                          request['group'], request['id'],
+                          datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'новый студент')
+        key = record_key(student)
+        name_key = normalize_name(student['name'] or '')
+        if key in self._queued or self.store.lookup(*key) is not None:
+            return False
+        result = Pending()
+        self._queued[key] = (student, result)
+        self._queued_by_name.setdefault(name_key, []).append(student)
+        self.pending += 1
+        return result
+    
+    def op_parse(self, request):
+        """{"op": "parse", "path": путь к файлу студента}"""
+        _content, encoding, values = analyze_student_file(request['path'], with_text=False)
+        fields = dict(zip(FIELDS, values))
+        fields['encoding'] = encoding
+        return fields
+    
+    def op_search(self, request):
+        """{"op": "search", "query": часть ФИО[, "limit": 10]}"""
+        limit = int(request.get('limit', 10))
+        return [student.to_dict() for student in self.store.search_name(request['query'], limit)]
+    
+    def op_suggest(self, request):
+        """{"op": "suggest", "name": ФИО с опечаткой[, "max_distance": 2, "limit": 5]}"""
+        max_distance = int(request.get('max_distance', FUZZY_MAX_DISTANCE))
+        limit = int(request.get('limit', FUZZY_SUGGESTIONS))
+        return [{'distance': distance, 'student': student.to_dict()}
+                for distance, student in self.store.suggest_names(request['name'], max_distance, limit)]
+    
+    def op_query(self, request):
+        """{"op": "query"[, "college", "course", "group", "date_from", "date_to", "limit": 1000]}"""
+        limit = int(request.get('limit', 1000))
+        results = self.store.query(request.get('college'), request.get('course'), request.get('group'),
+                                   request.get('date_from'), request.get('date_to'))
+        return [student.to_dict() for student in islice(results, limit)]
+    
+    def op_stats(self, request):
+        return self.store.stats().to_dict()
+    
+    def op_count(self, request):
+        return len(self.store)
+    
+    def flush(self):
+        """Записывает накопленные регистрации одной пачкой."""
+        if not self._queued:
+            return
+        queued = list(self._queued.values())
+        self._queued, self._queued_by_name = {}, {}
+        self.pending = 0
+        try:
+            added = self.store.add_many([student for student, _result in queued])
+        except Exception as e:
+            for _student, result in queued:
+                result.error = f"Ошибка при сохранении базы данных: {e}"
+            return
+        added_keys = {record_key(student) for student in added}
+        for student, result in queued:
+            result.value = record_key(student) in added_keys
+
+# ─────────────────────────────────────────────────────────────
+# КОМАНДНАЯ СТРОКА
+# ─────────────────────────────────────────────────────────────
+
+def cmd_ingest(args):
+    """📦 Команда ingest: пакетная загрузка каталога или шаблона файлов."""
+    from bulk_ingest import STUDENT_FILE_PATTERNS, bulk_ingest, excluded_paths, print_ingest_summary
+    
+    # Сама база и её служебные файлы могут лежать в загружаемом каталоге
+    summary = bulk_ingest(args.source, store=get_store(), workers=args.workers,
+                          cache=get_parse_cache(),
+                          patterns=args.pattern or STUDENT_FILE_PATTERNS,
+                          excluded=excluded_paths(DATABASE_FILE, PARSE_CACHE_FILE))
+    print_ingest_summary(summary)
+    close_database()
+    return 0 if not summary['failed'] else 1
+
+def cmd_migrate(args):
+    """🔁 Команда migrate: перенос JSON базы в SQLite."""
+    from sqlite_store import migrate_json_to_sqlite
+    
+    try:
+        total, added = migrate_json_to_sqlite(args.source, args.target)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Ошибка миграции: {e}")
+        return 1
+    print(f"✅ Миграция завершена: прочитано {total}, перенесено {added} "
+          f"(дубликатов пропущено: {total - added})")
+    print(f"🗄️ База SQLite: {args.target}")
+    return 0
+
+def cmd_convert(args):
+    """💽 Команда convert: JSON база <-> двоичный снимок (по расширению TARGET)."""
+    from binary_snapshot import binary_to_json, json_to_binary
+    
+    to_binary = detect_backend(args.target) == 'binary'
+    try:
+        if to_binary:
+            count = json_to_binary(args.source, args.target)
+        else:
+            count = binary_to_json(args.source, args.target)
+    except (OSError, ValueError, CorruptDatabaseError) as e:
+        print(f"❌ Ошибка преобразования: {e}")
+        return 1
+    kind = "Двоичный снимок" if to_binary else "JSON база"
+    print(f"✅ Преобразовано студентов: {count}")
+    print(f"🗄️ {kind}: {args.target}")
+    return 0
+
+def cmd_batch(args):
+    """📜 Команда batch: команды JSONL из файла или stdin, результаты JSONL в stdout."""
+    code = run_batch_cli(StudentBatchSession(get_store()), args)
+    close_database()
+    return code
+
+def cmd_query(args):
+    """🗃️ Команда query: выборка студентов, по одной JSON-строке на студента."""
+    try:
+        results = get_store().query(args.college, args.course, args.group,
+                                    args.date_from, args.date_to)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    # Студенты пишутся по мере нахождения, без сборки всей выборки
+    write = sys.stdout.write
+    for student in results:
+        write(json.dumps(student.to_dict(), ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+    close_database()
+    return 0
+
+def cmd_serve(args):
+    """🛰️ Команда serve: сервер базы студентов на локальном сокете."""
+    import asyncio
+    from student_server import serve
+    
+    store = open_store(DATABASE_FILE, backend=DATABASE_BACKEND, journal=DATABASE_JOURNAL)
+    try:
+        asyncio.run(serve(store, args.address))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"❌ Не удалось запустить сервер: {e}")
+        return 1
+    finally:
+        store.compact()
+        store.close()
+    return 0
+
+def cmd_loadgen(args):
+    """📈 Команда loadgen: нагрузочный тест запущенного сервера."""
+    import asyncio
+    from student_server import print_loadgen_report, run_loadgen
+    
+    try:
+        summary = asyncio.run(run_loadgen(args.address, clients=args.clients,
+                                          requests=args.requests,
+                                          write_ratio=args.write_ratio))
+    except (OSError, ConnectionError) as e:
+        print(f"❌ Нет соединения с сервером {args.address}: {e}")
+        return 1
+    print_loadgen_report(summary)
+    return 0
+
+def cmd_analytics(args):
+    """📈 Команда analytics: разбивки по колледжам, курсам и группам, гистограммы регистраций."""
+    from analytics import CONSOLE_TOP, analyze_store, print_report, write_csv, write_json
+    
+    try:
+        report = analyze_store(get_store(), engine=args.engine)
+    except ValueError as e:
+        print(f"❌ Ошибка аналитики: {e}")
+        return 1
+    if args.format == 'console':
+        print_report(report, top=args.top or CONSOLE_TOP, days=args.days)
+        return 0
+    write = write_csv if args.format == 'csv' else write_json
+    if args.output == '-':
+        write(report, sys.stdout, top=args.top)
+    else:
+        try:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                write(report, f, top=args.top)
+        except OSError as e:
+            print(f"❌ Ошибка записи отчёта: {e}")
+            return 1
+        print(f"✅ Отчёт сохранён: {args.output} ({report['total']} студентов, "
+              f"{report['seconds']['load'] + report['seconds']['compute']:.2f} с)")
+    return 0
+
+def cmd_reshard(args):
+    """🔀 Команда reshard: перенос базы в шардированный каталог с новым разбиением."""
+    from sharded_store import reshard
+    
+    store = get_store()
+    try:
+        sizes = reshard(store, args.target, shards=args.shards, partition=args.by)
+    except (OSError, ValueError) as e:
+        print(f"❌ Ошибка переразбиения: {e}")
+        return 1
+    finally:
+        store.close()
+    partition = 'по колледжу' if args.by == 'college' else 'по ключу (ФИО, группа, ID)'
+    print(f"✅ База разбита на {len(sizes)} шардов {partition}: всего {sum(sizes)} студентов, "
+          f"в шарде от {min(sizes)} до {max(sizes)}")
+    print(f"🗄️ Шардированная база: {args.target}")
+    return 0
+
+def cmd_watch(args):
+    """👀 Команда watch: синхронизация каталога поступлений (только новые и изменённые файлы)."""
+    global DATABASE_JOURNAL
+    from bulk_ingest import STUDENT_FILE_PATTERNS, excluded_paths
+    from intake_watch import IntakeManifest, MANIFEST_SUFFIX, print_sync_summary, watch_directory
+    
+    if not os.path.isdir(args.source):
+        print(f"❌ Каталог '{args.source}' не найден.")
+        return 1
+    # Пачки дописываются в журнал, а не перезаписывают всю базу;
+    # журнал сжимается при выходе (close_database)
+    DATABASE_JOURNAL = True
+    manifest_path = args.manifest or DATABASE_FILE + MANIFEST_SUFFIX
+    manifest = IntakeManifest(manifest_path)
+    failed = False
+    
+    def on_sync(summary):
+        nonlocal failed
+        failed = failed or bool(summary['failed'])
+        print_sync_summary(summary, quiet_unchanged=not args.once)
+    
+    if not args.once:
+        print(f"👀 Слежение за '{args.source}' (опрос раз в {args.interval:g} с, Ctrl+C - выход)")
+    try:
+        watch_directory(args.source, get_store(), manifest, interval=args.interval,
+                        workers=args.workers, batch_size=args.batch_size, on_sync=on_sync,
+                        iterations=1 if args.once else None,
+                        patterns=args.pattern or STUDENT_FILE_PATTERNS,
+                        excluded=excluded_paths(DATABASE_FILE, manifest_path, PARSE_CACHE_FILE))
+    except KeyboardInterrupt:
+        print("\n👋 Слежение остановлено")
+    finally:
+        manifest.close()
+        close_database()
+    return 1 if failed and args.once else 0
+
+def build_arg_parser():
+    """🧭 Создаёт разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Система управления студентами. Без команды запускается интерактивное меню."
+    )
+    parser.add_argument('--database', default=None,
+                        help=f"файл базы данных (по умолчанию {DATABASE_FILE}; "
+                             f".json.gz и .json.xz - сжатая JSON база)")
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                        help="тип хранилища (по умолчанию - по расширению файла: "
+                             ".db - SQLite, .bin - двоичный снимок, "
+                             ".shards или каталог - шардированная база)")
+    parser.add_argument('--journal', action='store_true',
+                        help="дописывать новых студентов в журнал вместо перезаписи базы")
+    parser.add_argument('--server', default=None, metavar='ADDRESS',
+                        help="работать через сервер базы (unix-сокет или хост:порт)")
+    parser.add_argument('--parse-cache', default=None, metavar='ФАЙЛ',
+                        help=f"файл кэша разбора файлов студентов (по умолчанию {PARSE_CACHE_FILE})")
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help="разбирать файлы заново, не используя кэш")
+    add_instrument_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command')
+    
+    ingest = subparsers.add_parser('ingest', help="пакетная загрузка файлов студентов")
+    ingest.add_argument('source', help="каталог или шаблон glob (например, 'intake/**/*.md')")
+    ingest.add_argument('--workers', type=int, default=None,
+                        help="число процессов (по умолчанию - число ядер)")
+    ingest.add_argument('--pattern', action='append', default=None, metavar='ШАБЛОН',
+                        help="имена файлов студентов в каталоге (можно несколько раз; "
+                             "по умолчанию *.md и *.txt)")
+    ingest.set_defaults(handler=cmd_ingest)
+    
+    migrate = subparsers.add_parser('migrate', help="перенести JSON базу в SQLite")
+    migrate.add_argument('source', nargs='?', default=DATABASE_FILE,
+                         help=f"JSON файл базы (по умолчанию {DATABASE_FILE})")
+    migrate.add_argument('target', nargs='?', default='students_database.db',
+                         help="файл SQLite (по умолчанию students_database.db)")
+    migrate.set_defaults(handler=cmd_migrate)
+    
+    convert = subparsers.add_parser('convert', help="перевести базу между JSON и двоичным снимком "
+                                                     "(направление - по расширению TARGET)")
+    convert.add_argument('source', help="исходная база (JSON или .bin)")
+    convert.add_argument('target', help="новая база: .bin - двоичный снимок, иначе JSON")
+    convert.set_defaults(handler=cmd_convert)
+    
+    batch = subparsers.add_parser('batch', help="пакетный режим: команды JSONL (lookup, search, "
+                                                 "suggest, query, register, parse, stats, count)")
+    add_batch_arguments(batch)
+    batch.set_defaults(handler=cmd_batch)
+    
+    query = subparsers.add_parser('query', help="выборка студентов по колледжу, курсу, группе "
+                                                 "и датам регистрации (JSONL в stdout)")
+    query.add_argument('--college', default=None)
+    query.add_argument('--course', default=None)
+    query.add_argument('--group', default=None)
+    query.add_argument('--from', dest='date_from', default=None, metavar='ГГГГ-ММ-ДД',
+                       help="зарегистрированы с этой даты (включительно)")
+    query.add_argument('--to', dest='date_to', default=None, metavar='ГГГГ-ММ-ДД',
+                       help="зарегистрированы по эту дату (включительно)")
+    query.set_defaults(handler=cmd_query)
+    
+    from student_server import DEFAULT_ADDRESS
+    
+    serve = subparsers.add_parser('serve', help="запустить сервер базы студентов")
+    serve.add_argument('--address', default=DEFAULT_ADDRESS,
+                       help=f"unix-сокет или хост:порт (по умолчанию {DEFAULT_ADDRESS})")
+    serve.set_defaults(handler=cmd_serve)
+    
+    loadgen = subparsers.add_parser('loadgen', help="нагрузочный тест сервера (p50/p99)")
+    loadgen.add_argument('--address', default=DEFAULT_ADDRESS,
+                         help=f"адрес сервера (по умолчанию {DEFAULT_ADDRESS})")
+    loadgen.add_argument('--clients', type=int, default=16,
+                         help="число одновременных соединений")
+    loadgen.add_argument('--requests', type=int, default=500,
+                         help="запросов на одно соединение")
+    loadgen.add_argument('--write-ratio', type=float, default=0.1,
+                         help="доля запросов на регистрацию (0..1)")
+    loadgen.set_defaults(handler=cmd_loadgen)
+    
+    analytics = subparsers.add_parser('analytics', help="отчёт: разбивки по колледжам, курсам, "
+                                                         "группам и гистограммы регистраций")
+    analytics.add_argument('--format', choices=('console', 'csv', 'json'), default='console',
+                           help="формат отчёта (по умолчанию console)")
+    analytics.add_argument('--output', default='-',
+                           help="файл для CSV/JSON (по умолчанию stdout)")
+    analytics.add_argument('--top', type=int, default=None,
+                           help="сколько строк в каждой разбивке (в консоли по умолчанию 10, "
+                                "в CSV/JSON - все)")
+    analytics.add_argument('--days', type=int, default=30,
+                           help="сколько последних дней показать в консоли (по умолчанию 30)")
+    analytics.add_argument('--engine', choices=('auto', 'numpy', 'array'), default='auto',
+                           help="вычисления: NumPy, если установлен (auto), или без него (array)")
+    analytics.set_defaults(handler=cmd_analytics)
+    
+    reshard = subparsers.add_parser('reshard', help="разбить базу на шарды (или изменить разбиение)")
+    reshard.add_argument('target', help="каталог шардированной базы (например, students.shards); "
+                                        "может совпадать с текущей базой")
+    reshard.add_argument('--shards', type=int, default=16, help="число шардов (по умолчанию 16)")
+    reshard.add_argument('--by', choices=('key', 'college'), default='key',
+                         help="разбиение по ключу студента (по умолчанию) или по колледжу")
+    reshard.set_defaults(handler=cmd_reshard)
+    
+    watch = subparsers.add_parser('watch', help="синхронизация каталога поступлений: "
+                                                "разбираются только новые и изменённые файлы")
+    watch.add_argument('source', help="каталог с файлами студентов")
+    watch.add_argument('--once', action='store_true',
+                       help="один просмотр без слежения (для cron)")
+    watch.add_argument('--interval', type=float, default=2.0,
+                       help="период опроса каталога, секунд (по умолчанию 2)")
+    watch.add_argument('--pattern', action='append', default=None, metavar='ШАБЛОН',
+                       help="имена файлов студентов (можно несколько раз; по умолчанию *.md и *.txt)")
+    watch.add_argument('--manifest', default=None, metavar='ФАЙЛ',
+                       help="файл манифеста (по умолчанию <база>.manifest)")
+    watch.add_argument('--workers', type=int, default=None,
+                       help="число процессов разбора (по умолчанию - число ядер)")
+    watch.add_argument('--batch-size', type=int, default=1000,
+                       help="файлов в одной пачке записи (по умолчанию 1000)")
+    watch.set_defaults(handler=cmd_watch)
+    
+    return parser
+
+def run_cli(argv=None):
+    """🧭 Точка входа командной строки."""
+    global DATABASE_FILE, DATABASE_BACKEND, DATABASE_JOURNAL, DATABASE_SERVER, PARSE_CACHE_FILE
+    args = build_arg_parser().parse_args(argv)
+    if args.database:
+        DATABASE_FILE = args.database
+    if args.backend:
+        DATABASE_BACKEND = args.backend
+    if args.journal:
+        DATABASE_JOURNAL = True
+    if args.server:
+        DATABASE_SERVER = args.server
+    if args.parse_cache:
+        PARSE_CACHE_FILE = args.parse_cache
+    if args.no_parse_cache:
+        PARSE_CACHE_FILE = None
+    profile = configure_instrumentation(args, sys.modules[__name__], INSTRUMENTED)
+    try:
+        if args.command is None:
+            command, command_args = main, ()
+        else:
+            command, command_args = args.handler, (args,)
+        if profile:
+            status = run_profiled(command, *command_args, output=profile)
+        else:
+            status = command(*command_args)
+        return status or 0
+    except BrokenPipeError:
+        # Вывод закрыт читателем (например, analytics | head): молча
+        # завершаемся, а остаток вывода уходит в /dev/null
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except ConnectionError as e:
+        print(f"❌ Нет соединения с сервером базы данных: {e}")
+        return 1
+    except CorruptDatabaseError as e:
+        print(f"❌ Ошибка при загрузке базы данных: {e}")
+        print("❌ Работа остановлена, чтобы не перезаписать базу. Восстановите файл из резервной копии.")
+        return 1
+
 #─────────────────────────────────────────────────────────────
 # ЗАПУСК ПРОГРАММЫ
 # ─────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(run_cli())
\ No newline at end of file
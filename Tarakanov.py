@@ -1,34 +1,65 @@
 # main.py
 
-def read_hello_format_from_readme():
+import os
+import sys
+import argparse
+from contextlib import redirect_stdout
+
+from batch_mode import BatchSession, add_batch_arguments, run_batch_cli
+from bulk_greet import compile_greeting, database_name_blocks, iter_name_blocks, \
+    open_names, open_output, write_greetings
+
+# Сколько раз выводится приветствие
+GREETING_REPEAT = 5
+
+# Шаблоны, уже прочитанные из README: путь -> ((mtime, размер), шаблон)
+_hello_format_cache = {}
+
+def read_hello_format_from_readme(readme_path='README.md'):
     """
     Функция читает файл README.md и ищет строку, начинающуюся с 'Формат приветствия:'.
     Если находит, возвращает шаблон строки для приветствия.
     """
     try:
         # Открываем файл README.md в той же папке, что и скрипт
-        with open('README.md', 'r', encoding='utf-8') as file:
-            readme_content = file.readlines()
-        
-        # Ищем строку, которая содержит формат приветствия
-        for line in readme_content:
-            if line.startswith('Формат приветствия:'):
-                # Извлекаем часть строки после двоеточия и очищаем её от лишних пробелов и кавычек
-                format_string = line.split(':', 1)[1].strip()
-                # Убираем возможные кавычки в начале и конце (если они есть)
-                format_string = format_string.strip('"').strip("'")
-                return format_string
+        with open(readme_path, 'r', encoding='utf-8') as file:
+            # Ищем строку, которая содержит формат приветствия (дальше файл не читается)
+            for line in file:
+                if line.startswith('Формат приветствия:'):
+                    # Извлекаем часть строки после двоеточия и очищаем её от лишних пробелов и кавычек
+                    format_string = line.split(':', 1)[1].strip()
+                    # Убираем возможные кавычки в начале и конце (если они есть)
+                    format_string = format_string.strip('"').strip("'")
+                    return format_string
         
         # Если строка не найдена, возвращаем значение по умолчанию
         return "Привет, {}!"
     
     except FileNotFoundError:
-        print("Ошибка: Файл README.md не найден в директории проекта.")
+        print(f"Ошибка: Файл {readme_path} не найден в директории проекта.")
         return "Привет, {}!"
 
+def load_hello_format(readme_path='README.md'):
+    """
+    Шаблон приветствия с кэшем по времени изменения README: файл
+    читается заново, только если он изменился с прошлого чтения.
+    """
+    try:
+        st = os.stat(readme_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    cached = _hello_format_cache.get(readme_path)
+    if cached is not None and stamp is not None and cached[0] == stamp:
+        return cached[1]
+    hello_format = read_hello_format_from_readme(readme_path)
+    if stamp is not None:
+        _hello_format_cache[readme_path] = (stamp, hello_format)
+    return hello_format
+
 def main():
     # Получаем шаблон приветствия из README
-    hello_format = read_hello_format_from_readme()
+    hello_format = load_hello_format()
     
     # Запрашиваем имя пользователя
     user_name = input("Пожалуйста, введите ваше имя: ")
@@ -36,10 +67,104 @@ def main():
     # Форматируем приветствие
     greeting_message = hello_format.format(user_name)
     
-    # Выводим приветствие 5 раз с помощью цикла for
-    for i in range(5):
+    # Выводим приветствие GREETING_REPEAT раз с помощью цикла for
+    for i in range(GREETING_REPEAT):
         print(greeting_message)
 
+def run_greet(args):
+    """
+    Пакетные приветствия: имена из файла, stdin или базы студентов,
+    каждое приветствие args.repeat раз, вывод одним буферизованным потоком.
+    """
+    # Шаблон проверяется до чтения имён: ошибка в нём не даёт полувывода
+    with redirect_stdout(sys.stderr):
+        hello_format = load_hello_format(args.readme)
+    try:
+        line_format = compile_greeting(hello_format)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    if args.repeat < 1:
+        print("Ошибка: число повторов должно быть положительным", file=sys.stderr)
+        return 1
+    
+    from student_store import CorruptDatabaseError
+    
+    names_file = None
+    try:
+        if args.database:
+            blocks = database_name_blocks(args.database)
+        else:
+            names_file = open_names(args.names)
+            blocks = iter_name_blocks(names_file)
+        output = open_output(args.output)
+    except (OSError, CorruptDatabaseError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        if names_file is not None and args.names != '-':
+            names_file.close()
+        return 1
+    try:
+        summary = write_greetings(blocks, line_format, output, args.repeat)
+    except BrokenPipeError:
+        # Вывод закрыт раньше времени (например, | head) - это не ошибка
+        return 0
+    finally:
+        if names_file is not None and args.names != '-':
+            names_file.close()
+        try:
+            output.close()
+        except BrokenPipeError:
+            pass
+    if not args.quiet:
+        print(f"Приветствий: {summary['lines']} (имён: {summary['names']}), "
+              f"{summary['seconds']:.2f} с ({summary['per_second']:.0f} строк/с)",
+              file=sys.stderr)
+    return 0
+
+class GreetingBatchSession(BatchSession):
+    """
+    Пакетный режим (см. batch_mode): команда greet возвращает приветствие для имени.
+    Шаблон из README.md читается один раз на весь пакет.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        # Сообщения об ошибках - в stderr, чтобы не смешивать их с результатами в stdout
+        with redirect_stdout(sys.stderr):
+            self.hello_format = load_hello_format()
+    
+    def op_greet(self, request):
+        # {"op": "greet", "name": "Имя"} -> строка приветствия
+        return self.hello_format.format(request['name'])
+
+def run_cli(argv=None):
+    # Без команды - обычный интерактивный режим, команда batch - пакетный
+    parser = argparse.ArgumentParser(description="Приветствие по шаблону из README.md")
+    subparsers = parser.add_subparsers(dest='command')
+    batch = subparsers.add_parser('batch', help="пакетный режим: команды JSONL (greet)")
+    add_batch_arguments(batch)
+    greet = subparsers.add_parser('greet', help="приветствия для списка имён или всей базы студентов")
+    source = greet.add_mutually_exclusive_group()
+    source.add_argument('--names', default='-',
+                        help="файл с именами, по одному на строку (по умолчанию stdin)")
+    source.add_argument('--database', default=None,
+                        help="взять ФИО всех студентов из базы данных (например, students_database.json)")
+    greet.add_argument('--repeat', type=int, default=GREETING_REPEAT,
+                       help=f"сколько раз выводить каждое приветствие (по умолчанию {GREETING_REPEAT})")
+    greet.add_argument('--output', default='-',
+                       help="файл для приветствий (по умолчанию stdout)")
+    greet.add_argument('--readme', default='README.md',
+                       help="файл с строкой 'Формат приветствия:' (по умолчанию README.md)")
+    greet.add_argument('--quiet', action='store_true', help="не выводить сводку в stderr")
+    args = parser.parse_args(argv)
+    
+    if args.command is None:
+        main()
+        return 0
+    if args.command == 'greet':
+        return run_greet(args)
+    return run_batch_cli(GreetingBatchSession(), args)
+
 # Точка входа в программу
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(run_cli())
\ No newline at end of file
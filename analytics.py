@@ -0,0 +1,348 @@
+"""
+📈 АНАЛИТИКА БАЗЫ СТУДЕНТОВ
+===========================================================
+Отчёт для руководства: разбивка по колледжам, курсам, группам
+и статусам, колледж × курс, топ групп и гистограммы регистраций
+по дням и по часам суток. Вывод - в консоль, CSV или JSON
+(Tarakan.py analytics).
+
+База раскладывается по столбцам: значения категориальных полей
+кодируются словарём (значение -> номер), даты - числами секунд.
+Подсчёты идут проходами по целым столбцам: в NumPy, если он
+установлен, иначе на array и Counter из стандартной библиотеки.
+Двоичный снимок (.bin) уже хранит значения номерами в таблице
+строк - его столбцы берутся прямо из отображённого файла, без
+создания записей студентов.
+"""
+
+import sys
+import csv
+import json
+import time
+from array import array
+from collections import Counter
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+from binary_snapshot import NO_DATE, NO_REF, ROW, BinaryStore
+from student_record import epoch_to_date
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Поля, по которым строятся разбивки
+CATEGORICAL_FIELDS = ('college', 'course', 'group', 'status')
+
+# Вычисления: auto - NumPy, если установлен; numpy; array - без NumPy
+ENGINES = ('auto', 'numpy', 'array')
+FORMATS = ('console', 'csv', 'json')
+
+# Что показывается в консоли: строк в каждой разбивке и последних дней
+CONSOLE_TOP = 10
+CONSOLE_DAYS = 30
+BAR_WIDTH = 40
+
+# Дата, которой нет числом (нет даты или нестандартная строка)
+MISSING_DATE = NO_DATE
+
+# Положение полей в строке ROW двоичного снимка, в словах uint32
+ROW_WORDS = ROW.size // 4
+REF_WORDS = {'college': 0, 'course': 1, 'group': 3, 'status': 8}
+DATE_WORD = 5
+
+if np is not None:
+    ROW_DTYPE = np.dtype([('college', '<u4'), ('course', '<u4'), ('name', '<u4'),
+                          ('group', '<u4'), ('id', '<u4'), ('date', '<i8'),
+                          ('date_text', '<u4'), ('status', '<u4')])
+
+def resolve_engine(engine):
+    """True - считать в NumPy, False - на array; ValueError, если NumPy нужен, но не установлен."""
+    if engine not in ENGINES:
+        raise ValueError(f"Неизвестный способ вычислений: {engine}")
+    if engine == 'numpy' and np is None:
+        raise ValueError("NumPy не установлен (pip install numpy) - используйте --engine array")
+    return np is not None and engine != 'array'
+
+# ─────────────────────────────────────────────────────────────
+# СТОЛБЦЫ
+# ─────────────────────────────────────────────────────────────
+
+class _SnapshotLabels:
+    """Метки кодов снимка: код - номер строки в таблице строк снимка."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, code):
+        # NO_REF (или его замена string_count в столбцах NumPy) - значения нет
+        if code >= self.snapshot.string_count:
+            return None
+        return self.snapshot.string(code)
+
+class StudentColumns:
+    """
+    База по столбцам: для категориальных полей - столбец кодов и метки
+    (код -> значение), даты - столбец секунд (MISSING_DATE - даты нет).
+    Столбцы - массивы NumPy (numpy=True) или array/списки чисел.
+    """
+
+    def __init__(self, size, codes, labels, dates, numpy):
+        self.size = size
+        self.codes = codes
+        self.labels = labels
+        self.dates = dates
+        self.numpy = numpy
+
+    @classmethod
+    def from_records(cls, records, numpy):
+        """Кодирует записи Student: каждое поле - один проход по всем записям."""
+        size = len(records)
+        codes, labels = {}, {}
+        for field in CATEGORICAL_FIELDS:
+            column = list(map(attrgetter(field), records))
+            values = list(dict.fromkeys(column))
+            encoded = map({value: code for code, value in enumerate(values)}.__getitem__, column)
+            codes[field] = (np.fromiter(encoded, dtype=np.int64, count=size) if numpy
+                            else array('I', encoded))
+            labels[field] = values
+        dates = [date if type(date) is int else MISSING_DATE
+                 for date in map(attrgetter('registration_date'), records)]
+        if numpy:
+            dates = np.array(dates, dtype=np.int64)
+        return cls(size, codes, labels, dates, numpy)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, numpy):
+        """
+        Столбцы из таблицы записей двоичного снимка: коды - ссылки на таблицу
+        строк. Снимок должен оставаться открытым, пока нужны метки.
+        """
+        size = len(snapshot)
+        labels = _SnapshotLabels(snapshot)
+        view = snapshot.rows_buffer()
+        try:
+            if numpy:
+                rows = np.frombuffer(view, dtype=ROW_DTYPE, count=size)
+                codes = {}
+                for field in CATEGORICAL_FIELDS:
+                    refs = rows[field].astype(np.int64)
+                    # None (NO_REF) - сразу за последней строкой, чтобы bincount не рос до 2^32
+                    refs[refs == NO_REF] = snapshot.string_count
+                    codes[field] = refs
+                dates = rows['date'].astype(np.int64)
+                del rows
+            else:
+                words = array('I')
+                words.frombytes(view)
+                if sys.byteorder != 'little':
+                    words.byteswap()
+                codes = {field: words[word::ROW_WORDS] for field, word in REF_WORDS.items()}
+                low, high = words[DATE_WORD::ROW_WORDS], words[DATE_WORD + 1::ROW_WORDS]
+                del words
+                # Старшее слово даты почти всегда 0 (1970-2106): склеиваем только остальные
+                dates = [lo if not hi else _signed64(hi << 32 | lo) for lo, hi in zip(low, high)]
+        finally:
+            view.release()
+        return cls(size, codes, {field: labels for field in CATEGORICAL_FIELDS}, dates, numpy)
+
+def _signed64(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def load_columns(store, numpy):
+    """
+    📥 Столбцы базы из хранилища. Двоичный снимок без новых записей в журнале
+    читается напрямую и должен оставаться открытым, пока строится отчёт.
+    """
+    snapshot = store.mapped_snapshot() if isinstance(store, BinaryStore) else None
+    if snapshot is not None:
+        return StudentColumns.from_snapshot(snapshot, numpy)
+    return StudentColumns.from_records(store.all(), numpy)
+
+# ─────────────────────────────────────────────────────────────
+# ПОДСЧЁТЫ
+# ─────────────────────────────────────────────────────────────
+
+def count_codes(columns, field):
+    """Группировка по полю: {код: число студентов}."""
+    codes = columns.codes[field]
+    if columns.numpy:
+        counts = np.bincount(codes)
+        present = np.flatnonzero(counts)
+        return dict(zip(present.tolist(), counts[present].tolist()))
+    return Counter(codes)
+
+def count_code_pairs(columns, first, second):
+    """Группировка по двум полям: {(код первого, код второго): число студентов}."""
+    a, b = columns.codes[first], columns.codes[second]
+    if columns.numpy:
+        if not columns.size:
+            return {}
+        width = int(b.max()) + 1
+        keys, counts = np.unique(a * width + b, return_counts=True)
+        return {divmod(key, width): count for key, count in zip(keys.tolist(), counts.tolist())}
+    return Counter(zip(a, b))
+
+def count_hours(columns):
+    """
+    Регистрации по часам от 1970-01-01: ({номер часа: число}, студентов без даты).
+    Из этой гистограммы складываются и дни, и часы суток.
+    """
+    dates = columns.dates
+    if columns.numpy:
+        valid = dates[dates != MISSING_DATE]
+        missing = columns.size - len(valid)
+        if not len(valid):
+            return {}, missing
+        hours = valid // 3600
+        low = int(hours.min())
+        span = int(hours.max()) - low + 1
+        if span <= max(len(hours), 1 << 20):
+            counts = np.bincount(hours - low)
+            present = np.flatnonzero(counts)
+            return dict(zip((present + low).tolist(), counts[present].tolist())), missing
+        # Даты разбросаны на века - bincount был бы слишком длинным
+        keys, counts = np.unique(hours, return_counts=True)
+        return dict(zip(keys.tolist(), counts.tolist())), missing
+    counts = Counter(date // 3600 for date in dates if date != MISSING_DATE)
+    return counts, columns.size - sum(counts.values())
+
+def _ranked(entries):
+    """Самые частые первыми, при равенстве - по значению."""
+    return sorted(entries, key=lambda entry: (-entry['count'],
+                                              [str(value) for value in entry.values()]))
+
+def build_report(columns):
+    """📊 Полный отчёт (словарь, пригодный для JSON) по столбцам базы."""
+    breakdowns = {}
+    for field in CATEGORICAL_FIELDS:
+        labels = columns.labels[field]
+        breakdowns[field] = _ranked({'value': labels[code], 'count': count}
+                                    for code, count in count_codes(columns, field).items())
+    colleges, courses = columns.labels['college'], columns.labels['course']
+    breakdowns['college_course'] = _ranked(
+        {'college': colleges[college], 'course': courses[course], 'count': count}
+        for (college, course), count in count_code_pairs(columns, 'college', 'course').items())
+
+    hours, missing = count_hours(columns)
+    by_day = Counter()
+    by_hour = [0] * 24
+    for hour, count in hours.items():
+        by_day[hour // 24] += count
+        by_hour[hour % 24] += count
+    return {
+        'total': columns.size,
+        'engine': 'numpy' if columns.numpy else 'array',
+        'breakdowns': breakdowns,
+        'registrations': {
+            'by_day': [{'date': epoch_to_date(day * 86400)[:10], 'count': by_day[day]}
+                       for day in sorted(by_day)],
+            'by_hour': [{'hour': hour, 'count': count} for hour, count in enumerate(by_hour)],
+            'without_date': missing,
+        },
+    }
+
+def analyze_store(store, engine='auto'):
+    """
+    ▶️ Загружает базу из хранилища по столбцам и строит отчёт.
+    В отчёт добавляется время загрузки и расчёта (seconds).
+    """
+    numpy = resolve_engine(engine)
+    started = time.perf_counter()
+    columns = load_columns(store, numpy)
+    loaded = time.perf_counter()
+    report = build_report(columns)
+    report['seconds'] = {'load': round(loaded - started, 3),
+                         'compute': round(time.perf_counter() - loaded, 3)}
+    return report
+
+# ─────────────────────────────────────────────────────────────
+# ВЫВОД
+# ─────────────────────────────────────────────────────────────
+
+BREAKDOWN_TITLES = (
+    ('college', '🏫 По колледжам'),
+    ('course', '📚 По курсам'),
+    ('group', '👥 По группам'),
+    ('status', '📊 По статусам'),
+)
+
+def _bar(count, largest):
+    return '█' * max(1, round(count / largest * BAR_WIDTH)) if count else ''
+
+def print_report(report, top=CONSOLE_TOP, days=CONSOLE_DAYS, file=None):
+    """🖥️ Печатает отчёт: top строк каждой разбивки и гистограмма последних days дней."""
+    file = file or sys.stdout
+    total = report['total']
+    seconds = report['seconds']
+    print(f"\n📈 Аналитика базы данных: {total} студентов "
+          f"({report['engine']}, загрузка {seconds['load']:.2f} с, "
+          f"расчёт {seconds['compute']:.2f} с)", file=file)
+    if not total:
+        return
+
+    def share(count):
+        return f"{count / total * 100:5.1f}%"
+
+    breakdowns = report['breakdowns']
+    for field, title in BREAKDOWN_TITLES:
+        entries = breakdowns[field]
+        shown = f" (топ {top} из {len(entries)})" if len(entries) > top else ""
+        print(f"\n{title}{shown}:", file=file)
+        for entry in entries[:top]:
+            print(f"  {entry['count']:>9} {share(entry['count'])}  {entry['value'] or '—'}", file=file)
+
+    entries = breakdowns['college_course']
+    shown = f" (топ {top} из {len(entries)})" if len(entries) > top else ""
+    print(f"\n🏫 Колледж × курс{shown}:", file=file)
+    for entry in entries[:top]:
+        print(f"  {entry['count']:>9} {share(entry['count'])}  "
+              f"{entry['college'] or '—'} / {entry['course'] or '—'}", file=file)
+
+    registrations = report['registrations']
+    by_day = registrations['by_day']
+    if by_day:
+        recent = by_day[-days:]
+        largest = max(entry['count'] for entry in recent)
+        print(f"\n📅 Регистрации по дням (последние {len(recent)} из {len(by_day)} дней "
+              f"с регистрациями, {by_day[0]['date']} - {by_day[-1]['date']}):", file=file)
+        for entry in recent:
+            print(f"  {entry['date']} {entry['count']:>8} {_bar(entry['count'], largest)}", file=file)
+        by_hour = registrations['by_hour']
+        largest = max(entry['count'] for entry in by_hour)
+        print("\n🕒 Регистрации по часам суток:", file=file)
+        for entry in by_hour:
+            print(f"  {entry['hour']:02d}:00 {entry['count']:>8} {_bar(entry['count'], largest)}",
+                  file=file)
+    if registrations['without_date']:
+        print(f"\n⚠️ Без даты регистрации: {registrations['without_date']}", file=file)
+
+def write_csv(report, file, top=None):
+    """📄 Отчёт в CSV: раздел, значение, второе значение (курс для колледж × курс), число."""
+    writer = csv.writer(file)
+    writer.writerow(('section', 'value', 'subvalue', 'count'))
+    writer.writerow(('total', '', '', report['total']))
+    breakdowns = report['breakdowns']
+    for field in CATEGORICAL_FIELDS:
+        for entry in breakdowns[field][:top]:
+            writer.writerow((field, entry['value'], '', entry['count']))
+    for entry in breakdowns['college_course'][:top]:
+        writer.writerow(('college_course', entry['college'], entry['course'], entry['count']))
+    registrations = report['registrations']
+    for entry in registrations['by_day']:
+        writer.writerow(('day', entry['date'], '', entry['count']))
+    for entry in registrations['by_hour']:
+        writer.writerow(('hour', f"{entry['hour']:02d}", '', entry['count']))
+    writer.writerow(('without_date', '', '', registrations['without_date']))
+
+def write_json(report, file, top=None):
+    """💾 Отчёт в JSON (разбивки - top строк, если задано)."""
+    if top is not None:
+        report = dict(report, breakdowns={field: entries[:top]
+                                          for field, entries in report['breakdowns'].items()})
+    json.dump(report, file, ensure_ascii=False, indent=2)
+    file.write('\n')
@@ -0,0 +1,184 @@
+"""
+📜 ПАКЕТНЫЙ РЕЖИМ (JSON LINES)
+===========================================================
+Неинтерактивный режим для всех трёх программ: команды читаются
+по одной JSON-строке из файла или stdin, выполняются над одним
+загруженным хранилищем, а результаты пишутся JSON-строками
+в stdout крупными блоками (без print на каждый запрос).
+
+Команда:   {"op": "<операция>", ...параметры..., "ref": <необязательно>}
+Результат: {"ok": true, "result": ..., "ref": ...}
+           {"ok": false, "error": "...", "ref": ...}
+
+Результаты выводятся строго в порядке команд. Операция может
+отложить ответ (Pending): так регистрации копятся и записываются
+в базу одной пачкой перед следующей командой другого вида.
+"""
+
+import io
+import sys
+import json
+import time
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Сколько готовых строк результата копится перед записью в поток
+OUTPUT_CHUNK = 4096
+
+# Размер буфера вывода
+OUTPUT_BUFFER = 1024 * 1024
+
+# Больше скольких отложенных ответов сеанс обязан записать накопленное
+PENDING_LIMIT = 10000
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# ─────────────────────────────────────────────────────────────
+# СЕАНС
+# ─────────────────────────────────────────────────────────────
+
+class Pending:
+    """Отложенный результат: значение появится после BatchSession.flush()."""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self):
+        self.value = None
+        self.error = None
+
+class BatchSession:
+    """
+    Базовый класс сеанса пакетного режима. Операция 'x' выполняется
+    методом op_x(request); deferred_ops - операции, которые могут
+    вернуть Pending и не требуют записи накопленного перед собой.
+    """
+
+    deferred_ops = ()
+
+    def __init__(self):
+        self.pending = 0
+
+    def flush(self):
+        """Завершает отложенные операции (выставляет значения Pending)."""
+
+    def close(self):
+        self.flush()
+
+# ─────────────────────────────────────────────────────────────
+# ВЫПОЛНЕНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def _response(ref, ok, payload):
+    response = {'ok': ok, 'result' if ok else 'error': payload}
+    if ref is not None:
+        response['ref'] = ref
+    return response
+
+def _execute(session, line):
+    """Выполняет одну команду; возвращает (ref, ok, результат или Pending)."""
+    try:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        request = json.loads(line)
+        op = request.get('op')
+        ref = request.get('ref')
+    except (ValueError, AttributeError) as e:
+        return None, False, f"неверная строка JSON: {e}"
+    handler = getattr(session, f'op_{op}', None) if isinstance(op, str) else None
+    if handler is None:
+        return ref, False, f"неизвестная операция: {op!r}"
+    if session.pending and op not in session.deferred_ops:
+        session.flush()
+    try:
+        return ref, True, handler(request)
+    except (KeyError, TypeError, ValueError) as e:
+        return ref, False, f"неверные параметры: {e!r}"
+    except Exception as e:
+        return ref, False, str(e)
+
+def run_batch(session, source, output):
+    """
+    ▶️ Выполняет все команды из source (итерируемое строк) и пишет
+    результаты в output (двоичный поток). Возвращает сводку.
+    """
+    started = time.perf_counter()
+    summary = {'commands': 0, 'errors': 0}
+    queue = []
+
+    def write_ready(force):
+        # Пишем готовую часть очереди (до первого незавершённого ответа)
+        if not force and len(queue) < OUTPUT_CHUNK:
+            return
+        lines = []
+        for ref, ok, result in queue:
+            if isinstance(result, Pending):
+                if result.error is not None:
+                    ok, result = False, result.error
+                else:
+                    result = result.value
+            if not ok:
+                summary['errors'] += 1
+            lines.append(_encode(_response(ref, ok, result)))
+        lines.append('')
+        output.write('\n'.join(lines).encode('utf-8'))
+        queue.clear()
+
+    try:
+        for line in source:
+            if not line.strip():
+                continue
+            summary['commands'] += 1
+            queue.append(_execute(session, line))
+            if session.pending >= PENDING_LIMIT:
+                session.flush()
+            if not session.pending:
+                write_ready(False)
+    finally:
+        session.close()
+        if queue:
+            write_ready(True)
+        output.flush()
+
+    summary['seconds'] = time.perf_counter() - started
+    summary['per_second'] = summary['commands'] / summary['seconds'] if summary['seconds'] else 0.0
+    return summary
+
+# ─────────────────────────────────────────────────────────────
+# КОМАНДНАЯ СТРОКА
+# ─────────────────────────────────────────────────────────────
+
+def add_batch_arguments(parser):
+    """🧭 Добавляет к разбору аргументов параметры пакетного режима."""
+    parser.add_argument('--input', default='-',
+                        help="файл с командами JSONL (по умолчанию stdin)")
+    parser.add_argument('--output', default='-',
+                        help="файл для результатов JSONL (по умолчанию stdout)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="не выводить сводку в stderr")
+
+def run_batch_cli(session, args):
+    """
+    ▶️ Запускает пакетный режим с параметрами из add_batch_arguments.
+    Сводка выводится в stderr, чтобы не смешиваться с результатами.
+    Возвращает код выхода: 0 без ошибок, 1 если были ошибки.
+    """
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    if args.output == '-':
+        sys.stdout.flush()
+        output = io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'wb', closefd=False),
+                                   buffer_size=OUTPUT_BUFFER)
+    else:
+        output = open(args.output, 'wb', buffering=OUTPUT_BUFFER)
+    try:
+        summary = run_batch(session, source, output)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        output.close()
+    if not args.quiet:
+        print(f"📜 Команд: {summary['commands']}, ошибок: {summary['errors']}, "
+              f"{summary['seconds']:.2f} с ({summary['per_second']:.0f} команд/с)",
+              file=sys.stderr)
+    return 1 if summary['errors'] else 0
@@ -0,0 +1,9 @@
+"""
+⏱️ БЕНЧМАРКИ
+===========================================================
+Замеры производительности горячих путей программы.
+Запуск из корня проекта: python -m benchmarks.<модуль>
+
+Полный набор с сохранением результатов для сравнения прогонов:
+python -m benchmarks.suite (данные - benchmarks.datagen).
+"""
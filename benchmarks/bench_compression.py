@@ -0,0 +1,95 @@
+"""
+📦 Сжатая база (.json.gz, .json.xz) против обычного students_database.json:
+размер файла, сохранение, загрузка целиком и первый поиск в незагруженной
+базе (сжатая разбирается потоком до совпадения) - время и прочитанные байты.
+
+Запуск: python -m benchmarks.bench_compression [--students N] [--data-dir DIR]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, '.')
+
+from student_store import StudentStore
+from benchmarks import datagen
+
+FORMATS = ('.json', '.json.gz', '.json.xz')
+
+def read_bytes():
+    """Прочитанные процессом байты (rchar из /proc/self/io) или None."""
+    try:
+        with open('/proc/self/io', 'rb') as f:
+            return int(f.read().split(None, 2)[1])
+    except OSError:
+        return None
+
+def measure(func):
+    """(секунды, прочитано байт) одного вызова func."""
+    before = read_bytes()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    after = read_bytes()
+    return elapsed, (after - before if before is not None else None)
+
+def cold_find(path, key):
+    store = StudentStore(path)
+    found = store.find(*key)
+    store.close()
+    return found
+
+def format_size(value):
+    return '-' if value is None else f"{value / 1024 / 1024:.1f}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=100_000)
+    parser.add_argument('--data-dir', default=None, help="каталог для баз (по умолчанию - временный)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='bench_compression_')
+    os.makedirs(data_dir, exist_ok=True)
+    source = os.path.join(data_dir, f'students_{args.students}.json')
+    datagen.write_database(source, args.students, args.seed)
+    records = StudentStore(source).all()
+    rng = random.Random(args.seed)
+    lookups = [
+        ("первая четверть", records[rng.randrange(max(1, len(records) // 4))].key),
+        ("середина", records[len(records) // 2].key),
+        ("нет в базе", ('Отсутствующий Студент', 'НЕТ-0', '0')),
+    ]
+
+    print(f"База: {len(records)} студентов\n")
+    print(f"{'формат':<10} {'размер, МБ':>11} {'сохранение, с':>14} "
+          f"{'загрузка, с':>12} {'прочитано, МБ':>14}")
+    paths = {}
+    for suffix in FORMATS:
+        path = paths[suffix] = os.path.join(data_dir, f'students_{args.students}{suffix}')
+        store = StudentStore(path)
+        saved, _ = measure(lambda: store.save(records))
+        store.close()
+        loaded, read = measure(lambda: len(StudentStore(path)))
+        print(f"{suffix:<10} {format_size(os.path.getsize(path)):>11} {saved:>14.2f} "
+              f"{loaded:>12.2f} {format_size(read):>14}")
+
+    print(f"\nПервый поиск в незагруженной базе (время, с / прочитано, МБ):")
+    print(f"{'студент':<18}" + ''.join(f"{suffix:>20}" for suffix in FORMATS))
+    for label, key in lookups:
+        cells = []
+        for suffix in FORMATS:
+            elapsed, read = measure(lambda: cold_find(paths[suffix], key))
+            cells.append(f"{elapsed:.2f} / {format_size(read)}")
+        print(f"{label:<18}" + ''.join(f"{cell:>20}" for cell in cells))
+
+    if args.data_dir is None:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
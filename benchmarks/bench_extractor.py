@@ -0,0 +1,63 @@
+"""
+⏱️ Микробенчмарк извлечения полей: однопроходный FieldExtractor
+против прежних циклов re.search по каждому шаблону.
+
+Запуск: python -m benchmarks.bench_extractor [--repeat N]
+"""
+
+import re
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, '.')
+
+from field_extractor import extract_fields
+
+# ─────────────────────────────────────────────────────────────
+# ПРЕЖНЯЯ РЕАЛИЗАЦИЯ (для сравнения)
+# ─────────────────────────────────────────────────────────────
+
+def legacy_extract(content):
+    """Прежний разбор из Tarakan.parse_file: re.search на каждый шаблон."""
+    patterns = {
+        'college': [r'Колледж[:\s]*([^\n]+)', r'College[:\s]*([^\n]+)', r'Учебное заведение[:\s]*([^\n]+)'],
+        'course': [r'Курс[:\s]*([^\n]+)', r'Course[:\s]*([^\n]+)'],
+        'name': [r'ФИ[:\s]*([^\n]+)', r'ФИО[:\s]*([^\n]+)', r'Name[:\s]*([^\n]+)', r'Имя[:\s]*([^\n]+)'],
+        'group': [r'Команда[:\s]*([^\n]+)', r'Группа[:\s]*([^\n]+)', r'Group[:\s]*([^\n]+)', r'Team[:\s]*([^\n]+)'],
+        'id': [r'ID[:\s]*([^\n]+)', r'ИД[:\s]*([^\n]+)', r'Номер[:\s]*([^\n]+)', r'№[:\s]*([^\n]+)']
+    }
+    found = {}
+    for field_name, field_patterns in patterns.items():
+        for pattern in field_patterns:
+            match = re.search(pattern, content, re.IGNORECASE)
+            if match:
+                found[field_name] = match.group(1).strip()
+                break
+    return tuple(found.get(f) for f in ('college', 'course', 'name', 'group', 'id'))
+
+# ─────────────────────────────────────────────────────────────
+# ДАННЫЕ
+# ─────────────────────────────────────────────────────────────
+
+SAMPLES = {
+    'README002 (3 записи)': open('README002.md', encoding='utf-8').read(),
+    'английские метки': "College: PK\nCourse: 2\nName: Ivan Petrov\nTeam: 7\nID: 42\n",
+    'неполный файл, 20 КБ текста': ("Произвольный текст без меток полей. " * 550) + "\nГруппа: 21-ИС\n",
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'файл':<30} {'прежний, мкс':>14} {'новый, мкс':>12} {'ускорение':>10}")
+    for title, content in SAMPLES.items():
+        old = min(timeit.repeat(lambda: legacy_extract(content), number=args.repeat, repeat=3))
+        new = min(timeit.repeat(lambda: extract_fields(content), number=args.repeat, repeat=3))
+        old_us = old / args.repeat * 1e6
+        new_us = new / args.repeat * 1e6
+        print(f"{title:<30} {old_us:>14.1f} {new_us:>12.1f} {old_us / new_us:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+🤔 «Возможно, вы имели в виду»: нечёткий поиск ФИО с опечатками
+через BK-дерево слов (NameIndex.suggest) против перебора всех ФИО
+с расстоянием Дамерау-Левенштейна.
+
+Запуск: python -m benchmarks.bench_fuzzy [--students N] [--queries Q] [--distance D]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, '.')
+
+from field_extractor import normalize_name
+from fuzzy_search import damerau_levenshtein
+from name_index import NameIndex
+from benchmarks.bench_name_index import make_names, percentile
+
+# ─────────────────────────────────────────────────────────────
+# ДАННЫЕ
+# ─────────────────────────────────────────────────────────────
+
+LETTERS = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+
+def make_typo(name, edits, rng):
+    """ФИО с edits случайными опечатками: замена, пропуск, лишняя буква, перестановка."""
+    chars = list(name.lower())
+    for _ in range(edits):
+        position = rng.randrange(len(chars) - 1)
+        kind = rng.randrange(4)
+        if kind == 0:
+            chars[position] = rng.choice(LETTERS)
+        elif kind == 1:
+            del chars[position]
+        elif kind == 2:
+            chars.insert(position, rng.choice(LETTERS))
+        else:
+            chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    return ''.join(chars)
+
+def make_typo_queries(names, count, max_edits, seed=11):
+    rng = random.Random(seed)
+    return [make_typo(rng.choice(names), rng.randint(1, max_edits), rng) for _ in range(count)]
+
+# ─────────────────────────────────────────────────────────────
+# ЗАМЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+def linear_suggest(keys, query, max_distance, limit):
+    """Перебор: расстояние до каждого различного ФИО (с ранним выходом)."""
+    query = normalize_name(query)
+    found = []
+    for key in keys:
+        distance = damerau_levenshtein(query, key, max_distance)
+        if distance <= max_distance:
+            found.append((distance, key))
+    found.sort()
+    return found[:limit]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--distance', type=int, default=2)
+    parser.add_argument('--limit', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    names = make_names(args.students)
+    index = NameIndex((name, number) for number, name in enumerate(names))
+    started = time.perf_counter()
+    index.suggest('а')  # построение BK-дерева слов
+    words = len(index._word_tree)
+    print(f"BK-дерево: {words} различных слов из {len(index)} ФИО "
+          f"за {time.perf_counter() - started:.1f} с")
+
+    timings, comparisons, hits = [], [], 0
+    for query in make_typo_queries(names, args.queries, args.distance):
+        started = time.perf_counter()
+        found = index.suggest_keys(query, args.distance, args.limit)
+        timings.append(time.perf_counter() - started)
+        comparisons.append(index._word_tree.comparisons)
+        hits += bool(found)
+
+    keys = list(index._keys)
+    linear = []
+    for query in make_typo_queries(names, 5, args.distance):
+        started = time.perf_counter()
+        linear_suggest(keys, query, args.distance, args.limit)
+        linear.append(time.perf_counter() - started)
+
+    print(f"Найдены варианты: {hits} из {len(timings)} запросов; сравнений слов "
+          f"в BK-дереве на слово запроса: медиана {percentile(comparisons, 0.5)} из {words}")
+    print(f"{'поиск':<22} {'число':>7} {'p50, мс':>9} {'p99, мс':>9} {'макс, мс':>9}")
+    for title, values in (("BK-дерево", timings), ("перебор всех ФИО", linear)):
+        print(f"{title:<22} {len(values):>7} {percentile(values, 0.5) * 1000:>9.3f} "
+              f"{percentile(values, 0.99) * 1000:>9.3f} {max(values) * 1000:>9.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+🧠 Память базы студентов: словари из json.load против записей Student
+(__slots__, интернированные колледж/курс/группа/статус, дата числом).
+
+Запуск: python -m benchmarks.bench_memory [--rows N]
+"""
+
+import gc
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, '.')
+
+from student_store import StudentStore
+
+# ─────────────────────────────────────────────────────────────
+# ДАННЫЕ
+# ─────────────────────────────────────────────────────────────
+
+COLLEGES = [f"Колледж информатики и программирования №{i}" for i in range(1, 41)]
+GROUPS = [f"{year}-{code}" for year in range(20, 26) for code in ('ИС', 'ПИ', 'ВТ', 'БД', 'СА')]
+SURNAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев']
+FIRST_NAMES = ['Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Иван', 'Никита']
+
+def write_database(path, rows, seed=42):
+    """Пишет синтетическую базу из rows студентов в JSON файл."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(rows):
+            student = {
+                'college': rng.choice(COLLEGES),
+                'course': str(rng.randint(1, 4)),
+                'name': f"{rng.choice(SURNAMES)} {rng.choice(FIRST_NAMES)} {i}",
+                'group': rng.choice(GROUPS),
+                'id': str(100000 + i),
+                'registration_date': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                                     f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+                'status': 'новый студент',
+            }
+            f.write((',' if i else '') + json.dumps(student, ensure_ascii=False))
+        f.write(']')
+
+# ─────────────────────────────────────────────────────────────
+# ЗАМЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+def measure(load):
+    """Возвращает (удерживаемая память, пик) в байтах для результата load()."""
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+def load_dicts(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_students(path):
+    return StudentStore(path).all()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    mb = 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'students.json')
+        write_database(path, args.rows)
+        print(f"База: {args.rows} студентов, {os.path.getsize(path) / mb:.1f} МБ на диске")
+
+        dict_current, dict_peak = measure(lambda: load_dicts(path))
+        slot_current, slot_peak = measure(lambda: load_students(path))
+
+    print(f"{'представление':<16} {'в памяти, МБ':>13} {'пик, МБ':>9} {'байт/студент':>13}")
+    for title, current, peak in (('dict', dict_current, dict_peak),
+                                 ('Student', slot_current, slot_peak)):
+        print(f"{title:<16} {current / mb:>13.1f} {peak / mb:>9.1f} "
+              f"{current / args.rows:>13.0f}")
+    print(f"Экономия памяти: {1 - slot_current / dict_current:.0%}")
+
+if __name__ == '__main__':
+    main()
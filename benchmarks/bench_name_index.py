@@ -0,0 +1,106 @@
+"""
+🔤 Поиск по мере ввода по ФИО: построение NameIndex на N студентах
+и задержки запросов (префикс и подстрока) против линейного перебора.
+
+Запуск: python -m benchmarks.bench_name_index [--students N] [--queries Q]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, '.')
+
+from field_extractor import normalize_name
+from name_index import NameIndex
+
+# ─────────────────────────────────────────────────────────────
+# ДАННЫЕ
+# ─────────────────────────────────────────────────────────────
+
+SYLLABLES = ['ка', 'ра', 'ло', 'ми', 'ша', 'ти', 'во', 'ле', 'гу', 'сё', 'ны', 'бе',
+             'за', 'ро', 'ки', 'па', 'ду', 'не', 'хо', 'чи', 'ма', 'со', 'ре', 'жу']
+SUFFIXES = ['ов', 'ев', 'ин', 'ский', 'енко', 'ук', 'ых']
+FIRST_NAMES = ['Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Артём',
+               'Илья', 'Кирилл', 'Михаил', 'Никита', 'Матвей', 'Роман', 'Егор', 'Арсений',
+               'Иван', 'Денис', 'Евгений', 'Тимофей', 'Владислав', 'Анна', 'Мария', 'Елена',
+               'Дарья', 'Алина', 'Ирина', 'Екатерина', 'Арина', 'Полина', 'Ольга', 'Юлия',
+               'Татьяна', 'Наталья', 'Виктория', 'Елизавета', 'Анастасия', 'Ксения', 'Софья']
+
+def make_names(count, seed=42):
+    """Синтетические ФИО: фамилия из слогов, имя из списка."""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        surname = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        surname = surname.capitalize() + rng.choice(SUFFIXES)
+        names.append(f"{surname} {rng.choice(FIRST_NAMES)}")
+    return names
+
+def make_queries(names, count, seed=7):
+    """Запросы «по мере ввода»: начало фамилии/имени или кусок из середины."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        if rng.random() < 0.7:
+            word = rng.choice(name.split())
+            queries.append(('префикс', word[:rng.randint(1, len(word))].lower()))
+        else:
+            start = rng.randrange(max(1, len(name) - 4))
+            queries.append(('подстрока', name[start:start + rng.randint(3, 5)].lower()))
+    return queries
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+# ─────────────────────────────────────────────────────────────
+# ЗАМЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+def linear_search(names, query, limit):
+    """
+    Прежний способ: перевод в нижний регистр и проверка вхождения
+    на каждое ФИО (для ранжирования нужен полный проход).
+    """
+    found = [name for name in names if query in name.lower()]
+    found.sort(key=lambda name: (name.lower().find(query), len(name)))
+    return found[:limit]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    names = make_names(args.students)
+    started = time.perf_counter()
+    index = NameIndex((name, number) for number, name in enumerate(names))
+    index.search('а')  # сортировка хвостов
+    print(f"Построение индекса: {args.students} ФИО ({len(index)} различных) "
+          f"за {time.perf_counter() - started:.1f} с")
+
+    timings = {}
+    for kind, query in make_queries(names, args.queries):
+        started = time.perf_counter()
+        index.search(query, args.limit)
+        timings.setdefault(kind, []).append(time.perf_counter() - started)
+
+    linear = []
+    for _kind, query in make_queries(names, 20):
+        started = time.perf_counter()
+        linear_search(names, normalize_name(query), args.limit)
+        linear.append(time.perf_counter() - started)
+
+    print(f"{'запрос':<22} {'число':>7} {'p50, мс':>9} {'p99, мс':>9} {'макс, мс':>9}")
+    rows = [(f"индекс: {kind}", values) for kind, values in timings.items()]
+    rows.append(("линейный перебор", linear))
+    for title, values in rows:
+        print(f"{title:<22} {len(values):>7} {percentile(values, 0.5) * 1000:>9.3f} "
+              f"{percentile(values, 0.99) * 1000:>9.3f} {max(values) * 1000:>9.3f}")
+
+if __name__ == '__main__':
+    main()
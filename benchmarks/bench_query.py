@@ -0,0 +1,88 @@
+"""
+🗃️ Выборки по группе, колледжу и курсу и по диапазону дат:
+SecondaryIndex против перебора всех студентов.
+
+Запуск: python -m benchmarks.bench_query [--students N]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, '.')
+
+from secondary_index import SecondaryIndex, parse_date_range, date_key
+from student_record import Student, epoch_to_date
+
+COLLEGES = [f'Колледж №{number}' for number in range(1, 21)]
+GROUPS = [f'ИС-{number}' for number in range(1, 501)]
+START = date_key('2023-01-01')
+PERIOD = 2 * 365 * 24 * 60 * 60
+
+def make_students(count, seed=42):
+    rng = random.Random(seed)
+    return [Student(rng.choice(COLLEGES), f'{rng.randint(1, 4)} курс', f'Студент {number}',
+                    rng.choice(GROUPS), str(number),
+                    epoch_to_date(START + rng.randrange(PERIOD)), 'активный')
+            for number in range(count)]
+
+def linear_query(students, college=None, course=None, group=None, date_from=None, date_to=None):
+    """Прежний способ: проверка условий на каждом студенте."""
+    low, high = parse_date_range(date_from, date_to)
+    for student in students:
+        if college is not None and student.college != college:
+            continue
+        if course is not None and student.course != course:
+            continue
+        if group is not None and student.group != group:
+            continue
+        seconds = date_key(student.registration_date)
+        if low is not None and (seconds is None or seconds < low):
+            continue
+        if high is not None and (seconds is None or seconds >= high):
+            continue
+        yield student
+
+QUERIES = [
+    ("группа", dict(group='ИС-42')),
+    ("колледж + курс", dict(college='Колледж №3', course='2 курс')),
+    ("неделя регистраций", dict(date_from='2024-03-01', date_to='2024-03-07')),
+    ("группа + месяц", dict(group='ИС-7', date_from='2024-01-01', date_to='2024-01-31')),
+]
+
+def measure(run, repeats):
+    best_first, best_all, found = None, None, 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        results = run()
+        next(results, None)
+        first = time.perf_counter() - started
+        found = 1 + sum(1 for _ in results)
+        total = time.perf_counter() - started
+        best_first = first if best_first is None else min(best_first, first)
+        best_all = total if best_all is None else min(best_all, total)
+    return found, best_first, best_all
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    students = make_students(args.students)
+    started = time.perf_counter()
+    index = SecondaryIndex(students)
+    next(index.query(date_from='2023-01-01'), None)  # сортировка дат
+    print(f"Построение индексов: {args.students} студентов за {time.perf_counter() - started:.1f} с")
+
+    print(f"{'выборка':<20} {'найдено':>8} {'индекс: первый, мс':>19} {'индекс: все, мс':>16} "
+          f"{'перебор, мс':>12}")
+    for title, filters in QUERIES:
+        found, first, total = measure(lambda: index.query(**filters), args.repeats)
+        _found, _first, linear = measure(lambda: linear_query(students, **filters), 1)
+        print(f"{title:<20} {found:>8} {first * 1000:>19.3f} {total * 1000:>16.3f} "
+              f"{linear * 1000:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+🧪 Генератор синтетических данных студентов (воспроизводимый: seed).
+
+- файлы студентов во всех поддерживаемых кодировках
+  (как на входе Tarakan.parse_file);
+- многозаписные файлы в стиле README002.md (Pozdnyakov.py);
+- базы students_database.json на 1k, 100k, 1M+ записей.
+
+Запуск: python -m benchmarks.datagen КАТАЛОГ [--rows 1000 100000 1000000]
+        [--files N] [--seed S]
+"""
+
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, '.')
+
+from readme_index import format_record
+from student_record import epoch_to_date
+from secondary_index import date_key
+from student_store import snapshot_record
+
+# ─────────────────────────────────────────────────────────────
+# СПРАВОЧНИКИ
+# ─────────────────────────────────────────────────────────────
+
+# Кодировки, которые распознаёт encoding_detect
+ENCODINGS = ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32', 'cp1251', 'koi8-r')
+
+SURNAMES = ['Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов',
+            'Михайлов', 'Новиков', 'Фёдоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев',
+            'Семёнов', 'Егоров', 'Павлов', 'Козлов', 'Степанов', 'Николаев', 'Орлов',
+            'Андреев', 'Макаров', 'Никитин', 'Захаров', 'Зайцев', 'Соловьёв', 'Борисов',
+            'Яковлев', 'Григорьев', 'Романов', 'Воробьёв', 'Сергеев', 'Кузьмин', 'Фролов',
+            'Александров', 'Дмитриев', 'Королёв', 'Гусев', 'Киселёв', 'Ильин', 'Максимов',
+            'Поляков', 'Сорокин', 'Виноградов', 'Ковалёв', 'Белов', 'Медведев', 'Антонов',
+            'Тарасов', 'Жуков', 'Баранов', 'Филиппов', 'Комаров', 'Давыдов', 'Беляев',
+            'Герасимов', 'Богданов', 'Осипов', 'Сидоров', 'Матвеев', 'Титов', 'Марков',
+            'Миронов', 'Крылов', 'Куликов', 'Карпов', 'Власов', 'Мельников', 'Денисов',
+            'Гаврилов', 'Тихонов', 'Казаков', 'Афанасьев', 'Данилов', 'Савельев', 'Тимофеев',
+            'Фомин', 'Чернов', 'Абрамов', 'Мартынов', 'Ефимов', 'Федотов', 'Щербаков',
+            'Назаров', 'Калинин', 'Исаев', 'Чернышёв', 'Быков', 'Маслов', 'Родионов',
+            'Коновалов', 'Лазарев', 'Воронин', 'Климов', 'Филатов', 'Пономарёв', 'Голубев',
+            'Кудрявцев', 'Прохоров', 'Наумов', 'Потапов', 'Журавлёв', 'Овчинников', 'Трофимов',
+            'Леонов', 'Соболев', 'Ермаков', 'Колесников', 'Гончаров', 'Емельянов', 'Никифоров',
+            'Грачёв', 'Котов', 'Гришин', 'Ефремов', 'Архипов', 'Громов', 'Кириллов', 'Малышев',
+            'Панов', 'Моисеев', 'Румянцев', 'Акимов', 'Кондратьев', 'Бирюков', 'Горбунов',
+            'Анисимов', 'Ерёмин', 'Тихомиров', 'Галкин', 'Лукьянов', 'Михеев', 'Скворцов',
+            'Юдин', 'Белоусов', 'Нестеров', 'Симонов', 'Прокофьев', 'Харитонов', 'Князев',
+            'Цветков', 'Левин', 'Митрофанов', 'Воронов', 'Аксёнов', 'Софронов', 'Мальцев',
+            'Логинов', 'Горшков', 'Савин', 'Краснов', 'Майоров', 'Демидов', 'Елисеев',
+            'Рыбаков', 'Сафонов', 'Плотников', 'Дёмин', 'Хохлов', 'Тараканов', 'Поздняков',
+            'Шевченко', 'Бондаренко', 'Коваленко', 'Ткаченко', 'Кравченко', 'Ли', 'Ким', 'Цой']
+MALE_NAMES = ['Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Артём',
+              'Илья', 'Кирилл', 'Михаил', 'Никита', 'Матвей', 'Роман', 'Егор', 'Арсений',
+              'Иван', 'Денис', 'Евгений', 'Тимофей', 'Владислав', 'Игорь', 'Владимир',
+              'Павел', 'Руслан', 'Марк', 'Константин', 'Тимур', 'Олег', 'Ярослав', 'Антон',
+              'Николай', 'Глеб', 'Данил', 'Савелий', 'Вадим', 'Степан', 'Юрий', 'Богдан']
+FEMALE_NAMES = ['Анна', 'Мария', 'Елена', 'Дарья', 'Алина', 'Ирина', 'Екатерина', 'Арина',
+                'Полина', 'Ольга', 'Юлия', 'Татьяна', 'Наталья', 'Виктория', 'Елизавета',
+                'Анастасия', 'Валерия', 'Ксения', 'Софья', 'Александра', 'Вероника', 'Алёна',
+                'Кристина', 'Маргарита', 'Диана', 'Светлана', 'Ульяна', 'Варвара', 'Милана']
+PATRONYMIC_BASES = ['Александро', 'Дмитрие', 'Сергее', 'Андрее', 'Алексее', 'Ивано', 'Михайло',
+                    'Николае', 'Владимиро', 'Евгенье', 'Олего', 'Игоре', 'Павло', 'Викторо',
+                    'Юрье', 'Анатолье', 'Романо', 'Петро', 'Валерье', 'Геннадье']
+COLLEGES = ['ПК им. Овчинникова', 'Колледж информатики и программирования',
+            'Колледж связи №54', 'Политехнический колледж №8', 'Колледж автоматизации',
+            'Московский колледж управления', 'Колледж современных технологий',
+            'Техникум информационных технологий', 'Колледж предпринимательства №11',
+            'Колледж архитектуры и дизайна', 'Колледж малого бизнеса №4',
+            'Колледж радиоэлектроники', 'Первый московский образовательный комплекс']
+SPECIALITIES = ['ИС', 'ПИ', 'ВТ', 'БД', 'СА', 'ИБ', 'ВЕБ', 'КС']
+FILLER = ['Заявление на доступ к учебной системе.', 'Прошу предоставить доступ к лабораториям.',
+          'Данные заполнены студентом самостоятельно.', 'Контактный телефон указан в анкете.',
+          'Подпись: ____________', 'Дата заполнения: см. отметку канцелярии.']
+
+# Варианты подписей полей, которые распознаёт field_extractor. Подписи
+# с низким приоритетом (College, Course, ФИ, Номер...) не используются:
+# значения вроде «2 курс» или «Колледж связи» содержат подписи
+# с более высоким приоритетом, и файл разбирался бы не так, как задуман
+LABELS = {
+    'college': ['Колледж'],
+    'course': ['Курс'],
+    'name': ['ФИО'],
+    'group': ['Группа', 'Команда', 'Group', 'Team'],
+    'id': ['ID'],
+}
+
+REGISTRATION_START = date_key('2019-09-01')
+REGISTRATION_PERIOD = 6 * 365 * 24 * 60 * 60
+
+# ─────────────────────────────────────────────────────────────
+# СТУДЕНТЫ
+# ─────────────────────────────────────────────────────────────
+
+def make_name(rng):
+    """ФИО с согласованием рода: Иванова Анна Сергеевна."""
+    surname = rng.choice(SURNAMES)
+    patronymic = rng.choice(PATRONYMIC_BASES)
+    if rng.random() < 0.5:
+        first = rng.choice(FEMALE_NAMES)
+        if surname.endswith(('ов', 'ев', 'ёв', 'ин')):
+            surname += 'а'
+        patronymic += 'вна'
+    else:
+        first = rng.choice(MALE_NAMES)
+        patronymic += 'вич'
+    # Часть студентов указывает только фамилию и имя
+    if rng.random() < 0.3:
+        return f"{surname} {first}"
+    return f"{surname} {first} {patronymic}"
+
+def make_student(rng, number):
+    """Запись студента для базы (поля как в students_database.json)."""
+    year = rng.randint(19, 25)
+    return {
+        'college': rng.choice(COLLEGES),
+        'course': f"{rng.randint(1, 4)} курс",
+        'name': make_name(rng),
+        'group': f"{year}-{rng.choice(SPECIALITIES)}-{rng.randint(1, 9)}",
+        'id': str(100000 + number),
+        'registration_date': epoch_to_date(REGISTRATION_START + rng.randrange(REGISTRATION_PERIOD)),
+        'status': rng.choice(('новый студент', 'новый студент', 'активный', 'активный',
+                              'активный', 'академический отпуск', 'выпускник')),
+    }
+
+def iter_students(count, seed=42):
+    """Поток count студентов (одинаковый для одного seed)."""
+    rng = random.Random(seed)
+    for number in range(count):
+        yield make_student(rng, number)
+
+# ─────────────────────────────────────────────────────────────
+# ФАЙЛЫ
+# ─────────────────────────────────────────────────────────────
+
+def student_file_text(student, rng):
+    """Текст файла студента: подписи полей в разных вариантах и произвольный текст."""
+    lines = [f"# Анкета студента {student['id']}", '']
+    if rng.random() < 0.5:
+        lines.append(rng.choice(FILLER))
+    for field in ('college', 'course', 'name', 'group', 'id'):
+        label = rng.choice(LABELS[field])
+        lines.append(f"{label}: {student[field]}")
+    lines.append('')
+    lines.extend(rng.sample(FILLER, rng.randint(1, 3)))
+    return '\n'.join(lines) + '\n'
+
+def write_student_files(directory, count, seed=42, encodings=ENCODINGS):
+    """
+    📄 Пишет count файлов студентов по кругу во всех кодировках.
+    Возвращает список (путь, кодировка, студент).
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    files = []
+    for number, student in enumerate(iter_students(count, seed)):
+        encoding = encodings[number % len(encodings)]
+        path = os.path.join(directory, f"student_{number:06d}_{encoding}.md")
+        text = student_file_text(student, rng)
+        try:
+            data = text.encode(encoding)
+        except UnicodeEncodeError:
+            # В KOI8-R нет знака '№' - в таких файлах пишут 'N'
+            data = text.replace('№', 'N').encode(encoding, errors='replace')
+        with open(path, 'wb') as file:
+            file.write(data)
+        files.append((path, encoding, student))
+    return files
+
+def write_readme(path, count, seed=42):
+    """📄 Файл пользователей в формате README002.md: записи через пустую строку."""
+    with open(path, 'w', encoding='utf-8') as file:
+        for number, student in enumerate(iter_students(count, seed)):
+            file.write(('\n' if number else '') + format_record(student))
+
+def write_database(path, count, seed=42):
+    """
+    🗄️ База students_database.json на count студентов
+    (в том же виде, что пишет StudentStore: json.dump с indent=2).
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        if not count:
+            file.write('[]')
+            return
+        file.write('[\n')
+        for number, student in enumerate(iter_students(count, seed)):
+            file.write((',\n' if number else '') + snapshot_record(student))
+        file.write('\n]')
+
+# ─────────────────────────────────────────────────────────────
+# КОМАНДНАЯ СТРОКА
+# ─────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="каталог для данных")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100_000, 1_000_000],
+                        help="размеры баз и файлов README")
+    parser.add_argument('--files', type=int, default=60, help="число файлов студентов")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    write_student_files(os.path.join(args.directory, 'students'), args.files, args.seed)
+    print(f"📄 Файлы студентов: {args.files} ({', '.join(ENCODINGS)})")
+    for rows in args.rows:
+        database = os.path.join(args.directory, f"students_database_{rows}.json")
+        readme = os.path.join(args.directory, f"README002_{rows}.md")
+        write_database(database, rows, args.seed)
+        write_readme(readme, rows, args.seed)
+        print(f"🗄️ {database}, {readme}")
+
+if __name__ == '__main__':
+    main()
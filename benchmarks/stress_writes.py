@@ -0,0 +1,96 @@
+"""
+🏋️ Стресс-тест одновременной записи: N процессов (по T потоков в каждом)
+одновременно регистрируют студентов в одной базе. После завершения
+проверяется, что ни одна запись не потеряна и не задвоена.
+
+Запуск: python -m benchmarks.stress_writes [--processes N] [--per-process M]
+        [--threads T] [--journal] [--backend json|sqlite]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, '.')
+
+from student_store import BACKENDS, open_store
+
+# ─────────────────────────────────────────────────────────────
+# ПРОЦЕСС-ТЕРМИНАЛ
+# ─────────────────────────────────────────────────────────────
+
+def make_student(terminal, number):
+    return {
+        'college': 'Колледж №1',
+        'course': str(number % 4 + 1),
+        'name': f"Терминал {terminal} Студент {number}",
+        'group': f"{terminal % 10}-ИС",
+        'id': f"{terminal}-{number}",
+        'registration_date': '2025-09-01 09:00:00',
+        'status': 'новый студент',
+    }
+
+def run_terminal(path, backend, journal, terminal, count, threads, start_event):
+    """Один терминал регистрации: добавляет count студентов по одному."""
+    store = open_store(path, backend=backend, journal=journal)
+    start_event.wait()
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(lambda n: store.add(make_student(terminal, n)),
+                                    range(count)))
+    finally:
+        store.close()
+    return sum(results)
+
+# ─────────────────────────────────────────────────────────────
+# ЗАПУСК
+# ─────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--per-process', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--journal', action='store_true')
+    parser.add_argument('--backend', choices=BACKENDS, default='json')
+    args = parser.parse_args(argv)
+
+    expected = args.processes * args.per_process
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'students.db' if args.backend == 'sqlite' else 'students.json')
+        with multiprocessing.Manager() as manager:
+            start_event = manager.Event()
+            with multiprocessing.Pool(args.processes) as pool:
+                jobs = [pool.apply_async(run_terminal,
+                                         (path, args.backend, args.journal, terminal,
+                                          args.per_process, args.threads, start_event))
+                        for terminal in range(args.processes)]
+                time.sleep(0.5)
+                started = time.perf_counter()
+                start_event.set()
+                reported = sum(job.get() for job in jobs)
+                elapsed = time.perf_counter() - started
+
+        store = open_store(path, backend=args.backend, journal=args.journal)
+        store.compact()
+        stored = len(store)
+        keys = {(s['name'], s['group'], s['id']) for s in store.all()}
+        store.close()
+
+    print(f"Процессов: {args.processes}, потоков: {args.threads}, "
+          f"хранилище: {args.backend}{' + журнал' if args.journal else ''}")
+    print(f"Ожидалось: {expected}, подтверждено add(): {reported}, "
+          f"в базе: {stored}, уникальных: {len(keys)}")
+    print(f"Время: {elapsed:.2f} с ({expected / elapsed:.0f} регистраций/с)")
+    if stored == len(keys) == reported == expected:
+        print("✅ Потерянных и задвоенных записей нет")
+        return 0
+    print("❌ Записи потеряны или задвоены!")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+⏱️ Набор бенчмарков горячих путей на синтетических данных (benchmarks.datagen):
+parse_file (с кэшем разбора и без), extract_user_data, find_user_in_file, find_student_in_database,
+add_student_to_database и show_database_stats на базах 1k, 100k и 1M записей
+(поиск с загрузкой базы - и для JSON, и для двоичного снимка).
+
+Результаты пишутся в JSON (--output), чтобы сравнивать прогоны:
+--compare прежний.json сравнивает лучшие времена (min устойчивее
+медианы к фоновой нагрузке) и завершается с кодом 1, если какой-то
+замер стал медленнее больше чем на --threshold.
+
+Запуск: python -m benchmarks.suite [--sizes 1000 100000 1000000] [--output FILE]
+        [--compare FILE] [--data-dir DIR] [--seed S]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+sys.path.insert(0, '.')
+
+import Tarakan
+import Pozdnyakov
+import readme_index
+from binary_snapshot import json_to_binary
+from benchmarks import datagen
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+SUITE_VERSION = 1
+DEFAULT_OUTPUT = 'benchmark_results.json'
+
+# Сколько раз повторяется «тёплый» поиск и сколько файлов студентов разбирается
+LOOKUPS = 1000
+FILES = 60
+
+# Допустимое замедление лучшего времени при сравнении с прежним прогоном
+DEFAULT_THRESHOLD = 0.25
+
+# ─────────────────────────────────────────────────────────────
+# ЗАМЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+def summarize(name, size, timings):
+    """Сводка по замерам одного случая (миллисекунды)."""
+    timings = sorted(timings)
+    count = len(timings)
+    return {
+        'name': name,
+        'size': size,
+        'calls': count,
+        'min_ms': timings[0] * 1000,
+        'median_ms': timings[count // 2] * 1000,
+        'p95_ms': timings[min(count - 1, int(count * 0.95))] * 1000,
+        'mean_ms': sum(timings) / count * 1000,
+    }
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+@contextlib.contextmanager
+def quiet():
+    """Вывод функций программы (print) не мешает замерам и отчёту."""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def repeats_for(size):
+    """Дорогие замеры (загрузка, запись всей базы) повторяются реже на больших базах."""
+    return max(3, min(50, 1_000_000 // max(size, 1)))
+
+def reset_tarakan(database):
+    """Переключает Tarakan.py на базу database (хранилище откроется заново)."""
+    with quiet():
+        Tarakan.close_database()
+    Tarakan._store = None
+    Tarakan.DATABASE_FILE = database
+
+def bench_files(data_dir, seed):
+    """
+    parse_file по файлам каждой кодировки (без кэша разбора и повторно
+    с ним) и extract_user_data по их тексту.
+    """
+    files = datagen.write_student_files(os.path.join(data_dir, 'students'), FILES, seed)
+    # Файлы «старше» окна проверки кэша: повторный разбор сверяется без чтения
+    settled = time.time() - 60
+    for path, _encoding, _student in files:
+        os.utime(path, (settled, settled))
+    results = []
+    Tarakan.PARSE_CACHE_FILE = None
+    for encoding in datagen.ENCODINGS:
+        paths = [path for path, file_encoding, _student in files if file_encoding == encoding]
+        with quiet():
+            timings = [timed(Tarakan.parse_file, path) for path in paths * 5]
+        results.append(summarize(f'parse_file[{encoding}]', None, timings))
+    Tarakan.PARSE_CACHE_FILE = os.path.join(data_dir, 'parse_cache.db')
+    paths = [path for path, _encoding, _student in files]
+    with quiet():
+        for path in paths:
+            Tarakan.parse_file(path)
+        timings = [timed(Tarakan.parse_file, path) for path in paths * 5]
+    results.append(summarize('parse_file (кэш разбора)', None, timings))
+    Tarakan.get_parse_cache().close()
+    Tarakan.PARSE_CACHE_FILE = None
+    rng = random.Random(seed)
+    texts = [datagen.student_file_text(student, rng) for _path, _encoding, student in files]
+    timings = [timed(Pozdnyakov.extract_user_data, text) for text in texts * 20]
+    results.append(summarize('extract_user_data', None, timings))
+    return results
+
+def bench_database(data_dir, size, seed):
+    """Поиск, добавление и статистика Tarakan.py на базе из size студентов."""
+    source = os.path.join(data_dir, f'students_database_{size}_{seed}.json')
+    if not os.path.exists(source):
+        datagen.write_database(source, size, seed)
+    database = os.path.join(data_dir, 'work_database.json')
+    rng = random.Random(seed)
+    sample = [student for student in datagen.iter_students(min(size, LOOKUPS * 10), seed)]
+    keys = [(s['name'], s['group'], s['id']) for s in rng.choices(sample, k=LOOKUPS)]
+    repeats = repeats_for(size)
+    results = []
+
+    cold = []
+    for _ in range(repeats):
+        shutil.copyfile(source, database)
+        reset_tarakan(database)
+        cold.append(timed(Tarakan.find_student_in_database, *keys[0]))
+    results.append(summarize('find_student_in_database (загрузка базы)', size, cold))
+
+    warm = [timed(Tarakan.find_student_in_database, *key) for key in keys]
+    results.append(summarize('find_student_in_database', size, warm))
+
+    binary = os.path.join(data_dir, f'students_database_{size}_{seed}.bin')
+    if not os.path.exists(binary):
+        json_to_binary(source, binary)
+    cold_binary = []
+    for _ in range(repeats):
+        reset_tarakan(binary)
+        cold_binary.append(timed(Tarakan.find_student_in_database, *keys[0]))
+    results.append(summarize('find_student_in_database (двоичный снимок)', size, cold_binary))
+    reset_tarakan(database)
+
+    with quiet():
+        stats = [timed(Tarakan.show_database_stats) for _ in range(repeats)]
+    results.append(summarize('show_database_stats', size, stats))
+
+    with quiet():
+        adds = [timed(Tarakan.add_student_to_database, 'Колледж замеров', '1 курс',
+                      f'Замеров Студент {number}', 'БЕНЧ-1', f'bench-{number}')
+                for number in range(repeats)]
+    results.append(summarize('add_student_to_database', size, adds))
+
+    reset_tarakan(Tarakan.DATABASE_FILE)
+    for path in (database, database + '.stats', database + '.lock'):
+        if os.path.exists(path):
+            os.remove(path)
+    return results
+
+def bench_readme(data_dir, size, seed):
+    """find_user_in_file Pozdnyakov.py по файлу из size записей."""
+    path = os.path.join(data_dir, f'README002_{size}_{seed}.md')
+    if not os.path.exists(path):
+        datagen.write_readme(path, size, seed)
+    rng = random.Random(seed + 1)
+    sample = [student['name'] for student in datagen.iter_students(min(size, LOOKUPS * 10), seed)]
+    names = rng.choices(sample, k=LOOKUPS)
+    results = []
+
+    cold = []
+    for _ in range(repeats_for(size)):
+        readme_index._indexes.pop(path, None)
+        if os.path.exists(path + readme_index.INDEX_SUFFIX):
+            os.remove(path + readme_index.INDEX_SUFFIX)
+        cold.append(timed(Pozdnyakov.find_user_in_file, path, names[0]))
+    results.append(summarize('find_user_in_file (построение индекса)', size, cold))
+
+    warm = [timed(Pozdnyakov.find_user_in_file, path, name) for name in names]
+    results.append(summarize('find_user_in_file', size, warm))
+    return results
+
+# ─────────────────────────────────────────────────────────────
+# ОТЧЁТ И СРАВНЕНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def print_result(result):
+    size = result['size'] if result['size'] is not None else '-'
+    print(f"{result['name']:<44} {size:>9} {result['calls']:>6} {result['median_ms']:>11.3f} "
+          f"{result['p95_ms']:>11.3f}", flush=True)
+
+def compare(results, baseline, threshold):
+    """Печатает изменения лучших времён; возвращает число замедлений сверх порога."""
+    previous = {(item['name'], item['size']): item for item in baseline['results']}
+    regressions = 0
+    print(f"\n{'сравнение с прежним прогоном':<44} {'размер':>9} {'было, мс':>11} "
+          f"{'стало, мс':>11} {'изменение':>10}")
+    for result in results:
+        old = previous.get((result['name'], result['size']))
+        if old is None or not old['min_ms']:
+            continue
+        ratio = result['min_ms'] / old['min_ms']
+        mark = ''
+        if ratio > 1 + threshold:
+            regressions += 1
+            mark = ' ❌'
+        size = result['size'] if result['size'] is not None else '-'
+        print(f"{result['name']:<44} {size:>9} {old['min_ms']:>11.3f} "
+              f"{result['min_ms']:>11.3f} {(ratio - 1) * 100:>+9.0f}%{mark}")
+    return regressions
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', default=None, metavar='FILE',
+                        help="прежний файл результатов для сравнения")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое замедление лучшего времени (0.25 = 25%%)")
+    parser.add_argument('--data-dir', default=None,
+                        help="каталог для данных (сохраняется между прогонами); "
+                             "по умолчанию - временный")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='students_bench_')
+    os.makedirs(data_dir, exist_ok=True)
+    started = time.perf_counter()
+    results = []
+    print(f"{'замер':<44} {'размер':>9} {'вызовы':>6} {'медиана, мс':>11} {'p95, мс':>11}")
+    try:
+        for result in bench_files(data_dir, args.seed):
+            print_result(result)
+            results.append(result)
+        for size in args.sizes:
+            for result in bench_database(data_dir, size, args.seed) + bench_readme(data_dir, size, args.seed):
+                print_result(result)
+                results.append(result)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        'suite': SUITE_VERSION,
+        'meta': {
+            'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'sizes': args.sizes,
+            'seconds': round(time.perf_counter() - started, 1),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"\n💾 Результаты: {args.output} ({report['meta']['seconds']} с)")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Замедлений больше {args.threshold:.0%}: {regressions}")
+            return 1
+        print("✅ Замедлений нет")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,595 @@
+"""
+💽 ДВОИЧНЫЙ СНИМОК БАЗЫ СТУДЕНТОВ
+===========================================================
+JSON базу нужно разобрать целиком и создать объект на каждого
+студента, прежде чем ответить даже на один поиск. Двоичный
+снимок (students.bin) открывается через mmap: поиск по ключу
+читает только нужную строку таблицы и нужные строки текста,
+остальная база в память не загружается.
+
+Формат файла (все числа - little-endian):
+
+    заголовок      HEADER: сигнатура, версия, число записей и строк,
+                   смещения разделов
+    таблица строк  (строк + 1) смещений uint32 и UTF-8 данные подряд;
+                   одинаковые значения (колледж, курс, статус)
+                   хранятся один раз
+    записи         строки фиксированной ширины ROW: ссылки на таблицу
+                   строк для текстовых полей и дата числом секунд
+    ключи          номера записей uint32, отсортированные по
+                   (ФИО, группа, ID) - поиск двоичным делением
+    полные записи  пары (номер записи, ссылка на строку) uint32 для
+                   записей, которые не укладываются в строку таблицы:
+                   с дополнительными полями, нестроковыми значениями
+                   или без части полей. Строка - запись целиком в JSON
+
+Новые студенты (в режиме журнала) дописываются JSON-строками
+в '<база>.log', как у JSON хранилища; при сжатии журнала
+снимок пересобирается. Конвертеры json_to_binary и
+binary_to_json переводят базу между форматами.
+"""
+
+import os
+import json
+import mmap
+import struct
+
+from file_lock import FileLock
+from name_index import NameIndex
+from student_record import Student, as_student
+from student_store import (JOURNAL_SUFFIX, CorruptDatabaseError, StorageBackend, StudentStore,
+                           file_stamp, journal_lines, read_journal, record_key)
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+MAGIC = b'STUSNAP1'
+FORMAT_VERSION = 2
+
+# Сигнатура, версия, записи, строки, смещения: таблицы строк, данных строк, записей,
+# ключей, полных записей; число полных записей
+HEADER = struct.Struct('<8sIIIQQQQQI')
+# Заголовок версии 1 (без полных записей) - такие снимки по-прежнему читаются
+HEADER_V1 = struct.Struct('<8sIIIQQQQ')
+
+# Колледж, курс, ФИО, группа, ID, дата (секунды), дата текстом, статус
+ROW = struct.Struct('<IIIIIqII')
+REF = struct.Struct('<I')
+SPAN = struct.Struct('<II')
+
+# Ссылка на отсутствующее значение (None)
+NO_REF = 0xFFFFFFFF
+# Дата, которой нет числом: None или нестандартная строка (тогда она в таблице строк)
+NO_DATE = -2 ** 63
+
+def _text(value):
+    # В таблице записей нестроковые значения хранятся строкой, как в TEXT
+    # колонках SQLite; исходная запись сохраняется отдельно (_full_record)
+    return value if value is None or isinstance(value, str) else str(value)
+
+def _full_record(student):
+    """
+    JSON всей записи, если строка таблицы её не восстановит (дополнительные
+    поля, нестроковые значения, отсутствующие поля), иначе None.
+    """
+    date = student.registration_date
+    if (student.extra or getattr(student, 'absent', None)
+            or not (date is None or isinstance(date, (int, str)))
+            or any(not (value is None or isinstance(value, str))
+                   for value in (student.college, student.course, student.name,
+                                 student.group, student.id, student.status))):
+        return json.dumps(student.to_dict(), ensure_ascii=False)
+    return None
+
+def _sort_key(name, group, id):
+    return (name or '', group or '', id or '')
+
+# ─────────────────────────────────────────────────────────────
+# ЗАПИСЬ СНИМКА
+# ─────────────────────────────────────────────────────────────
+
+def write_snapshot(path, records, fsync=False):
+    """💾 Атомарно записывает студентов в двоичный снимок. Возвращает число записей."""
+    records = [as_student(student) for student in records]
+    strings = {}
+
+    def ref(value):
+        if value is None:
+            return NO_REF
+        found = strings.get(value)
+        if found is None:
+            found = strings[value] = len(strings)
+        return found
+
+    rows = bytearray()
+    keys = []
+    full = bytearray()
+    for number, student in enumerate(records):
+        name, group, id = (_text(student.name), _text(student.group), _text(student.id))
+        date = student.registration_date
+        if isinstance(date, int):
+            date_text = NO_REF
+        else:
+            date, date_text = NO_DATE, ref(_text(date))
+        rows += ROW.pack(ref(_text(student.college)), ref(_text(student.course)),
+                         ref(name), ref(group), ref(id), date, date_text,
+                         ref(_text(student.status)))
+        keys.append((_sort_key(name, group, id), number))
+        text = _full_record(student)
+        if text is not None:
+            full += SPAN.pack(number, ref(text))
+    # Устойчивая сортировка: среди дубликатов ключа первой идёт
+    # более ранняя запись, как в хеш-индексе JSON хранилища
+    keys.sort(key=lambda item: item[0])
+
+    data = bytearray()
+    offsets = bytearray()
+    for value in strings:
+        offsets += REF.pack(len(data))
+        data += value.encode('utf-8', 'surrogatepass')
+    offsets += REF.pack(len(data))
+    if len(data) >= NO_REF:
+        raise ValueError("Таблица строк снимка больше 4 ГБ")
+
+    offsets_pos = HEADER.size
+    data_pos = offsets_pos + len(offsets)
+    rows_pos = data_pos + len(data)
+    keys_pos = rows_pos + len(rows)
+    full_pos = keys_pos + REF.size * len(keys)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(records), len(strings),
+                         offsets_pos, data_pos, rows_pos, keys_pos,
+                         full_pos, len(full) // SPAN.size)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(offsets)
+        f.write(data)
+        f.write(rows)
+        f.write(struct.pack(f'<{len(keys)}I', *(number for _, number in keys)))
+        f.write(full)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(records)
+
+# ─────────────────────────────────────────────────────────────
+# ЧТЕНИЕ СНИМКА
+# ─────────────────────────────────────────────────────────────
+
+class BinarySnapshot:
+    """
+    Снимок, открытый через mmap. Записи разбираются из отображённого
+    файла по одной (struct.unpack_from без копирования), в память
+    попадают только прочитанные строки. Отображение живёт, пока на
+    снимок есть ссылки, даже если файл уже заменён новым снимком.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            if os.name == 'nt':
+                # Отображённый файл на Windows нельзя заменить через os.replace,
+                # поэтому снимок читается в память целиком
+                self._map = file.read()
+            else:
+                try:
+                    self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError as e:
+                    # Пустой файл отобразить нельзя
+                    raise CorruptDatabaseError(f"файл базы данных {path} повреждён: {e}") from e
+        try:
+            self._read_header()
+        except CorruptDatabaseError:
+            self.close()
+            raise
+
+    def _read_header(self):
+        size = len(self._map)
+        if size < HEADER_V1.size:
+            raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: нет заголовка")
+        magic, version = struct.unpack_from('<8sI', self._map, 0)
+        if magic != MAGIC:
+            raise CorruptDatabaseError(f"файл {self.path} - не двоичный снимок базы")
+        if version == 1:
+            (_magic, _version, self.count, self.string_count, self._offsets_pos,
+             self._data_pos, self._rows_pos, self._keys_pos) = HEADER_V1.unpack_from(self._map, 0)
+            full_pos, full_count = size, 0
+        elif version == FORMAT_VERSION and size >= HEADER.size:
+            (_magic, _version, self.count, self.string_count, self._offsets_pos, self._data_pos,
+             self._rows_pos, self._keys_pos, full_pos, full_count) = HEADER.unpack_from(self._map, 0)
+        elif version == FORMAT_VERSION:
+            raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: нет заголовка")
+        else:
+            raise CorruptDatabaseError(f"неизвестная версия снимка {self.path}: {version}")
+        expected = (self._offsets_pos + REF.size * (self.string_count + 1) == self._data_pos
+                    and self._data_pos <= self._rows_pos
+                    and self._rows_pos + ROW.size * self.count == self._keys_pos
+                    and self._keys_pos + REF.size * self.count == full_pos
+                    and full_pos + SPAN.size * full_count == size)
+        if not expected:
+            raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: неверные размеры")
+        # Полных записей обычно нет или немного - держим их номера в словаре
+        self._full = dict(SPAN.iter_unpack(self._map[full_pos:size])) if full_count else {}
+
+    def __len__(self):
+        return self.count
+
+    def string(self, ref):
+        """Строка из таблицы строк по ссылке (None для NO_REF)."""
+        if ref == NO_REF:
+            return None
+        start, end = SPAN.unpack_from(self._map, self._offsets_pos + REF.size * ref)
+        return str(self._map[self._data_pos + start:self._data_pos + end], 'utf-8', 'surrogatepass')
+
+    def _student(self, number, row, string):
+        if self._full:
+            full = self._full.get(number)
+            if full is not None:
+                return Student.from_dict(json.loads(self.string(full)))
+        college, course, name, group, id, date, date_text, status = row
+        if date == NO_DATE:
+            date = string(date_text)
+        return Student(string(college), string(course), string(name), string(group),
+                       string(id), date, string(status))
+
+    def row(self, number):
+        """🧾 Запись с номером number (в порядке файла)."""
+        return self._student(number,
+                             ROW.unpack_from(self._map, self._rows_pos + ROW.size * number),
+                             self.string)
+
+    def _row_at(self, position):
+        """Номер и ссылки записи, стоящей на месте position в блоке ключей."""
+        number = REF.unpack_from(self._map, self._keys_pos + REF.size * position)[0]
+        return number, ROW.unpack_from(self._map, self._rows_pos + ROW.size * number)
+
+    def find(self, name, group, id):
+        """🔍 Двоичный поиск по блоку ключей: читаются O(log n) ключей и одна запись."""
+        string = self.string
+        target = _sort_key(name, group, id)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            row = self._row_at(middle)[1]
+            # Группа и ID разбираются, только когда ФИО совпало
+            current = string(row[2]) or ''
+            if current < target[0] or (current == target[0] and
+                                       _sort_key(current, string(row[3]), string(row[4])) < target):
+                low = middle + 1
+            else:
+                high = middle
+        # None и пустая строка сортируются одинаково - сверяем ключ точно
+        wanted = (name, group, id)
+        while low < self.count:
+            number, row = self._row_at(low)
+            key = (string(row[2]), string(row[3]), string(row[4]))
+            if _sort_key(*key) != target:
+                break
+            if key == wanted:
+                return self._student(number, row, string)
+            low += 1
+        return None
+
+    def rows_buffer(self):
+        """
+        Таблица записей как memoryview (строки ROW подряд) для разбора
+        столбцами; view нужно освободить (release) до close().
+        """
+        return memoryview(self._map)[self._rows_pos:self._keys_pos]
+
+    def records(self):
+        """📋 Все записи по порядку (строки таблицы разбираются по одному разу)."""
+        cache = {NO_REF: None}
+
+        def string(ref):
+            value = cache.get(ref, cache)
+            if value is cache:
+                value = cache[ref] = self.string(ref)
+            return value
+
+        with memoryview(self._map) as view:
+            rows = view[self._rows_pos:self._keys_pos]
+            try:
+                return [self._student(number, row, string)
+                        for number, row in enumerate(ROW.iter_unpack(rows))]
+            finally:
+                rows.release()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = None
+
+# ─────────────────────────────────────────────────────────────
+# ХРАНИЛИЩЕ
+# ─────────────────────────────────────────────────────────────
+
+class BinaryStore(StorageBackend):
+    """
+    Хранилище студентов в двоичном снимке. Поиск по ключу не загружает
+    базу; полный список записей (выборки, статистика) разбирается
+    при первом обращении и дальше пополняется вместе с базой.
+
+    Поиск (lookup) идёт без блокировки, прямо из цикла событий сервера:
+    снимок и словарь новых записей читаются одной парой _view, которую
+    запись подменяет целиком, когда новый снимок уже открыт. Старый
+    снимок не закрывается - он освободится, когда его перестанут читать.
+    """
+
+    backend_name = 'binary'
+
+    def __init__(self, path, journal=False):
+        self.path = path
+        self.journal = journal
+        self.journal_path = path + JOURNAL_SUFFIX
+        self._snapshot = None
+        self._stamp = None
+        self._loaded = False
+        self._records = None
+        self._names = None
+        self._added = []
+        self._added_index = {}
+        self._view = (None, self._added_index)
+        self._stats = None
+        self._log_file = None
+        self._log_offset = 0
+        self._log_stamp = None
+        self._log_torn = False
+        self._lock = FileLock(path)
+
+    # ── Загрузка ─────────────────────────────────────────────
+
+    def _replay_journal(self):
+        """Дочитывает новые записи журнала (как StudentStore)."""
+        tail = read_journal(self.journal_path, self._log_offset)
+        if tail is None:
+            self._log_offset = 0
+            self._log_stamp = None
+            self._log_torn = False
+            return
+        students, end, self._log_torn = tail
+        for student in students:
+            key = record_key(student)
+            if key in self._added_index or self._find_in_snapshot(*key) is not None:
+                continue
+            self._remember(student)
+        self._log_offset += end
+        self._log_stamp = file_stamp(self.journal_path)
+
+    def reload(self):
+        """🔄 Заново отображает снимок и перечитывает журнал."""
+        with self._lock.shared():
+            stamp = file_stamp(self.path)
+            # Пустой файл - пустая база, как у JSON хранилища
+            if stamp is not None and stamp[1] > 0:
+                self._snapshot = BinarySnapshot(self.path)
+            else:
+                self._snapshot = None
+            self._stamp = stamp
+            self._records = None
+            self._names = None
+            self._added = []
+            self._added_index = {}
+            self._stats = None
+            if self.journal:
+                self._log_offset = 0
+                self._replay_journal()
+            # Поиски переходят на новый снимок только теперь, вместе с журналом
+            self._view = (self._snapshot, self._added_index)
+            self._loaded = True
+
+    def _changed(self):
+        if not self._loaded or file_stamp(self.path) != self._stamp:
+            return True
+        return self.journal and file_stamp(self.journal_path) != self._log_stamp
+
+    def refresh(self):
+        """🔄 Перечитывает базу, только если файлы изменились."""
+        if not self._changed():
+            return
+        # Под блокировкой, как в StudentStore.refresh: add_many другого
+        # потока держит её, пока пишет журнал и сдвигает _log_offset
+        with self._lock.shared():
+            if not self._loaded or file_stamp(self.path) != self._stamp:
+                self.reload()
+            elif self.journal and file_stamp(self.journal_path) != self._log_stamp:
+                log_stamp = file_stamp(self.journal_path)
+                if log_stamp is None or log_stamp[1] < self._log_offset:
+                    self.reload()
+                else:
+                    self._replay_journal()
+
+    def _remember(self, student):
+        """Запоминает запись, добавленную после снимка."""
+        self._added.append(student)
+        self._added_index[record_key(student)] = student
+        if self._records is not None:
+            self._records.append(student)
+        if self._names is not None:
+            self._names.add(student.name, student)
+        if self._stats is not None:
+            self._stats.add(student)
+
+    # ── Чтение ───────────────────────────────────────────────
+
+    def _find_in_snapshot(self, name, group, id):
+        if self._snapshot is None:
+            return None
+        return self._snapshot.find(name, group, id)
+
+    def find(self, name, group, id):
+        """🔍 Ищет студента двоичным поиском в снимке, затем среди новых записей."""
+        self.refresh()
+        return self.lookup(name, group, id)
+
+    def lookup(self, name, group, id):
+        if not self._loaded:
+            self.refresh()
+        snapshot, added_index = self._view
+        student = snapshot.find(name, group, id) if snapshot is not None else None
+        if student is None:
+            student = added_index.get((name, group, id))
+        return student
+
+    def all(self):
+        """📋 Все студенты (снимок разбирается целиком один раз)."""
+        # Под блокировкой: запись из другого потока не подменит снимок посреди разбора
+        with self._lock.shared():
+            self.refresh()
+            if self._records is None:
+                records = self._snapshot.records() if self._snapshot is not None else []
+                records.extend(self._added)
+                self._records = records
+            return self._records
+
+    def _name_index(self):
+        """Индекс ФИО строится при первом поиске по ФИО и пополняется вместе с базой."""
+        with self._lock.shared():
+            records = self.all()
+            if self._names is None:
+                self._names = NameIndex((student.name, student) for student in records)
+            return self._names
+
+    def mapped_snapshot(self):
+        """
+        Открытый снимок (BinarySnapshot), если в нём все записи базы,
+        или None, если есть новые записи из журнала (или базы нет).
+        """
+        self.refresh()
+        snapshot, added_index = self._view
+        return None if added_index else snapshot
+
+    def __len__(self):
+        self.refresh()
+        snapshot, added_index = self._view
+        return (len(snapshot) if snapshot is not None else 0) + len(added_index)
+
+    def stats(self):
+        with self._lock.shared():
+            self.refresh()
+            if self._stats is None:
+                self._stats = super().stats()
+            return self._stats
+
+    # ── Запись ───────────────────────────────────────────────
+
+    def _rewrite(self, records):
+        """
+        Пересобирает снимок и очищает журнал. Пока новый снимок не открыт,
+        поиски идут по старому: его отображение остаётся целым и после замены файла.
+        """
+        write_snapshot(self.path, records, fsync=self.journal)
+        self._close_journal()
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'wb'):
+                pass
+        self.reload()
+
+    def save(self, records):
+        """💾 Полностью перезаписывает базу данных."""
+        with self._lock.exclusive():
+            self._rewrite(records)
+
+    def replace_many(self, replacements):
+        """🔁 Замена по ключу под исключительной блокировкой (снимок пересобирается)."""
+        with self._lock.exclusive():
+            return super().replace_many(replacements)
+
+    def add(self, student):
+        return bool(self.add_many([student]))
+
+    def add_many(self, students):
+        """
+        ➕ Добавляет студентов без дубликатов. В режиме журнала - одной
+        записью в журнал, иначе пересобирая снимок.
+        """
+        students = [as_student(student) for student in students]
+        with self._lock.exclusive():
+            self.refresh()
+            added = []
+            seen = set()
+            for student in students:
+                key = record_key(student)
+                if key in seen or self.lookup(*key) is not None:
+                    continue
+                seen.add(key)
+                added.append(student)
+            if not added:
+                return added
+            if self.journal:
+                self._append_journal(added)
+                for student in added:
+                    self._remember(student)
+            else:
+                self._rewrite(self.all() + added)
+        return added
+
+    def _append_journal(self, students):
+        if self._log_file is None:
+            self._log_file = open(self.journal_path, 'ab')
+        if self._log_torn:
+            self._log_file.write(b'\n')
+            self._log_offset = self._log_file.tell()
+            self._log_torn = False
+        data = journal_lines(students)
+        self._log_file.write(data)
+        self._log_file.flush()
+        os.fsync(self._log_file.fileno())
+        self._log_offset += len(data)
+        self._log_stamp = file_stamp(self.journal_path)
+
+    def _close_journal(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def compact(self):
+        """🗜️ Переносит записи журнала в новый снимок; возвращает их число."""
+        if not self.journal:
+            return 0
+        with self._lock.exclusive():
+            self.refresh()
+            moved = len(self._added)
+            if not self._log_offset:
+                return 0
+            self._rewrite(self.all())
+        return moved
+
+    def close(self):
+        self._close_journal()
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        self._view = (None, {})
+        self._loaded = False
+
+# ─────────────────────────────────────────────────────────────
+# КОНВЕРТЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+def json_to_binary(json_path, binary_path):
+    """🔁 JSON база -> двоичный снимок. Возвращает число записей."""
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"Файл базы данных не найден: {json_path}")
+    source = StudentStore(json_path)
+    try:
+        return write_snapshot(binary_path, source.all())
+    finally:
+        source.close()
+
+def binary_to_json(binary_path, json_path):
+    """🔁 Двоичный снимок -> JSON база. Возвращает число записей."""
+    snapshot = BinarySnapshot(binary_path)
+    try:
+        records = snapshot.records()
+    finally:
+        snapshot.close()
+    target = StudentStore(json_path)
+    try:
+        target.save(records)
+    finally:
+        target.close()
+    return len(records)
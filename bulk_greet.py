@@ -0,0 +1,140 @@
+"""
+👋 ПАКЕТНЫЕ ПРИВЕТСТВИЯ
+===========================================================
+Приветствия для целых потоков имён (Tarakanov.py greet): имена
+читаются блоками из файла, stdin или базы студентов, шаблон
+проверяется один раз до начала работы, а готовые строки пишутся
+крупными кусками в один буферизованный поток - без print
+на каждую строку.
+"""
+
+import io
+import os
+import sys
+import errno
+import time
+import string
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Сколько символов имён читается за раз
+READ_CHUNK = 1024 * 1024
+
+# Сколько имён из базы обрабатывается одним блоком
+DATABASE_BLOCK = 65536
+
+# Размер буфера вывода
+OUTPUT_BUFFER = 1024 * 1024
+
+# Имя для проверки шаблона
+SAMPLE_NAME = 'Иван Иванов'
+
+# ─────────────────────────────────────────────────────────────
+# ШАБЛОН
+# ─────────────────────────────────────────────────────────────
+
+def compile_greeting(template):
+    """
+    ✅ Проверяет шаблон приветствия и возвращает функцию имя -> строка с '\\n'.
+    В шаблоне допустимы только поля для имени: {} или {0} (с форматом,
+    например {:>20}); остальное - ValueError до начала вывода.
+    """
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(template)
+                  if field is not None]
+    except ValueError as e:
+        raise ValueError(f"неверный шаблон приветствия {template!r}: {e}") from e
+    for field in fields:
+        if field not in ('', '0'):
+            raise ValueError(f"неверный шаблон приветствия {template!r}: "
+                             f"поле {{{field}}} - подставляется только имя ({{}} или {{0}})")
+    if not fields:
+        raise ValueError(f"в шаблоне приветствия {template!r} нет места для имени ({{}})")
+    line_format = (template + '\n').format
+    try:
+        line_format(SAMPLE_NAME)
+    except (IndexError, KeyError, ValueError) as e:
+        raise ValueError(f"неверный шаблон приветствия {template!r}: {e}") from e
+    return line_format
+
+# ─────────────────────────────────────────────────────────────
+# ИСТОЧНИКИ ИМЁН
+# ─────────────────────────────────────────────────────────────
+
+def iter_name_blocks(file, chunk_size=READ_CHUNK):
+    """📜 Блоки имён из текстового файла: по имени на строку, пустые строки пропускаются."""
+    rest = ''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        lines = (rest + chunk).split('\n')
+        # Последняя строка блока может продолжиться в следующем
+        rest = lines.pop()
+        yield [name for name in map(str.strip, lines) if name]
+    if rest.strip():
+        yield [rest.strip()]
+
+def database_name_blocks(path, block_size=DATABASE_BLOCK):
+    """
+    🗄️ Блоки ФИО студентов из базы данных (любое хранилище student_store).
+    База открывается и читается сразу, а не при первом блоке: нет файла -
+    FileNotFoundError, повреждённая база - CorruptDatabaseError до начала вывода.
+    """
+    from student_store import open_store
+
+    # Хранилище создало бы пустую базу (и файл блокировки) на месте опечатки
+    if not os.path.exists(path):
+        raise FileNotFoundError(errno.ENOENT, "база данных не найдена", path)
+    store = open_store(path)
+    try:
+        names = [student.name for student in store.all() if student.name]
+    finally:
+        store.close()
+    return (names[start:start + block_size] for start in range(0, len(names), block_size))
+
+# ─────────────────────────────────────────────────────────────
+# ВЫВОД
+# ─────────────────────────────────────────────────────────────
+
+def write_greetings(blocks, line_format, output, repeat=1):
+    """
+    ▶️ Пишет приветствия для всех имён из blocks в двоичный поток output:
+    каждое приветствие repeat раз подряд. Возвращает сводку.
+    """
+    started = time.perf_counter()
+    names = 0
+    for block in blocks:
+        if not block:
+            continue
+        names += len(block)
+        if repeat == 1:
+            text = ''.join(map(line_format, block))
+        else:
+            text = ''.join([line * repeat for line in map(line_format, block)])
+        output.write(text.encode('utf-8'))
+    output.flush()
+    seconds = time.perf_counter() - started
+    lines = names * repeat
+    return {
+        'names': names,
+        'lines': lines,
+        'seconds': seconds,
+        'per_second': lines / seconds if seconds else 0.0,
+    }
+
+def open_output(path):
+    """Двоичный поток вывода с большим буфером: файл или stdout ('-')."""
+    if path == '-':
+        sys.stdout.flush()
+        return io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'wb', closefd=False),
+                                 buffer_size=OUTPUT_BUFFER)
+    return open(path, 'wb', buffering=OUTPUT_BUFFER)
+
+def open_names(path):
+    """Текстовый поток имён: файл или stdin ('-')."""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
@@ -0,0 +1,216 @@
+"""
+📦 ПАКЕТНАЯ ЗАГРУЗКА СТУДЕНТОВ
+===========================================================
+Неинтерактивный режим для больших поступлений файлов:
+все файлы каталога (или шаблона glob) разбираются в пуле
+процессов, новые студенты сверяются с базой и добавляются
+одной пакетной записью. Файлы, которые уже разбирались и с тех
+пор не менялись, берутся из кэша разбора (parse_cache) без чтения.
+"""
+
+import os
+import glob
+import time
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import Tarakan
+from field_extractor import FIELDS
+from parse_cache import content_digest, parse_bytes, read_bytes
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Какие файлы каталога считаются файлами студентов (без учёта регистра)
+STUDENT_FILE_PATTERNS = ('*.md', '*.txt')
+
+# Суффиксы служебных файлов рядом с базой, манифестом и кэшем:
+# students_database.json.log, parse_cache.db-wal, students.shards/...
+SIDECAR_SEPARATORS = ('.', '-', os.sep)
+
+# ─────────────────────────────────────────────────────────────
+# ПОИСК ФАЙЛОВ
+# ─────────────────────────────────────────────────────────────
+
+def excluded_paths(*paths):
+    """Абсолютные пути базы, манифеста и кэша, которые не разбираются как файлы студентов."""
+    return tuple(os.path.abspath(path) for path in paths if path)
+
+def is_student_file(path, patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    ✅ Подходит ли файл для разбора: имя совпадает с одним из шаблонов
+    patterns (None - любое имя), и это не база данных из excluded
+    и не её служебный файл (журнал, статистика, блокировка, WAL SQLite).
+    """
+    if patterns is not None:
+        name = os.path.basename(path).lower()
+        if not any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in patterns):
+            return False
+    if excluded:
+        path = os.path.abspath(path)
+        for base in excluded:
+            if path == base or (path.startswith(base)
+                                and path[len(base)] in SIDECAR_SEPARATORS):
+                return False
+    return True
+
+def collect_files(source, patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    📁 Возвращает отсортированный список файлов студентов каталога или шаблона glob.
+    В каталоге берутся файлы с именами по patterns; шаблон glob сам задаёт
+    имена. Файлы базы данных (excluded) не берутся никогда.
+    """
+    if os.path.isdir(source):
+        files = []
+        for root, _dirs, names in os.walk(source):
+            for file_name in names:
+                path = os.path.join(root, file_name)
+                if is_student_file(path, patterns, excluded):
+                    files.append(path)
+    else:
+        files = [path for path in glob.glob(source, recursive=True)
+                 if os.path.isfile(path) and is_student_file(path, None, excluded)]
+    files.sort()
+    return files
+
+# ─────────────────────────────────────────────────────────────
+# РАЗБОР ФАЙЛОВ
+# ─────────────────────────────────────────────────────────────
+
+def parse_student_file(file_path):
+    """
+    Разбирает один файл без вывода на экран (выполняется в дочернем процессе).
+    Возвращает (путь, статус, данные, запись для кэша): статус 'parsed', 'skipped'
+    или 'failed'; запись - (stat, хэш, кодировка, поля) или None при ошибке.
+    """
+    try:
+        stat = os.stat(file_path)
+        data = read_bytes(file_path)
+        _content, encoding, found = parse_bytes(data)
+    except (OSError, UnicodeDecodeError) as e:
+        return file_path, 'failed', str(e), None
+    fields = tuple(found.get(field) for field in FIELDS)
+    return file_path, field_status(fields), fields, (stat, content_digest(data), encoding, found)
+
+def field_status(fields):
+    return 'parsed' if all(fields) else 'skipped'
+
+def parse_cached(files, cache):
+    """
+    Отделяет файлы, разбор которых есть в кэше (сверка по размеру и mtime).
+    Возвращает (результаты как у parse_student_file, файлы для разбора).
+    """
+    if cache is None:
+        return [], files
+    cached, rest = [], []
+    for file_path in files:
+        try:
+            parsed = cache.lookup(file_path)
+        except OSError:
+            parsed = None
+        if parsed is None:
+            rest.append(file_path)
+            continue
+        fields = tuple(parsed.fields.get(field) for field in FIELDS)
+        cached.append((file_path, field_status(fields), fields, None))
+    return cached, rest
+
+def make_student_record(college, course, name, group, id, registration_date):
+    """🧾 Создаёт запись студента в формате базы данных."""
+    return {
+        'college': college,
+        'course': course,
+        'name': name,
+        'group': group,
+        'id': id,
+        'registration_date': registration_date,
+        'status': 'новый студент'
+    }
+
+# ─────────────────────────────────────────────────────────────
+# ПАКЕТНАЯ ЗАГРУЗКА
+# ─────────────────────────────────────────────────────────────
+
+def bulk_ingest(source, store=None, workers=None, chunksize=64, cache=None,
+                patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    📦 Загружает всех студентов из файлов source в базу данных.
+    cache - кэш разбора (ParseCache) или None, чтобы разбирать все файлы;
+    patterns и excluded - какие файлы брать (см. collect_files).
+    Возвращает словарь со сводкой обработки.
+    """
+    started = time.perf_counter()
+    store = store if store is not None else Tarakan.get_store()
+    files = collect_files(source, patterns, excluded)
+    summary = {
+        'files': len(files),
+        'cached': 0,
+        'parsed': 0,
+        'skipped': 0,
+        'duplicate': 0,
+        'failed': 0,
+        'added': 0,
+        'errors': [],
+    }
+
+    registration_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    new_students = []
+    seen = set()
+
+    cached, files_to_parse = parse_cached(files, cache)
+    summary['cached'] = len(cached)
+
+    def handle(results):
+        for file_path, status, data, cache_entry in results:
+            if cache_entry is not None and cache is not None:
+                cache.store(file_path, *cache_entry)
+            if status == 'failed':
+                summary['failed'] += 1
+                summary['errors'].append((file_path, data))
+                continue
+            if status == 'skipped':
+                summary['skipped'] += 1
+                continue
+            summary['parsed'] += 1
+            college, course, name, group, id = data
+            key = (name, group, id)
+            if key in seen or store.contains(name, group, id):
+                summary['duplicate'] += 1
+                continue
+            seen.add(key)
+            new_students.append(make_student_record(
+                college, course, name, group, id, registration_date))
+
+    handle(cached)
+    if files_to_parse:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            handle(pool.map(parse_student_file, files_to_parse, chunksize=chunksize))
+
+    # Все новые студенты попадают в базу одной записью
+    added = store.add_many(new_students)
+    summary['added'] = len(added)
+    summary['duplicate'] += len(new_students) - len(added)
+
+    elapsed = time.perf_counter() - started
+    summary['seconds'] = elapsed
+    summary['files_per_second'] = len(files) / elapsed if elapsed > 0 else 0.0
+    return summary
+
+def print_ingest_summary(summary):
+    """📊 Выводит сводку пакетной загрузки."""
+    print("\n📦 Итоги пакетной загрузки:")
+    print("═" * 50)
+    print(f"📁 Файлов найдено: {summary['files']}")
+    print(f"🗃️  Из кэша разбора: {summary['cached']}")
+    print(f"✅ Разобрано: {summary['parsed']}")
+    print(f"⏭️  Пропущено (не все данные): {summary['skipped']}")
+    print(f"♻️  Дубликаты: {summary['duplicate']}")
+    print(f"❌ Ошибки чтения: {summary['failed']}")
+    print(f"👨‍🎓 Добавлено в базу: {summary['added']}")
+    print(f"⏱️  Время: {summary['seconds']:.2f} с "
+          f"({summary['files_per_second']:.1f} файлов/с)")
+    for file_path, error in summary['errors'][:10]:
+        print(f"   ❌ {file_path}: {error}")
+    print("═" * 50)
@@ -0,0 +1,90 @@
+"""
+📊 СТАТИСТИКА БАЗЫ ДАННЫХ
+===========================================================
+Сводка по базе студентов, которая обновляется при каждом
+добавлении: общее число студентов, счётчики по колледжам,
+курсам и группам и кольцевой буфер последних регистраций.
+Показ статистики не требует чтения всей базы.
+"""
+
+from collections import deque
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Сколько последних регистраций хранится в кольцевом буфере
+RECENT_LIMIT = 10
+
+# Поля, по которым ведутся счётчики
+COUNTED_FIELDS = ('college', 'course', 'group')
+
+# Поля записи, которые попадают в список последних регистраций
+RECENT_FIELDS = ('name', 'group', 'registration_date')
+
+# ─────────────────────────────────────────────────────────────
+# СТАТИСТИКА
+# ─────────────────────────────────────────────────────────────
+
+class StudentStats:
+    """Инкрементально обновляемая статистика базы студентов."""
+
+    def __init__(self, recent_limit=RECENT_LIMIT):
+        self.total = 0
+        self.counts = {field: {} for field in COUNTED_FIELDS}
+        self.recent = deque(maxlen=recent_limit)
+
+    def add(self, student):
+        """➕ Учитывает нового студента за O(1)."""
+        self.total += 1
+        for field, counter in self.counts.items():
+            value = student.get(field) or ''
+            counter[value] = counter.get(value, 0) + 1
+        self.recent.append({field: student.get(field) for field in RECENT_FIELDS})
+
+    @classmethod
+    def from_records(cls, records, recent_limit=RECENT_LIMIT):
+        """🔄 Строит статистику полным проходом по записям."""
+        stats = cls(recent_limit)
+        for student in records:
+            stats.add(student)
+        return stats
+
+    @classmethod
+    def merge(cls, parts, recent_limit=RECENT_LIMIT):
+        """🧩 Складывает статистику частей базы (например, шардов)."""
+        stats = cls(recent_limit)
+        recent = []
+        for part in parts:
+            stats.total += part.total
+            for field, counter in part.counts.items():
+                total_counter = stats.counts[field]
+                for value, count in counter.items():
+                    total_counter[value] = total_counter.get(value, 0) + count
+            recent.extend(part.recent)
+        # Последние регистрации всей базы - самые поздние по дате среди частей
+        recent.sort(key=lambda item: item.get('registration_date') or '')
+        stats.recent.extend(recent)
+        return stats
+
+    def top(self, field, limit=5):
+        """🏆 Самые частые значения поля: список (значение, количество)."""
+        counter = self.counts[field]
+        return sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'counts': self.counts,
+            'recent': list(self.recent),
+            'recent_limit': self.recent.maxlen,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data.get('recent_limit', RECENT_LIMIT))
+        stats.total = data['total']
+        for field in COUNTED_FIELDS:
+            stats.counts[field] = dict(data['counts'].get(field, {}))
+        stats.recent.extend(data['recent'])
+        return stats
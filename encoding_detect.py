@@ -0,0 +1,157 @@
+"""
+🔤 ОПРЕДЕЛЕНИЕ КОДИРОВКИ
+===========================================================
+Файл читается в байты один раз, кодировка определяется по
+ограниченному началу файла: метка BOM, проверка UTF-8 и оценка
+частот русских букв для однобайтовых кодировок (cp1251, koi8-r).
+После этого весь файл декодируется ровно один раз.
+"""
+
+import codecs
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Сколько байт из начала файла используется для определения кодировки
+SAMPLE_SIZE = 64 * 1024
+
+# Метки порядка байтов (UTF-32 проверяется раньше UTF-16,
+# так как BOM UTF-32 LE начинается с BOM UTF-16 LE)
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+CYRILLIC_CODECS = ('cp1251', 'koi8-r')
+FALLBACK_CODEC = 'iso-8859-1'
+
+# Частоты букв русского языка, % (ё считается вместе с е)
+RUSSIAN_FREQUENCIES = {
+    'о': 10.97, 'е': 8.45, 'а': 8.01, 'и': 7.35, 'н': 6.70, 'т': 6.26,
+    'с': 5.47, 'р': 4.73, 'в': 4.54, 'л': 4.40, 'к': 3.49, 'м': 3.21,
+    'д': 2.98, 'п': 2.81, 'у': 2.62, 'я': 2.01, 'ы': 1.90, 'ь': 1.74,
+    'г': 1.70, 'з': 1.65, 'б': 1.59, 'ч': 1.44, 'й': 1.21, 'х': 0.97,
+    'ж': 0.94, 'ш': 0.73, 'ю': 0.64, 'ц': 0.48, 'щ': 0.36, 'э': 0.32,
+    'ф': 0.26, 'ъ': 0.04, 'ё': 0.04,
+}
+
+# Заглавные буквы встречаются реже строчных: если текст "выглядит"
+# заглавным в одной кодировке и строчным в другой, верна вторая
+UPPERCASE_WEIGHT = 0.25
+
+# Минимальная средняя оценка байта, при которой текст считается русским
+MIN_CYRILLIC_SCORE = 2.0
+
+# ─────────────────────────────────────────────────────────────
+# ОЦЕНКА ОДНОБАЙТОВЫХ КОДИРОВОК
+# ─────────────────────────────────────────────────────────────
+
+def _build_weights(codec):
+    """Вес каждого байта 0x80-0xFF как русской буквы в кодировке codec."""
+    weights = {}
+    for byte in range(0x80, 0x100):
+        char = bytes([byte]).decode(codec, errors='ignore')
+        if not char:
+            continue
+        lower = char.lower()
+        weight = RUSSIAN_FREQUENCIES.get(lower, 0.0)
+        if char != lower:
+            weight *= UPPERCASE_WEIGHT
+        if weight:
+            weights[byte] = weight
+    return weights
+
+_WEIGHTS = {codec: _build_weights(codec) for codec in CYRILLIC_CODECS}
+
+# Таблица для удаления ASCII-байтов: оценка строится только по старшим
+_ASCII_BYTES = bytes(range(0x80))
+
+def score_cyrillic(sample):
+    """Возвращает {кодировка: средний вес старшего байта} для sample."""
+    high = sample.translate(None, _ASCII_BYTES)
+    if not high:
+        return {}
+    counts = {byte: high.count(byte) for byte in set(high)}
+    scores = {}
+    for codec, weights in _WEIGHTS.items():
+        total = sum(weights.get(byte, 0.0) * count for byte, count in counts.items())
+        scores[codec] = total / len(high)
+    return scores
+
+def guess_single_byte(sample):
+    """Выбирает однобайтовую кодировку по частотам русских букв."""
+    scores = score_cyrillic(sample)
+    if not scores:
+        return FALLBACK_CODEC
+    codec = max(scores, key=scores.get)
+    if scores[codec] < MIN_CYRILLIC_SCORE:
+        return FALLBACK_CODEC
+    return codec
+
+# ─────────────────────────────────────────────────────────────
+# ОПРЕДЕЛЕНИЕ КОДИРОВКИ
+# ─────────────────────────────────────────────────────────────
+
+def _is_utf8_prefix(sample):
+    """Проверяет, что sample - корректное начало UTF-8 текста."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        # final=False: символ, обрезанный границей выборки, не ошибка
+        decoder.decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def detect_encoding(data, sample_size=SAMPLE_SIZE):
+    """🔤 Определяет кодировку байтов по их началу (без декодирования всего файла)."""
+    for bom, codec in BOMS:
+        if data.startswith(bom):
+            return codec
+    sample = data[:sample_size]
+    if _is_utf8_prefix(sample):
+        return 'utf-8'
+    return guess_single_byte(sample)
+
+def decode_bytes(data, sample_size=SAMPLE_SIZE):
+    """
+    🔤 Декодирует байты, определив кодировку. Возвращает (текст, кодировка).
+    Переводы строк приводятся к '\\n', как при чтении файла в текстовом режиме.
+    """
+    encoding = detect_encoding(data, sample_size)
+    try:
+        text = data.decode(encoding)
+    except UnicodeDecodeError as e:
+        # Начало файла оказалось UTF-8 (например, только ASCII), а дальше
+        # встретились байты другой кодировки, или в однобайтовом тексте
+        # есть байт, не определённый в выбранной кодировке
+        if encoding in CYRILLIC_CODECS:
+            candidates = [codec for codec in CYRILLIC_CODECS if codec != encoding]
+        else:
+            candidates = [guess_single_byte(data[e.start:e.start + sample_size])]
+        candidates.append(FALLBACK_CODEC)
+        for encoding in candidates:
+            try:
+                text = data.decode(encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+    return _normalize_newlines(text), encoding
+
+def decode_as(data, encoding):
+    """🔤 Декодирует байты в уже известной кодировке (например, из кэша разбора)."""
+    return _normalize_newlines(data.decode(encoding))
+
+def _normalize_newlines(text):
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def read_text(file_path, sample_size=SAMPLE_SIZE):
+    """📖 Читает файл одним вызовом read и декодирует его. Возвращает (текст, кодировка)."""
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    return decode_bytes(data, sample_size)
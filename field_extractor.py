@@ -0,0 +1,133 @@
+"""
+🔎 ИЗВЛЕЧЕНИЕ ПОЛЕЙ СТУДЕНТА
+===========================================================
+Общий модуль разбора текстовых файлов студентов для
+Tarakan.py и Pozdnyakov.py. Все метки полей собраны в одно
+заранее скомпилированное регулярное выражение, поэтому текст
+просматривается один раз, а не по разу на каждый шаблон.
+"""
+
+import re
+
+# ─────────────────────────────────────────────────────────────
+# ШАБЛОНЫ ПОЛЕЙ
+# ─────────────────────────────────────────────────────────────
+
+FIELDS = ('college', 'course', 'name', 'group', 'id')
+
+# Метки полей в порядке приоритета: если в тексте есть несколько
+# меток одного поля, побеждает стоящая раньше в списке.
+FIELD_LABELS = (
+    ('college', ('Колледж', 'College', 'Учебное заведение')),
+    ('course', ('Курс', 'Course')),
+    ('name', ('ФИ', 'ФИО', 'Name', 'Имя')),
+    ('group', ('Команда', 'Группа', 'Group', 'Team')),
+    ('id', ('ID', 'ИД', 'Номер', '№')),
+)
+
+# Значение поля: разделители после метки и остаток строки
+VALUE_PATTERN = r'[:\s]*([^\n]+)'
+
+# ─────────────────────────────────────────────────────────────
+# ИЗВЛЕКАТЕЛЬ
+# ─────────────────────────────────────────────────────────────
+
+class FieldExtractor:
+    """
+    Однопроходный извлекатель полей.
+    Для каждого поля выбирается метка с наивысшим приоритетом,
+    а среди её вхождений - самое первое в тексте (как при
+    последовательных вызовах re.search по каждому шаблону).
+    """
+
+    def __init__(self, field_labels=FIELD_LABELS):
+        self.fields = tuple(field for field, _labels in field_labels)
+        self._labels_map = {}
+        for field, labels in field_labels:
+            for rank, label in enumerate(labels):
+                self._labels_map.setdefault(label.lower(), (field, rank))
+        # Длинные метки идут первыми, чтобы 'ФИО' не распознавалась
+        # как 'ФИ' со значением "О: Иванов". Шаблон без именованных
+        # групп: так движок re быстро пропускает текст без меток.
+        alternation = '|'.join(re.escape(label) for label in
+                               sorted(self._labels_map, key=len, reverse=True))
+        self._labels = re.compile(alternation)
+        self._labels_ignorecase = re.compile(alternation, re.IGNORECASE)
+        self._value = re.compile(VALUE_PATTERN)
+
+    def _iter_labels(self, content):
+        """Перебирает (поле, приоритет, конец метки) в порядке появления."""
+        lowered = content.lower()
+        if len(lowered) == len(content):
+            # Поиск по строке в нижнем регистре заметно быстрее IGNORECASE
+            labels_map = self._labels_map
+            for match in self._labels.finditer(lowered):
+                field, rank = labels_map[match.group()]
+                yield field, rank, match.end()
+        else:
+            # Редкий случай: смена регистра изменила длину строки
+            for match in self._labels_ignorecase.finditer(content):
+                found = self._labels_map.get(match.group().lower())
+                if found is not None:
+                    yield found[0], found[1], match.end()
+
+    def extract(self, content):
+        """Возвращает словарь {поле: значение} для найденных полей."""
+        best = {}
+        values = {}
+        complete = 0
+        total = len(self.fields)
+        value_match = self._value.match
+        for field, rank, end in self._iter_labels(content):
+            if field in best and best[field] <= rank:
+                continue
+            value = value_match(content, end)
+            if value is None:
+                continue
+            best[field] = rank
+            values[field] = value.group(1).strip()
+            if rank == 0:
+                complete += 1
+                # Все поля найдены по главным меткам - дальше искать нечего
+                if complete == total:
+                    break
+        return values
+
+    def line_field(self, line):
+        """Возвращает поле, меткой которого начинается строка, или None."""
+        match = self._labels_ignorecase.match(line.lstrip())
+        if match is None:
+            return None
+        found = self._labels_map.get(match.group().lower())
+        return found[0] if found is not None else None
+
+    def extract_tuple(self, content):
+        """Возвращает кортеж значений в порядке полей (None для ненайденных)."""
+        values = self.extract(content)
+        return tuple(values.get(field) for field in self.fields)
+
+    def find_all(self, content, field):
+        """Возвращает все значения поля в тексте (по всем его меткам)."""
+        found = []
+        for label_field, _rank, end in self._iter_labels(content):
+            if label_field != field:
+                continue
+            value = self._value.match(content, end)
+            if value is not None:
+                found.append(value.group(1))
+        return found
+
+# Общий экземпляр: шаблоны компилируются один раз при импорте
+STUDENT_FIELDS = FieldExtractor()
+
+def extract_fields(content):
+    """🔎 Возвращает (колледж, курс, ФИО, группа, ID) из текста."""
+    return STUDENT_FIELDS.extract_tuple(content)
+
+# ─────────────────────────────────────────────────────────────
+# НОРМАЛИЗАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+def normalize_name(name):
+    """🔤 Приводит ФИО к виду для сравнения: без регистра, ё -> е, одиночные пробелы."""
+    return ' '.join(name.casefold().replace('ё', 'е').split())
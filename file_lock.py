@@ -0,0 +1,99 @@
+"""
+🔐 БЛОКИРОВКА ФАЙЛОВ
+===========================================================
+Межпроцессная блокировка для нескольких терминалов регистрации,
+работающих с одной базой. Блокируется отдельный файл
+'<база>.lock': сам файл базы заменяется через os.replace,
+и блокировка на нём пропала бы вместе со старой копией.
+
+На Unix используется fcntl.flock (общая блокировка для чтения,
+исключительная - для записи), на Windows - msvcrt.locking
+(всегда исключительная).
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+LOCK_SUFFIX = '.lock'
+
+# Пауза между попытками захвата на Windows (msvcrt не умеет ждать сам)
+RETRY_DELAY = 0.01
+
+# ─────────────────────────────────────────────────────────────
+# БЛОКИРОВКА
+# ─────────────────────────────────────────────────────────────
+
+class FileLock:
+    """
+    Блокировка файла '<path>.lock' между процессами.
+    Внутри одного процесса блокировка повторно входимая: вложенный
+    захват из того же потока ничего не делает (и не повышает общую
+    блокировку до исключительной), а другие потоки ждут на внутреннем RLock.
+    """
+
+    def __init__(self, path):
+        self.lock_path = path + LOCK_SUFFIX
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def _acquire(self, exclusive):
+        self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                return
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                    return
+                except OSError:
+                    time.sleep(RETRY_DELAY)
+        except BaseException:
+            os.close(self._fd)
+            self._fd = None
+            raise
+
+    def _release(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._acquire(exclusive)
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._release()
+
+    def exclusive(self):
+        """🔒 Исключительная блокировка (запись)."""
+        return self._locked(True)
+
+    def shared(self):
+        """🔓 Общая блокировка (чтение): писатели ждут, читатели - нет."""
+        return self._locked(False)
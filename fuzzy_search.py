@@ -0,0 +1,151 @@
+"""
+🤔 НЕЧЁТКИЙ ПОИСК ПО ФИО («ВОЗМОЖНО, ВЫ ИМЕЛИ В ВИДУ»)
+===========================================================
+Расстояние Дамерау-Левенштейна (вариант «оптимального
+выравнивания строк»: вставка, удаление, замена и перестановка
+соседних букв) и BK-дерево - метрический индекс, который
+находит все слова в пределах заданного расстояния, отсекая
+целые поддеревья по неравенству треугольника, без сравнения
+с каждым словом.
+
+BK-дерево строится по отдельным словам ФИО (фамилиям, именам,
+отчествам): различных слов намного меньше, чем студентов,
+и они короче, поэтому и построение, и поиск быстрее, чем по
+полным ФИО. Полное ФИО-кандидат затем проверяется целиком.
+"""
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Сколько опечаток (правок) допускается между запросом и ФИО
+DEFAULT_MAX_DISTANCE = 2
+
+# Сколько вариантов «возможно, вы имели в виду» предлагать
+DEFAULT_SUGGESTIONS = 5
+
+# ─────────────────────────────────────────────────────────────
+# РАССТОЯНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def damerau_levenshtein(a, b, max_distance=None):
+    """
+    📏 Расстояние Дамерау-Левенштейна (с перестановкой соседних символов).
+    Если задан max_distance, при превышении возвращается max_distance + 1
+    без досчёта матрицы.
+    """
+    if a == b:
+        return 0
+    # Общие начало и конец на расстояние не влияют
+    start, end_a, end_b = 0, len(a), len(b)
+    shortest = min(end_a, end_b)
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    limit = max_distance + 1 if max_distance is not None else None
+    if limit is not None and abs(len_a - len_b) >= limit:
+        return limit
+    if not len_a or not len_b:
+        return len_a or len_b
+    previous2 = None
+    previous = list(range(len_b + 1))
+    prev_a = ''
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        left = row_min = i
+        diagonal = i - 1
+        prev_b = ''
+        for j, char_b in enumerate(b, 1):
+            above = previous[j]
+            value = diagonal if char_a == char_b else diagonal + 1
+            if above + 1 < value:
+                value = above + 1
+            if left + 1 < value:
+                value = left + 1
+            if char_a == prev_b and prev_a == char_b and char_a != char_b:
+                swapped = previous2[j - 2] + 1
+                if swapped < value:
+                    value = swapped
+            current.append(value)
+            if value < row_min:
+                row_min = value
+            left, diagonal, prev_b = value, above, char_b
+        if limit is not None and row_min >= limit:
+            return limit
+        previous2, previous, prev_a = previous, current, char_a
+    distance = previous[len_b]
+    if limit is not None and distance >= limit:
+        return limit
+    return distance
+
+# ─────────────────────────────────────────────────────────────
+# BK-ДЕРЕВО
+# ─────────────────────────────────────────────────────────────
+
+class BKTree:
+    """
+    BK-дерево над строками. Узел - пара (слово, {расстояние: дочерний узел}).
+    distance(a, b, max_distance) - метрика с ранним выходом, как у
+    damerau_levenshtein. comparisons - число вычислений расстояния при последнем поиске.
+    """
+
+    def __init__(self, words=(), distance=damerau_levenshtein):
+        self._distance = distance
+        self._root = None
+        self._size = 0
+        self.comparisons = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        """➕ Добавляет слово; False, если оно уже есть."""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return True
+        node = self._root
+        while True:
+            distance = self._distance(word, node[0])
+            if distance == 0:
+                return False
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return True
+            node = child
+
+    def search(self, word, max_distance):
+        """
+        🔎 Все слова на расстоянии не больше max_distance:
+        список (расстояние, слово), ближайшие - первыми.
+        """
+        self.comparisons = 0
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            # Расстояние больше max(поддеревья) + r не нужно знать точно:
+            # ни слово, ни его поддеревья тогда не подходят
+            bound = max_distance + (max(children) if children else 0)
+            distance = self._distance(word, node_word, bound)
+            self.comparisons += 1
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            # Неравенство треугольника: искомые слова могут быть только
+            # в поддеревьях с расстоянием от distance - r до distance + r
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        found.sort()
+        return found
@@ -0,0 +1,315 @@
+"""
+📈 ИНСТРУМЕНТИРОВАНИЕ ГОРЯЧИХ ПУТЕЙ
+===========================================================
+Счётчики для ответа на вопрос «где уходит время»: число
+вызовов, суммарное и максимальное время, прочитанные и
+записанные байты для загрузки/сохранения базы, определения
+кодировки и извлечения полей регулярными выражениями.
+
+Включается флагами Tarakan.py и Pozdnyakov.py (--instrument,
+--instrument-json ФАЙЛ, --profile, --profile-output ФАЙЛ)
+или переменными окружения:
+
+    STUDENTS_INSTRUMENT=1                 сводка в stderr при выходе
+    STUDENTS_INSTRUMENT_JSON=stats.json   то же и JSON в файл
+    STUDENTS_PROFILE=-                    cProfile команды, топ в stderr
+    STUDENTS_PROFILE=run.prof             cProfile, статистика в файл
+
+Выключенное инструментирование ничего не стоит: функции не
+обёрнуты, обёртки ставятся на атрибуты модулей только в enable().
+
+Байты берутся из /proc/self/io (rchar/wchar - все чтения и
+записи процесса, включая вывод в терминал); где этого файла нет
+(Windows, macOS), колонки байтов пустые. Вложенные замеры
+включают время и байты внутренних (как cumulative в cProfile),
+а при работе нескольких потоков байты относятся к процессу целиком.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+from collections import namedtuple
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+ENV_ENABLE = 'STUDENTS_INSTRUMENT'
+ENV_JSON = 'STUDENTS_INSTRUMENT_JSON'
+ENV_PROFILE = 'STUDENTS_PROFILE'
+
+# Сколько строк статистики cProfile печатать
+PROFILE_LINES = 30
+
+# Общие горячие пути, которые инструментируются вместе с функциями программы:
+# (модуль, объект в модуле или None, атрибут)
+SHARED_TARGETS = (
+    ('encoding_detect', None, 'decode_bytes'),
+    ('field_extractor', 'FieldExtractor', 'extract'),
+    ('student_store', 'StudentStore', 'reload'),
+    ('student_store', 'StudentStore', '_write_snapshot'),
+    ('student_store', 'StudentStore', '_append_journal'),
+    ('readme_index', 'RecordIndex', 'load'),
+    ('parse_cache', 'ParseCache', 'parse'),
+)
+
+# ─────────────────────────────────────────────────────────────
+# СЧЁТЧИКИ ВВОДА-ВЫВОДА
+# ─────────────────────────────────────────────────────────────
+
+IoCounters = namedtuple('IoCounters', 'read written')
+
+_io_fd = None
+_io_self = 0     # байты, прочитанные самим счётчиком из /proc/self/io
+
+def _open_io():
+    global _io_fd
+    try:
+        _io_fd = os.open('/proc/self/io', os.O_RDONLY)
+    except (OSError, AttributeError):
+        _io_fd = None
+
+def io_counters():
+    """Прочитанные и записанные процессом байты или None, если счётчиков нет."""
+    global _io_self
+    if _io_fd is None:
+        return None
+    data = os.pread(_io_fd, 512, 0)
+    # b'rchar: N\nwchar: M\n...'; прочитанное значение ещё не включает это чтение
+    fields = data.split(None, 4)
+    counters = IoCounters(int(fields[1]) - _io_self, int(fields[3]))
+    _io_self += len(data)
+    return counters
+
+# ─────────────────────────────────────────────────────────────
+# ЗАМЕРЫ
+# ─────────────────────────────────────────────────────────────
+
+class CallStats:
+    """Накопленные замеры одной функции."""
+
+    __slots__ = ('name', 'calls', 'errors', 'total', 'max', 'bytes_read', 'bytes_written')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes_read = None
+        self.bytes_written = None
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+        }
+
+_stats = {}
+_patched = []
+_json_path = None
+_atexit_registered = False
+
+def enabled():
+    """Включено ли инструментирование."""
+    return bool(_patched)
+
+def _wrap(func, name):
+    stats = _stats.setdefault(name, CallStats(name))
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        io_before = io_counters()
+        started = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            stats.calls += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if io_before is not None:
+                io_after = io_counters()
+                stats.bytes_read = (stats.bytes_read or 0) + io_after.read - io_before.read
+                stats.bytes_written = (stats.bytes_written or 0) + io_after.written - io_before.written
+
+    wrapper.__instrumented__ = func
+    return wrapper
+
+def instrument(owner, attribute, name=None):
+    """📌 Заменяет owner.attribute обёрткой с замерами (повторно не оборачивает)."""
+    func = getattr(owner, attribute)
+    if hasattr(func, '__instrumented__'):
+        return
+    if name is None:
+        if isinstance(owner, type):
+            prefix = owner.__name__
+        elif owner.__name__ == '__main__':
+            # Запущенный скрипт подписывается именем файла: Tarakan.parse_file
+            prefix = os.path.splitext(os.path.basename(owner.__file__))[0]
+        else:
+            prefix = owner.__name__.rpartition('.')[2]
+        name = f"{prefix}.{attribute}"
+    # Метод класса берётся из __dict__, чтобы вернуть на место именно его
+    original = owner.__dict__[attribute] if isinstance(owner, type) else func
+    setattr(owner, attribute, _wrap(original, name))
+    _patched.append((owner, attribute, original))
+
+def enable(module, names, json_path=None):
+    """
+    ▶️ Включает замеры для функций names модуля module (и общих горячих путей
+    SHARED_TARGETS); сводка выводится при выходе из программы.
+    """
+    global _json_path, _atexit_registered
+    if _io_fd is None:
+        _open_io()
+    for name in names:
+        instrument(module, name)
+    for module_name, owner_name, attribute in SHARED_TARGETS:
+        owner = sys.modules.get(module_name)
+        if owner is None:
+            continue
+        if owner_name is not None:
+            owner = getattr(owner, owner_name)
+        instrument(owner, attribute)
+    if json_path:
+        _json_path = json_path
+    if not _atexit_registered:
+        atexit.register(_dump_at_exit)
+        _atexit_registered = True
+
+def disable():
+    """⏹️ Снимает обёртки (накопленные замеры остаются)."""
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+
+def reset():
+    _stats.clear()
+
+def summary():
+    """Замеры в виде списка словарей (самые затратные - первыми)."""
+    return [stats.to_dict() for stats in sorted(_stats.values(), key=lambda s: -s.total)
+            if stats.calls]
+
+# ─────────────────────────────────────────────────────────────
+# ОТЧЁТ
+# ─────────────────────────────────────────────────────────────
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    for unit in ('Б', 'КБ', 'МБ'):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == 'Б' else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} ГБ"
+
+def print_summary(file=None):
+    """📈 Печатает таблицу замеров (по умолчанию в stderr)."""
+    file = file or sys.stderr
+    rows = summary()
+    if not rows:
+        print("📈 Инструментирование: вызовов не было", file=file)
+        return
+    print("\n📈 Инструментирование (время и байты включают вложенные вызовы):", file=file)
+    print(f"{'функция':<34} {'вызовы':>7} {'всего, мс':>11} {'среднее':>9} {'макс':>9} "
+          f"{'прочитано':>10} {'записано':>10}", file=file)
+    for row in rows:
+        print(f"{row['name']:<34} {row['calls']:>7} {row['total_ms']:>11.1f} "
+              f"{row['mean_ms']:>9.3f} {row['max_ms']:>9.3f} "
+              f"{_format_bytes(row['bytes_read']):>10} {_format_bytes(row['bytes_written']):>10}",
+              file=file)
+
+def dump_json(path):
+    """💾 Пишет замеры в JSON файл."""
+    report = {
+        'pid': os.getpid(),
+        'argv': sys.argv,
+        'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'calls': summary(),
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+def _dump_at_exit():
+    if not _stats:
+        return
+    print_summary()
+    if _json_path:
+        try:
+            dump_json(_json_path)
+            print(f"💾 Замеры сохранены: {_json_path}", file=sys.stderr)
+        except OSError as e:
+            print(f"❌ Не удалось сохранить замеры: {e}", file=sys.stderr)
+
+# ─────────────────────────────────────────────────────────────
+# ПРОФИЛИРОВАНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def run_profiled(func, *args, output='-'):
+    """
+    🔬 Выполняет func(*args) под cProfile. output '-' - топ функций
+    по накопленному времени в stderr, иначе статистика пишется в файл
+    (открывается python -m pstats ФАЙЛ или snakeviz).
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        if output and output != '-':
+            profiler.dump_stats(output)
+            print(f"🔬 Профиль сохранён: {output}", file=sys.stderr)
+        else:
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+
+# ─────────────────────────────────────────────────────────────
+# КОМАНДНАЯ СТРОКА
+# ─────────────────────────────────────────────────────────────
+
+def add_instrument_arguments(parser):
+    """🧭 Добавляет к разбору аргументов флаги замеров и профилирования."""
+    parser.add_argument('--instrument', action='store_true',
+                        help=f"замеры горячих путей, сводка в stderr при выходе "
+                             f"(или переменная {ENV_ENABLE}=1)")
+    parser.add_argument('--instrument-json', default=None, metavar='ФАЙЛ',
+                        help=f"сохранить замеры в JSON (или {ENV_JSON}=ФАЙЛ)")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"выполнить команду под cProfile, топ функций в stderr "
+                             f"(или {ENV_PROFILE}=-)")
+    parser.add_argument('--profile-output', default=None, metavar='ФАЙЛ',
+                        help=f"выполнить команду под cProfile и сохранить статистику в файл "
+                             f"(или {ENV_PROFILE}=ФАЙЛ)")
+
+def configure(args, module, names):
+    """
+    ⚙️ Включает замеры по флагам (add_instrument_arguments) и переменным
+    окружения. Возвращает путь для cProfile ('-' - вывод в stderr) или None.
+    """
+    json_path = args.instrument_json or os.environ.get(ENV_JSON) or None
+    flag = os.environ.get(ENV_ENABLE, '').strip().lower()
+    if args.instrument or json_path or flag not in ('', '0', 'no', 'false'):
+        enable(module, names, json_path)
+    if args.profile_output:
+        return args.profile_output
+    if args.profile:
+        return '-'
+    return os.environ.get(ENV_PROFILE) or None
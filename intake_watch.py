@@ -0,0 +1,335 @@
+"""
+👀 СИНХРОНИЗАЦИЯ КАТАЛОГА ПОСТУПЛЕНИЙ
+===========================================================
+Общая папка с файлами студентов синхронизируется с базой
+данных: разбираются только новые и изменённые файлы.
+
+Манифест (SQLite) хранит для каждого файла размер, время
+изменения и хэш содержимого, а также студента, который был
+из него добавлен. Повторный просмотр сверяет файлы с манифестом
+по stat, не читая их, поэтому 100k неизменённых файлов
+проверяются за секунды. Файл с другим stat, но тем же
+содержимым, не разбирается (только обновляется его stat).
+
+Изменённые файлы разбираются пачками (в пуле процессов, как
+bulk_ingest); после записи студентов пачки в базу её строки
+манифеста фиксируются одной транзакцией. Если процесс прервётся
+между этими шагами, файлы пачки будут разобраны снова, а
+повторное добавление отсеется проверкой дубликатов.
+
+Изменения отслеживаются опросом (по умолчанию раз в 2 секунды):
+он одинаково работает на всех системах и в сетевых папках.
+"""
+
+import os
+import time
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from bulk_ingest import STUDENT_FILE_PATTERNS, field_status, is_student_file, make_student_record
+from field_extractor import FIELDS
+from parse_cache import RACY_NS, content_digest, parse_bytes, read_bytes
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+MANIFEST_SUFFIX = '.manifest'
+
+# Сколько изменённых файлов разбирается и записывается за один раз
+DEFAULT_BATCH_SIZE = 1000
+
+# Меньше изменённых файлов - разбор в текущем процессе, без пула
+POOL_THRESHOLD = 64
+
+DEFAULT_INTERVAL = 2.0
+
+MANIFEST_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    "path" TEXT PRIMARY KEY,
+    "size" INTEGER NOT NULL,
+    "mtime_ns" INTEGER NOT NULL,
+    "checked_ns" INTEGER NOT NULL,
+    "digest" BLOB NOT NULL,
+    "status" TEXT NOT NULL,
+    "name" TEXT,
+    "group" TEXT,
+    "id" TEXT
+);
+'''
+
+SQL_LOAD = ('SELECT "path", "size", "mtime_ns", "checked_ns", "digest", "status", '
+            '"name", "group", "id" FROM files')
+SQL_UPSERT = 'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'
+SQL_DELETE = 'DELETE FROM files WHERE "path" = ?'
+
+# Строка манифеста: key - (ФИО, группа, ID) студента из файла или None
+ManifestEntry = namedtuple('ManifestEntry', 'size mtime_ns checked_ns digest status key')
+
+# ─────────────────────────────────────────────────────────────
+# МАНИФЕСТ
+# ─────────────────────────────────────────────────────────────
+
+class IntakeManifest:
+    """Манифест синхронизированных файлов: путь -> ManifestEntry."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(MANIFEST_SCHEMA)
+
+    def load(self):
+        """📋 Все записи манифеста словарём {путь: ManifestEntry}."""
+        entries = {}
+        for path, size, mtime_ns, checked_ns, digest, status, name, group, id in \
+                self._conn.execute(SQL_LOAD):
+            key = (name, group, id) if status == 'added' else None
+            entries[path] = ManifestEntry(size, mtime_ns, checked_ns, digest, status, key)
+        return entries
+
+    def commit(self, updates, removed=()):
+        """💾 Записывает пачку изменений {путь: ManifestEntry} одной транзакцией."""
+        if not updates and not removed:
+            return
+        rows = [(path, entry.size, entry.mtime_ns, entry.checked_ns, entry.digest, entry.status)
+                + (entry.key or (None, None, None)) for path, entry in updates.items()]
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.executemany(SQL_UPSERT, rows)
+            self._conn.executemany(SQL_DELETE, [(path,) for path in removed])
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        self._conn.close()
+
+# ─────────────────────────────────────────────────────────────
+# ПРОСМОТР КАТАЛОГА
+# ─────────────────────────────────────────────────────────────
+
+def iter_files(directory, patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    📁 Перебирает (абсолютный путь, stat) файлов студентов каталога и подкаталогов:
+    имена по patterns, кроме базы данных и манифеста (excluded, см. bulk_ingest).
+    """
+    stack = [os.path.abspath(directory)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.is_file() and is_student_file(entry.path, patterns, excluded):
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+def is_unchanged(entry, stat):
+    """Файл совпадает с манифестом по размеру и mtime и не менялся незадолго до проверки."""
+    return (entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns
+            and entry.mtime_ns + RACY_NS <= entry.checked_ns)
+
+def check_file(task):
+    """
+    Читает файл и, если его содержимое изменилось (хэш не равен known_digest),
+    разбирает его (выполняется в дочернем процессе).
+    Возвращает (путь, статус, stat, хэш, поля): статус 'unchanged', 'parsed',
+    'skipped' или 'failed' (тогда вместо хэша - текст ошибки).
+    """
+    file_path, known_digest = task
+    try:
+        stat = os.stat(file_path)
+        data = read_bytes(file_path)
+    except OSError as e:
+        return file_path, 'failed', None, str(e), None
+    digest = content_digest(data)
+    if digest == known_digest:
+        return file_path, 'unchanged', stat, digest, None
+    try:
+        _content, _encoding, found = parse_bytes(data)
+    except UnicodeDecodeError as e:
+        return file_path, 'failed', None, str(e), None
+    fields = tuple(found.get(field) for field in FIELDS)
+    return file_path, field_status(fields), stat, digest, fields
+
+# ─────────────────────────────────────────────────────────────
+# СИНХРОНИЗАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+def new_summary():
+    return {
+        'files': 0,
+        'unchanged': 0,
+        'added': 0,
+        'updated': 0,
+        'duplicate': 0,
+        'skipped': 0,
+        'failed': 0,
+        'removed': 0,
+        'errors': [],
+    }
+
+def apply_batch(results, store, entries, summary, registration_date):
+    """
+    Записывает в базу студентов из разобранных файлов пачки.
+    Новый студент добавляется; если файл, из которого студент уже
+    добавлялся, изменил колледж или курс, запись обновляется, а если
+    в нём теперь другой студент - прежняя запись заменяется новой.
+    Возвращает изменения манифеста {путь: ManifestEntry}.
+    """
+    now = time.time_ns()
+    updates = {}
+    additions = {}
+    replacements = {}
+
+    for file_path, status, stat, digest, fields in results:
+        entry = entries.get(file_path)
+        if status == 'failed':
+            summary['failed'] += 1
+            summary['errors'].append((file_path, digest))
+            continue
+        if status == 'unchanged':
+            summary['unchanged'] += 1
+            updates[file_path] = entry._replace(size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                                                checked_ns=now)
+            continue
+        if status == 'skipped':
+            # Неполный файл: прежний студент из него остаётся в базе
+            summary['skipped'] += 1
+            updates[file_path] = ManifestEntry(stat.st_size, stat.st_mtime_ns, now, digest,
+                                               'skipped', None)
+            continue
+
+        college, course, name, group, id = fields
+        key = (name, group, id)
+        old_key = entry.key if entry is not None else None
+        record = make_student_record(college, course, name, group, id, registration_date)
+        result = 'added'
+        if old_key is not None and old_key != key:
+            replacements[old_key] = None
+            summary['updated'] += 1
+        if key in additions:
+            result = 'duplicate'
+        else:
+            existing = store.find(name, group, id)
+            if existing is None:
+                additions[key] = record
+            elif old_key == key:
+                if (existing['college'], existing['course']) != (college, course):
+                    replacements[key] = dict(existing.to_dict(), college=college, course=course)
+                    summary['updated'] += 1
+                else:
+                    result = 'unchanged'
+            else:
+                result = 'duplicate'
+        if result == 'duplicate':
+            summary['duplicate'] += 1
+            updates[file_path] = ManifestEntry(stat.st_size, stat.st_mtime_ns, now, digest,
+                                               'duplicate', None)
+            continue
+        if result == 'unchanged':
+            summary['unchanged'] += 1
+        updates[file_path] = ManifestEntry(stat.st_size, stat.st_mtime_ns, now, digest,
+                                           'added', key)
+
+    if replacements:
+        # Замена по ключу под блокировкой хранилища: студенты, которых
+        # тем временем зарегистрировали в другом терминале, не теряются
+        store.replace_many(replacements)
+    if additions:
+        summary['added'] += len(store.add_many(list(additions.values())))
+    return updates
+
+def sync_directory(source, store, manifest, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                   patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    🔄 Сверяет каталог source с манифестом и переносит в базу новые
+    и изменённые файлы. Удалённые файлы (и файлы, которые больше не
+    подходят под patterns) убираются из манифеста (их студенты остаются
+    в базе). Возвращает сводку.
+    """
+    started = time.perf_counter()
+    summary = new_summary()
+    entries = manifest.load()
+    root = os.path.join(os.path.abspath(source), '')
+
+    tasks = []
+    seen = set()
+    for file_path, stat in iter_files(source, patterns, excluded):
+        seen.add(file_path)
+        entry = entries.get(file_path)
+        if entry is not None and is_unchanged(entry, stat):
+            continue
+        tasks.append((file_path, entry.digest if entry is not None else None))
+    summary['files'] = len(seen)
+    removed = [path for path in entries if path.startswith(root) and path not in seen]
+
+    registration_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    pool = None
+    if len(tasks) >= POOL_THRESHOLD:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for start in range(0, len(tasks), batch_size):
+            batch = tasks[start:start + batch_size]
+            if pool is not None:
+                results = list(pool.map(check_file, batch, chunksize=64))
+            else:
+                results = [check_file(task) for task in batch]
+            updates = apply_batch(results, store, entries, summary, registration_date)
+            manifest.commit(updates)
+            entries.update(updates)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    manifest.commit({}, removed)
+    summary['removed'] = len(removed)
+    summary['unchanged'] += summary['files'] - len(tasks)
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+def watch_directory(source, store, manifest, interval=DEFAULT_INTERVAL, workers=None,
+                    batch_size=DEFAULT_BATCH_SIZE, on_sync=None, iterations=None,
+                    patterns=STUDENT_FILE_PATTERNS, excluded=()):
+    """
+    👀 Опрашивает каталог каждые interval секунд и синхронизирует изменения.
+    on_sync(summary) вызывается после каждого просмотра; iterations -
+    число просмотров (None - до прерывания Ctrl+C); patterns и excluded -
+    какие файлы брать (см. iter_files).
+    """
+    done = 0
+    while iterations is None or done < iterations:
+        started = time.monotonic()
+        summary = sync_directory(source, store, manifest, workers, batch_size,
+                                 patterns, excluded)
+        if on_sync is not None:
+            on_sync(summary)
+        done += 1
+        if iterations is not None and done >= iterations:
+            break
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+def print_sync_summary(summary, quiet_unchanged=False):
+    """📊 Выводит сводку одного просмотра (quiet_unchanged - молчать, если изменений нет)."""
+    changes = (summary['added'] + summary['updated'] + summary['duplicate'] + summary['skipped']
+               + summary['failed'] + summary['removed'])
+    if quiet_unchanged and not changes:
+        return
+    stamp = datetime.now().strftime("%H:%M:%S")
+    print(f"🔄 {stamp} файлов: {summary['files']}, без изменений: {summary['unchanged']}, "
+          f"добавлено: {summary['added']}, обновлено: {summary['updated']}, "
+          f"дубликаты: {summary['duplicate']}, пропущено: {summary['skipped']}, "
+          f"удалено из манифеста: {summary['removed']}, ошибки: {summary['failed']} "
+          f"({summary['seconds']:.2f} с)", flush=True)
+    for file_path, error in summary['errors'][:10]:
+        print(f"   ❌ {file_path}: {error}")
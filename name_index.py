@@ -0,0 +1,253 @@
+"""
+🔤 ИНДЕКС ПОИСКА ПО ФИО
+===========================================================
+Поиск по мере ввода: ФИО нормализуется один раз при загрузке
+(регистр, ё -> е, пробелы - см. normalize_name), после чего
+запрос не перебирает и не переводит в нижний регистр все имена.
+
+- Префикс: отсортированный список «хвостов» ФИО, начинающихся
+  с каждого слова, и bisect - «андр» найдёт «Тараканов Андрей».
+- Подстрока: инвертированный индекс триграмм -> номера ФИО;
+  кандидаты берутся из самого редкого списка триграмм запроса
+  и проверяются на вхождение.
+
+Результаты ранжируются: точное совпадение, начало ФИО, начало
+слова, вхождение подстроки (раньше и короче - выше).
+
+- Опечатки: BK-дерево слов ФИО (см. fuzzy_search) строится при
+  первом нечётком запросе; кандидаты - ФИО, каждое слово которых
+  близко к слову запроса, затем проверяется расстояние целиком.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from functools import partial
+
+from field_extractor import normalize_name
+from fuzzy_search import BKTree, damerau_levenshtein, DEFAULT_MAX_DISTANCE, DEFAULT_SUGGESTIONS
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+DEFAULT_LIMIT = 10
+
+# Сколько кандидатов-подстрок проверяется сверх лимита для ранжирования
+SUBSTRING_SCAN = 50
+
+# Новые ФИО вставляются в отсортированный список по одному,
+# если их немного, иначе список пересортировывается целиком
+INSORT_LIMIT = 1000
+
+# Классы совпадений (меньше - выше в выдаче)
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+_MAX_CHAR = '\U0010ffff'
+
+def trigrams(text):
+    """Множество триграмм строки."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# ─────────────────────────────────────────────────────────────
+# ИНДЕКС
+# ─────────────────────────────────────────────────────────────
+
+class NameIndex:
+    """
+    Индекс ФИО -> значения (записи студентов, смещения в файле и т. п.).
+    Одинаковые после нормализации ФИО хранятся одним ключом.
+    """
+
+    def __init__(self, items=()):
+        self._keys = []          # номер ключа -> нормализованное ФИО
+        self._values = []        # номер ключа -> список значений
+        self._key_ids = {}       # нормализованное ФИО -> номер ключа
+        self._words = []         # отсортированные (хвост ФИО от начала слова, номер ключа)
+        self._unsorted = []      # хвосты, ещё не вставленные в _words
+        self._trigrams = defaultdict(partial(array, 'I'))  # триграмма -> номера ключей
+        self._word_tree = None   # BK-дерево слов ФИО (строится по требованию)
+        self._word_keys = None   # слово -> номера ключей
+        self.add_many(items)
+
+    def __len__(self):
+        return len(self._keys)
+
+    # ── Наполнение ───────────────────────────────────────────
+
+    def add(self, name, value):
+        """➕ Добавляет значение под ФИО name."""
+        key = normalize_name(name or '')
+        if not key:
+            return
+        key_id = self._key_ids.get(key)
+        if key_id is not None:
+            self._values[key_id].append(value)
+            return
+        key_id = self._key_ids[key] = len(self._keys)
+        self._keys.append(key)
+        self._values.append([value])
+        start = 0
+        while start >= 0:
+            self._unsorted.append((key[start:], key_id))
+            start = key.find(' ', start)
+            if start >= 0:
+                start += 1
+        postings = self._trigrams
+        for trigram in trigrams(key):
+            postings[trigram].append(key_id)
+        if self._word_tree is not None:
+            self._index_words(key, key_id)
+
+    def _index_words(self, key, key_id):
+        for word in set(key.split()):
+            ids = self._word_keys.get(word)
+            if ids is None:
+                ids = self._word_keys[word] = array('I')
+                self._word_tree.add(word)
+            ids.append(key_id)
+
+    def _build_word_tree(self):
+        if self._word_tree is not None:
+            return
+        self._word_tree = BKTree()
+        self._word_keys = {}
+        for key_id, key in enumerate(self._keys):
+            self._index_words(key, key_id)
+
+    def add_many(self, items):
+        """➕ Добавляет пары (ФИО, значение)."""
+        for name, value in items:
+            self.add(name, value)
+
+    def _sort_pending(self):
+        if not self._unsorted:
+            return
+        if len(self._unsorted) <= INSORT_LIMIT:
+            for item in self._unsorted:
+                insort(self._words, item)
+        else:
+            self._words.extend(self._unsorted)
+            self._words.sort()
+        self._unsorted = []
+
+    # ── Поиск ────────────────────────────────────────────────
+
+    def get(self, name):
+        """👥 Значения под ФИО name (после нормализации) - точное совпадение."""
+        key_id = self._key_ids.get(normalize_name(name or ''))
+        return list(self._values[key_id]) if key_id is not None else []
+
+    def _prefix_matches(self, query, limit):
+        """Ключи, у которых ФИО или одно из слов начинается с query."""
+        start = bisect_left(self._words, (query,))
+        end = bisect_left(self._words, (query + _MAX_CHAR,))
+        ranked = {}
+        # Диапазон отсортирован по хвосту: первые записи - самые короткие
+        # продолжения запроса; проверяем с запасом для ранжирования
+        for index in range(start, min(end, start + limit * SUBSTRING_SCAN)):
+            tail, key_id = self._words[index]
+            key = self._keys[key_id]
+            rank = (EXACT if key == query else
+                    PREFIX if len(tail) == len(key) else WORD_PREFIX)
+            score = (rank, len(key) - len(tail), len(key), key)
+            if key_id not in ranked or score < ranked[key_id]:
+                ranked[key_id] = score
+        return ranked
+
+    def _substring_matches(self, query, limit, ranked):
+        """Дополняет ranked ключами, содержащими query (через триграммы)."""
+        if len(query) < 3:
+            return
+        candidates = None
+        for trigram in trigrams(query):
+            ids = self._trigrams.get(trigram)
+            if ids is None:
+                return
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        # Кандидаты - самый короткий список триграммы запроса; проверка
+        # вхождения в C дешевле, чем пересечение длинных списков
+        found = 0
+        for key_id in candidates:
+            if key_id in ranked:
+                continue
+            key = self._keys[key_id]
+            position = key.find(query)
+            if position < 0:
+                continue
+            ranked[key_id] = (SUBSTRING, position, len(key), key)
+            found += 1
+            if found >= limit * SUBSTRING_SCAN:
+                break
+
+    def search_keys(self, query, limit=DEFAULT_LIMIT):
+        """
+        🔎 Возвращает до limit пар (нормализованное ФИО, список значений),
+        лучшие совпадения - первыми.
+        """
+        query = normalize_name(query or '')
+        if not query or limit <= 0:
+            return []
+        self._sort_pending()
+        ranked = self._prefix_matches(query, limit)
+        if len(ranked) < limit:
+            self._substring_matches(query, limit, ranked)
+        best = sorted(ranked, key=ranked.__getitem__)[:limit]
+        return [(self._keys[key_id], self._values[key_id]) for key_id in best]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """🔎 Возвращает до limit значений для лучших совпадений ФИО."""
+        results = []
+        for _key, values in self.search_keys(query, limit):
+            results.extend(values[:limit - len(results)])
+            if len(results) >= limit:
+                break
+        return results
+
+    # ── Опечатки ─────────────────────────────────────────────
+
+    def suggest_keys(self, query, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_SUGGESTIONS):
+        """
+        🤔 ФИО на расстоянии Дамерау-Левенштейна не больше max_distance:
+        до limit троек (расстояние, нормализованное ФИО, список значений),
+        ближайшие - первыми.
+        """
+        query = normalize_name(query or '')
+        if not query or limit <= 0:
+            return []
+        self._build_word_tree()
+        # Каждое слово ФИО-кандидата должно быть близко к слову запроса:
+        # опечаток в одном слове не больше, чем во всём ФИО
+        close_words = []
+        for word in set(query.split()):
+            close = {found for _distance, found in self._word_tree.search(word, max_distance)}
+            if not close:
+                return []
+            size = sum(len(self._word_keys[found]) for found in close)
+            close_words.append((size, close))
+        close_words.sort(key=lambda item: item[0])
+        candidates = set()
+        for found in close_words[0][1]:
+            candidates.update(self._word_keys[found])
+        ranked = []
+        for key_id in candidates:
+            key = self._keys[key_id]
+            if len(close_words) > 1:
+                words = key.split()
+                if not all(any(word in close for word in words) for _size, close in close_words[1:]):
+                    continue
+            distance = damerau_levenshtein(query, key, max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, key, key_id))
+        ranked.sort()
+        return [(distance, key, self._values[key_id]) for distance, key, key_id in ranked[:limit]]
+
+    def suggest(self, query, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_SUGGESTIONS):
+        """🤔 До limit пар (расстояние, значение) для ФИО с опечатками."""
+        results = []
+        for distance, _key, values in self.suggest_keys(query, max_distance, limit):
+            results.extend((distance, value) for value in values[:limit - len(results)])
+            if len(results) >= limit:
+                break
+        return results
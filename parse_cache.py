@@ -0,0 +1,272 @@
+"""
+🗃️ КЭШ РАЗОБРАННЫХ ФАЙЛОВ
+===========================================================
+Повторный анализ того же файла (особенно README002.md
+по умолчанию) не декодирует текст и не запускает регулярные
+выражения заново: кодировка и извлечённые поля хранятся
+в небольшой базе SQLite в каталоге кэша пользователя
+(~/.cache/students, на Windows - %LOCALAPPDATA%\students),
+а не в текущем каталоге.
+
+Запись находится по пути к файлу и проверяется по размеру
+и времени изменения (без чтения файла), а если файл менялся
+недавно или его метаданные другие - по хэшу содержимого
+(BLAKE2b): переименованный или «тронутый» без изменений файл
+тоже берётся из кэша. Число записей ограничено, при
+переполнении удаляются давно не использованные (LRU).
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from collections import namedtuple
+
+from encoding_detect import decode_as, decode_bytes
+from field_extractor import FIELD_LABELS, VALUE_PATTERN, STUDENT_FIELDS
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+CACHE_FILE_NAME = 'parse_cache.db'
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Файл, изменённый меньше чем за RACY_NS до последней проверки, мог
+# измениться ещё раз в пределах точности mtime - его сверяем по хэшу
+RACY_NS = 2_000_000_000
+
+# Время последнего использования (для LRU) обновляется не чаще раза
+# в минуту: повторный разбор того же файла обходится без записи в базу
+TOUCH_NS = 60_000_000_000
+
+# Версия формата записей: при изменении кэш очищается
+CACHE_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS parsed (
+    "path" TEXT PRIMARY KEY,
+    "size" INTEGER NOT NULL,
+    "mtime_ns" INTEGER NOT NULL,
+    "checked_ns" INTEGER NOT NULL,
+    "digest" BLOB NOT NULL,
+    "encoding" TEXT NOT NULL,
+    "fields" TEXT NOT NULL,
+    "used" INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parsed_digest ON parsed ("digest");
+CREATE INDEX IF NOT EXISTS parsed_used ON parsed ("used");
+CREATE TABLE IF NOT EXISTS cache_meta (
+    "key" TEXT PRIMARY KEY,
+    "value" TEXT NOT NULL
+);
+'''
+
+SQL_BY_PATH = ('SELECT "size", "mtime_ns", "checked_ns", "digest", "encoding", "fields", "used" '
+               'FROM parsed WHERE "path" = ?')
+SQL_BY_DIGEST = 'SELECT "encoding", "fields" FROM parsed WHERE "digest" = ? LIMIT 1'
+SQL_UPSERT = ('INSERT OR REPLACE INTO parsed ("path", "size", "mtime_ns", "checked_ns", "digest", '
+              '"encoding", "fields", "used") VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+SQL_TOUCH = 'UPDATE parsed SET "used" = ? WHERE "path" = ?'
+SQL_COUNT = 'SELECT COUNT(*) FROM parsed'
+SQL_EVICT = ('DELETE FROM parsed WHERE "path" IN '
+             '(SELECT "path" FROM parsed ORDER BY "used" LIMIT ?)')
+
+# Разобранный файл: поля {поле: значение} (только найденные, как
+# FieldExtractor.extract), кодировка, текст (если запрошен) и признак попадания в кэш
+ParsedFile = namedtuple('ParsedFile', 'fields encoding text cached')
+
+def user_cache_dir():
+    """📁 Каталог кэша пользователя для программы (XDG_CACHE_HOME или LOCALAPPDATA)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'students')
+
+# Кэш общий для всех запусков пользователя, из какого бы каталога
+# ни запускалась программа: он не попадает в каталоги с файлами студентов
+DEFAULT_CACHE_FILE = os.path.join(user_cache_dir(), CACHE_FILE_NAME)
+
+def parser_fingerprint():
+    """Отпечаток правил разбора: изменились метки полей - старые записи не годятся."""
+    rules = repr((CACHE_VERSION, FIELD_LABELS, VALUE_PATTERN)).encode('utf-8')
+    return hashlib.blake2b(rules, digest_size=16).hexdigest()
+
+def content_digest(data):
+    """Быстрый хэш содержимого файла."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def read_bytes(file_path):
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+def parse_bytes(data):
+    """Декодирует байты и извлекает поля без кэша. Возвращает (текст, кодировка, поля)."""
+    text, encoding = decode_bytes(data)
+    return text, encoding, STUDENT_FIELDS.extract(text)
+
+# ─────────────────────────────────────────────────────────────
+# КЭШ
+# ─────────────────────────────────────────────────────────────
+
+class ParseCache:
+    """
+    Кэш разбора файлов в SQLite (режим WAL: им могут одновременно
+    пользоваться несколько процессов). Ошибки самой базы кэша не
+    мешают разбору: кэш отключается, а файлы разбираются заново.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self._conn = self._connect()
+        except sqlite3.DatabaseError:
+            # Повреждённый файл кэша не жалко: создаём заново
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self._conn = self._connect()
+        self._count = self._conn.execute(SQL_COUNT).fetchone()[0]
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Потеря последних записей кэша при сбое питания безвредна
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.executescript(SCHEMA)
+            fingerprint = parser_fingerprint()
+            row = conn.execute('SELECT "value" FROM cache_meta WHERE "key" = ?',
+                               ('parser',)).fetchone()
+            if row is None or row[0] != fingerprint:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute('DELETE FROM parsed')
+                conn.execute('INSERT OR REPLACE INTO cache_meta VALUES (?, ?)',
+                             ('parser', fingerprint))
+                conn.execute('COMMIT')
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _execute(self, sql, params=()):
+        """Выполняет запрос; при ошибке базы кэш отключается и возвращается None."""
+        if self._conn is None:
+            return None
+        try:
+            return self._conn.execute(sql, params)
+        except sqlite3.Error:
+            self.close()
+            return None
+
+    def __len__(self):
+        cursor = self._execute(SQL_COUNT)
+        return cursor.fetchone()[0] if cursor is not None else 0
+
+    def lookup(self, file_path, stat=None):
+        """
+        ⚡ Поля и кодировка файла, если запись совпадает по размеру и
+        времени изменения (файл не читается), иначе None.
+        Возвращает ParsedFile без текста.
+        """
+        path = os.path.abspath(file_path)
+        stat = stat if stat is not None else os.stat(path)
+        cursor = self._execute(SQL_BY_PATH, (path,))
+        row = cursor.fetchone() if cursor is not None else None
+        if row is None or not self._settled(row, stat):
+            return None
+        self._touch(path, row, time.time_ns())
+        self.hits += 1
+        return ParsedFile(json.loads(row[5]), row[4], None, True)
+
+    def parse(self, file_path, with_text=False):
+        """
+        📄 Разбирает файл через кэш. Возвращает ParsedFile: текст
+        декодируется только при with_text (по сохранённой кодировке,
+        без её определения и без регулярных выражений).
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        cursor = self._execute(SQL_BY_PATH, (path,))
+        row = cursor.fetchone() if cursor is not None else None
+        now = time.time_ns()
+
+        if row is not None and self._settled(row, stat):
+            self._touch(path, row, now)
+            self.hits += 1
+            text = decode_as(read_bytes(path), row[4]) if with_text else None
+            return ParsedFile(json.loads(row[5]), row[4], text, True)
+
+        data = read_bytes(path)
+        digest = content_digest(data)
+        found = None
+        if row is not None and row[3] == digest:
+            found = (row[4], row[5])
+        else:
+            cursor = self._execute(SQL_BY_DIGEST, (digest,))
+            found = cursor.fetchone() if cursor is not None else None
+        if found is not None:
+            encoding, fields_json = found
+            self.hits += 1
+            self._store(path, stat, now, digest, encoding, fields_json, row is None)
+            text = decode_as(data, encoding) if with_text else None
+            return ParsedFile(json.loads(fields_json), encoding, text, True)
+
+        text, encoding, fields = parse_bytes(data)
+        self.misses += 1
+        self._store(path, stat, now, digest, encoding,
+                    json.dumps(fields, ensure_ascii=False), row is None)
+        return ParsedFile(fields, encoding, text if with_text else None, False)
+
+    def store(self, file_path, stat, digest, encoding, fields):
+        """💾 Сохраняет результат разбора, выполненного вне кэша (например, в дочернем процессе)."""
+        path = os.path.abspath(file_path)
+        self._store(path, stat, time.time_ns(), digest, encoding,
+                    json.dumps(fields, ensure_ascii=False), True)
+
+    def _settled(self, row, stat):
+        """Размер и mtime совпадают, и файл не менялся незадолго до прошлой проверки."""
+        size, mtime_ns, checked_ns = row[0], row[1], row[2]
+        return (size == stat.st_size and mtime_ns == stat.st_mtime_ns
+                and mtime_ns + RACY_NS <= checked_ns)
+
+    def _touch(self, path, row, now):
+        if now - row[6] >= TOUCH_NS:
+            self._execute(SQL_TOUCH, (now, path))
+
+    def _store(self, path, stat, now, digest, encoding, fields_json, new):
+        cursor = self._execute(SQL_UPSERT, (path, stat.st_size, stat.st_mtime_ns, now, digest,
+                                            encoding, fields_json, now))
+        if cursor is None or not new:
+            return
+        self._count += 1
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        """🧹 Удаляет давно не использованные записи сверх max_entries."""
+        cursor = self._execute(SQL_COUNT)
+        if cursor is None:
+            return
+        self._count = cursor.fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess > 0 and self._execute(SQL_EVICT, (excess,)) is not None:
+            self._count -= excess
+
+    def clear(self):
+        """🗑️ Удаляет все записи."""
+        if self._execute('DELETE FROM parsed') is not None:
+            self._count = 0
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,320 @@
+"""
+🗂️ ИНДЕКС ЗАПИСЕЙ README002.md
+===========================================================
+Файл пользователей пополняется дописыванием записей в конец.
+Рядом с ним хранится индекс '<файл>.idx': ID и нормализованное
+ФИО -> смещение записи в байтах. Поиск по индексу читает с диска
+только нужную запись через mmap, а не весь файл.
+
+Формат индекса: первая строка - заголовок фиксированной ширины
+с отпечатком файла данных (перезаписывается на месте при каждом
+дописывании), далее по одной JSON-строке на запись:
+[смещение, длина, ID, нормализованное ФИО].
+"""
+
+import os
+import json
+import mmap
+
+from encoding_detect import guess_single_byte
+from field_extractor import STUDENT_FIELDS, normalize_name
+from fuzzy_search import DEFAULT_MAX_DISTANCE, DEFAULT_SUGGESTIONS, damerau_levenshtein
+from name_index import NameIndex
+from record_reader import WIDE_ENCODINGS, detect_file_encoding, iter_records, scan_records
+from student_store import file_stamp
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+INDEX_SUFFIX = '.idx'
+
+# Сколько лучших совпадений ФИО проверяется при поиске по части ФИО
+NAME_MATCHES = 10
+INDEX_MAGIC = 'STUIDX1'
+HEADER_FORMAT = '{magic} {mtime:020d} {size:020d} {encoding:<16}\n'
+HEADER_SIZE = len(HEADER_FORMAT.format(magic=INDEX_MAGIC, mtime=0, size=0, encoding=''))
+
+# Порядок полей в тексте записи (как в create_user)
+RECORD_LABELS = (
+    ('college', 'Колледж'),
+    ('course', 'Курс'),
+    ('name', 'ФИО'),
+    ('group', 'Команда'),
+    ('id', 'ID'),
+)
+
+# ─────────────────────────────────────────────────────────────
+# ИНДЕКС
+# ─────────────────────────────────────────────────────────────
+
+class RecordIndex:
+    """Индекс записей одного файла: ID и ФИО -> (смещение, длина)."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.index_path = file_path + INDEX_SUFFIX
+        self.encoding = 'utf-8'
+        self.by_id = {}
+        self.by_name = {}
+        self.count = 0
+        self._names = None
+        self.usable = True
+        self._stamp = None
+
+    # ── Загрузка и перестроение ──────────────────────────────
+
+    def _add_entry(self, offset, length, user_id, name_key):
+        self.count += 1
+        if user_id:
+            self.by_id.setdefault(user_id, []).append((offset, length))
+        if name_key and self._names is not None and name_key not in self.by_name:
+            self._names.add(name_key, name_key)
+        if name_key:
+            self.by_name.setdefault(name_key, []).append((offset, length))
+
+    def _read_header(self, file):
+        header = file.read(HEADER_SIZE).decode('ascii', errors='replace').split()
+        if len(header) != 4 or header[0] != INDEX_MAGIC:
+            return None, None
+        return (int(header[1]), int(header[2])), header[3]
+
+    def _write_header(self, file, stamp, encoding):
+        file.seek(0)
+        file.write(HEADER_FORMAT.format(magic=INDEX_MAGIC, mtime=stamp[0],
+                                        size=stamp[1], encoding=encoding).encode('ascii'))
+
+    def load(self):
+        """📂 Загружает индекс; если он устарел - перестраивает."""
+        stamp = file_stamp(self.file_path)
+        if stamp is None:
+            self.by_id, self.by_name, self._stamp = {}, {}, None
+            self.count, self._names = 0, None
+            return self
+        try:
+            with open(self.index_path, 'rb') as file:
+                saved_stamp, encoding = self._read_header(file)
+                if saved_stamp != stamp:
+                    return self.rebuild()
+                self.by_id, self.by_name, self.count = {}, {}, 0
+                self._names = None
+                for line in file:
+                    offset, length, user_id, name_key = json.loads(line)
+                    self._add_entry(offset, length, user_id, name_key)
+        except (OSError, ValueError):
+            return self.rebuild()
+        self.encoding = encoding
+        self.usable = True
+        self._stamp = stamp
+        return self
+
+    def rebuild(self):
+        """🔄 Перестраивает индекс потоковым проходом по файлу."""
+        self.by_id, self.by_name, self.count = {}, {}, 0
+        self._names = None
+        self.encoding = detect_file_encoding(self.file_path)
+        self.usable = self.encoding not in WIDE_ENCODINGS
+        entries = []
+        if self.usable:
+            for offset, length, fields in scan_records(self.file_path):
+                user_id = fields.get('id')
+                name_key = normalize_name(fields['name']) if fields.get('name') else None
+                self._add_entry(offset, length, user_id, name_key)
+                entries.append(json.dumps([offset, length, user_id, name_key],
+                                          ensure_ascii=False))
+        self._stamp = file_stamp(self.file_path)
+        if self.usable:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as file:
+                self._write_header(file, self._stamp, self.encoding)
+                file.write(''.join(entry + '\n' for entry in entries).encode('utf-8'))
+            os.replace(tmp_path, self.index_path)
+        return self
+
+    def is_fresh(self):
+        """Проверяет, что индекс соответствует текущему файлу."""
+        return self._stamp is not None and file_stamp(self.file_path) == self._stamp
+
+    # ── Чтение записей ───────────────────────────────────────
+
+    def fetch(self, offset, length):
+        """📖 Читает одну запись по смещению через mmap и разбирает её поля."""
+        with open(self.file_path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                raw = mapped[offset:offset + length]
+        encoding = 'utf-8' if self.encoding == 'utf-8-sig' else self.encoding
+        try:
+            text = raw.decode(encoding)
+        except UnicodeDecodeError:
+            text = raw.decode(guess_single_byte(raw), errors='replace')
+        return STUDENT_FIELDS.extract(text)
+
+    def find_by_id(self, user_id):
+        """🔢 Возвращает первую полную запись с данным ID или None."""
+        for offset, length in self.by_id.get(user_id.strip(), ()):
+            fields = self.fetch(offset, length)
+            if all(fields.get(key) for key, _label in RECORD_LABELS):
+                return fields
+        return None
+
+    def find_by_name(self, target_name):
+        """
+        👤 Ищет запись по ФИО: сначала точное совпадение нормализованного ФИО,
+        затем лучшие совпадения по началу ФИО, началу слова или подстроке
+        (NameIndex строится по ключам индекса при первом таком поиске).
+        """
+        target = normalize_name(target_name)
+        positions = list(self.by_name.get(target, ()))
+        if not positions:
+            for name_key in self._name_index().search(target, NAME_MATCHES):
+                positions.extend(self.by_name[name_key])
+        for offset, length in positions:
+            fields = self.fetch(offset, length)
+            if all(fields.get(key) for key, _label in RECORD_LABELS):
+                return fields
+        return None
+
+    def suggest_by_name(self, target_name, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_SUGGESTIONS):
+        """
+        🤔 Записи с ФИО, похожим на target_name (опечатки): до limit пар
+        (число отличий, поля записи), ближайшие первыми.
+        """
+        found = []
+        for distance, name_key in self._name_index().suggest(target_name, max_distance, limit):
+            for offset, length in self.by_name[name_key]:
+                fields = self.fetch(offset, length)
+                if all(fields.get(key) for key, _label in RECORD_LABELS):
+                    found.append((distance, fields))
+                    break
+        return found
+
+    def _name_index(self):
+        """NameIndex по ключам ФИО (строится при первом поиске по части ФИО)."""
+        if self._names is None:
+            self._names = NameIndex((name_key, name_key) for name_key in self.by_name)
+        return self._names
+
+    # ── Дописывание ──────────────────────────────────────────
+
+    def append_entry(self, offset, length, user_id, name):
+        """Дописывает запись в индекс и обновляет заголовок на месте."""
+        name_key = normalize_name(name) if name else None
+        self._add_entry(offset, length, user_id, name_key)
+        entry = json.dumps([offset, length, user_id, name_key], ensure_ascii=False)
+        self._stamp = file_stamp(self.file_path)
+        with open(self.index_path, 'r+b') as file:
+            file.seek(0, os.SEEK_END)
+            file.write((entry + '\n').encode('utf-8'))
+            self._write_header(file, self._stamp, self.encoding)
+
+# ─────────────────────────────────────────────────────────────
+# ФУНКЦИИ ДЛЯ ПРОГРАММЫ
+# ─────────────────────────────────────────────────────────────
+
+_indexes = {}
+
+def get_index(file_path):
+    """🗂️ Возвращает актуальный индекс файла (из памяти, с диска или перестроенный)."""
+    index = _indexes.get(file_path)
+    if index is None:
+        index = _indexes[file_path] = RecordIndex(file_path).load()
+    elif not index.is_fresh():
+        index.load()
+    return index
+
+def format_record(fields):
+    """📝 Текст записи в формате README002.md."""
+    return ''.join(f"{label}: {fields[key]}\n" for key, label in RECORD_LABELS)
+
+def _rewrite_with_record(file_path, encoding, text, new_encoding):
+    """Перезаписывает файл в new_encoding с записью text в конце (через временный файл)."""
+    with open(file_path, 'r', encoding=encoding) as file:
+        content = file.read()
+    separator = '\n' if content and not content.endswith('\n') else ''
+    separator += '\n' if content else ''
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding=new_encoding) as file:
+        file.write(content + separator + text)
+    os.replace(tmp_path, file_path)
+
+def append_record(file_path, fields):
+    """
+    ➕ Дописывает запись в конец файла (через пустую строку от предыдущей)
+    и сразу добавляет её в индекс. Если символов записи нет в однобайтовой
+    кодировке файла (cp1251, koi8-r), файл перезаписывается в UTF-8:
+    имена не заменяются на '?'.
+    """
+    index = get_index(file_path) if os.path.exists(file_path) else None
+    encoding = index.encoding if index is not None else 'utf-8'
+    text = format_record(fields)
+
+    if encoding in WIDE_ENCODINGS:
+        # В UTF-16/32 дописывание по байтам невозможно - перезаписываем файл
+        _rewrite_with_record(file_path, encoding, text, encoding)
+        return
+
+    if encoding == 'utf-8-sig':
+        encoding = 'utf-8'
+    try:
+        data = text.encode(encoding)
+    except UnicodeEncodeError:
+        _rewrite_with_record(file_path, encoding, text, 'utf-8')
+        get_index(file_path)
+        return
+    with open(file_path, 'ab+') as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        separator = b''
+        if size:
+            file.seek(max(size - 2, 0))
+            tail = file.read()
+            if not tail.endswith(b'\n'):
+                separator = b'\n\n'
+            elif not tail.endswith(b'\n\n'):
+                separator = b'\n'
+        file.write(separator + data)
+    offset = size + len(separator)
+
+    if index is not None and index.usable:
+        index.append_entry(offset, len(data), fields.get('id'), fields.get('name'))
+    else:
+        get_index(file_path)
+
+def find_record_by_name(file_path, target_name):
+    """👤 Поиск записи по ФИО через индекс (потоковый поиск, если индекс неприменим)."""
+    index = get_index(file_path)
+    if index.usable:
+        return index.find_by_name(target_name)
+    target = normalize_name(target_name)
+    for fields in iter_records(file_path):
+        if fields.get('name') and target in normalize_name(fields['name']):
+            if all(fields.get(key) for key, _label in RECORD_LABELS):
+                return fields
+    return None
+
+def find_record_by_id(file_path, user_id):
+    """🔢 Поиск записи по ID через индекс (потоковый поиск, если индекс неприменим)."""
+    index = get_index(file_path)
+    if index.usable:
+        return index.find_by_id(user_id)
+    for fields in iter_records(file_path):
+        if fields.get('id') == user_id.strip():
+            if all(fields.get(key) for key, _label in RECORD_LABELS):
+                return fields
+    return None
+
+def suggest_records_by_name(file_path, target_name, max_distance=DEFAULT_MAX_DISTANCE,
+                            limit=DEFAULT_SUGGESTIONS):
+    """🤔 Записи с похожим ФИО через индекс (перебор всех записей, если индекс неприменим)."""
+    index = get_index(file_path)
+    if index.usable:
+        return index.suggest_by_name(target_name, max_distance, limit)
+    target = normalize_name(target_name)
+    found = []
+    for fields in iter_records(file_path):
+        if fields.get('name') and all(fields.get(key) for key, _label in RECORD_LABELS):
+            distance = damerau_levenshtein(target, normalize_name(fields['name']), max_distance)
+            if distance <= max_distance:
+                found.append((distance, fields))
+    found.sort(key=lambda item: item[0])
+    return found[:limit]
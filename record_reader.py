@@ -0,0 +1,159 @@
+"""
+📚 ПОТОКОВОЕ ЧТЕНИЕ ЗАПИСЕЙ
+===========================================================
+Файлы вида README002.md содержат много записей подряд:
+Колледж / Курс / ФИО / Команда / ID. Модуль читает такой файл
+блоками фиксированного размера и выдаёт записи по одной, поэтому
+память не растёт с размером файла, а поиск может остановиться
+на первом совпадении.
+"""
+
+from encoding_detect import SAMPLE_SIZE, detect_encoding, guess_single_byte
+from field_extractor import STUDENT_FIELDS
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Размер блока чтения файла
+CHUNK_SIZE = 256 * 1024
+
+# Многобайтовые кодировки, в которых файл нельзя резать по байту b'\n'
+WIDE_ENCODINGS = ('utf-16', 'utf-32')
+
+# ─────────────────────────────────────────────────────────────
+# ЧТЕНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def detect_file_encoding(file_path, sample_size=SAMPLE_SIZE):
+    """🔤 Определяет кодировку файла по его началу, не читая файл целиком."""
+    with open(file_path, 'rb') as file:
+        return detect_encoding(file.read(sample_size), sample_size)
+
+def _iter_raw_lines(file, chunk_size):
+    """
+    Режет бинарный файл на строки, читая его блоками chunk_size.
+    Выдаёт (строка в байтах, полная длина строки, обрезана ли строка):
+    от строки длиннее блока остаются первые chunk_size байт, остальное
+    пропускается до перевода строки, поэтому память не растёт.
+    """
+    pending = b''
+    skipped = 0
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        if skipped:
+            # Дочитываем хвост слишком длинной строки, не сохраняя его
+            end = block.find(b'\n')
+            if end == -1:
+                skipped += len(block)
+                continue
+            yield pending, len(pending) + skipped + end + 1, True
+            pending, skipped = b'', 0
+            block = block[end + 1:]
+        pending += block
+        start = 0
+        while True:
+            end = pending.find(b'\n', start)
+            if end == -1:
+                break
+            yield pending[start:end + 1], end + 1 - start, False
+            start = end + 1
+        pending = pending[start:]
+        if len(pending) > chunk_size:
+            skipped = len(pending) - chunk_size
+            pending = pending[:chunk_size]
+    if pending or skipped:
+        yield pending, len(pending) + skipped, bool(skipped)
+
+def _iter_text_lines(file, chunk_size):
+    """То же для текстового файла: строки длиннее chunk_size символов обрезаются."""
+    while True:
+        line = file.readline(chunk_size)
+        if not line:
+            break
+        if not line.endswith('\n'):
+            # Пропускаем остаток длинной строки
+            while True:
+                rest = file.readline(chunk_size)
+                if not rest or rest.endswith('\n'):
+                    break
+        yield line
+
+def _iter_lines(file_path, encoding, chunk_size):
+    """
+    Перебирает (смещение, длина в байтах, строка) потоково, блоками chunk_size.
+    Строки длиннее блока обрезаются до chunk_size, смещения остаются точными.
+    """
+    if encoding in WIDE_ENCODINGS:
+        # Смещения в байтах для UTF-16/32 не вычисляются
+        with open(file_path, 'r', encoding=encoding) as file:
+            for line in _iter_text_lines(file, chunk_size):
+                yield None, None, line
+        return
+    offset = 0
+    with open(file_path, 'rb', buffering=0) as file:
+        if encoding == 'utf-8-sig':
+            offset = len(file.read(3))
+            encoding = 'utf-8'
+        for raw, size, truncated in _iter_raw_lines(file, chunk_size):
+            try:
+                line = raw.decode(encoding)
+            except UnicodeDecodeError:
+                if truncated:
+                    # Блок обрезал многобайтовый символ - кодировка ни при чём
+                    line = raw.decode(encoding, errors='ignore')
+                else:
+                    # Начало файла было ASCII, а дальше другая кодировка
+                    encoding = guess_single_byte(raw)
+                    line = raw.decode(encoding, errors='replace')
+            yield offset, size, line
+            offset += size
+
+def scan_records(file_path, chunk_size=CHUNK_SIZE):
+    """
+    📚 Потоково разбивает файл на записи.
+    Выдаёт (смещение, длина в байтах, поля) для каждой записи.
+    Запись заканчивается пустой строкой или повтором уже встреченного поля.
+    """
+    encoding = detect_file_encoding(file_path)
+    lines = []
+    seen = set()
+    start = end = None
+
+    def flush():
+        fields = STUDENT_FIELDS.extract(''.join(lines))
+        length = end - start if start is not None else None
+        return start, length, fields
+
+    for offset, size, line in _iter_lines(file_path, encoding, chunk_size):
+        if not line.strip():
+            if lines:
+                record = flush()
+                if record[2]:
+                    yield record
+                lines, seen, start = [], set(), None
+            continue
+        field = STUDENT_FIELDS.line_field(line)
+        if field is not None and field in seen:
+            record = flush()
+            if record[2]:
+                yield record
+            lines, seen, start = [], set(), None
+        if start is None:
+            start = offset
+        if field is not None:
+            seen.add(field)
+        lines.append(line.rstrip('\r\n') + '\n')
+        if offset is not None:
+            end = offset + size
+    if lines:
+        record = flush()
+        if record[2]:
+            yield record
+
+def iter_records(file_path, chunk_size=CHUNK_SIZE):
+    """📚 Выдаёт записи файла по одной в виде словарей {поле: значение}."""
+    for _offset, _length, fields in scan_records(file_path, chunk_size):
+        yield fields
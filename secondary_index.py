@@ -0,0 +1,169 @@
+"""
+🗃️ ВТОРИЧНЫЕ ИНДЕКСЫ И ВЫБОРКИ
+===========================================================
+Выборки «все студенты группы X», «курс 2 колледжа Y» и
+«регистрации между двумя датами» без перебора всей базы.
+
+- Хеш-индексы по колледжу, курсу и группе: значение -> номера
+  записей (array), номера идут в порядке добавления.
+- Отсортированный индекс по дате регистрации: пары
+  (секунды, номер записи) и bisect для диапазона дат.
+
+Выборка начинается с самого короткого списка кандидатов
+(значение поля или диапазон дат), остальные условия проверяются
+на каждом кандидате; записи выдаются по одной (генератор),
+без сборки всего результата в память.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+
+from student_record import date_to_epoch, epoch_to_date
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Поля с хеш-индексом (условия на равенство)
+INDEXED_FIELDS = ('college', 'course', 'group')
+
+# Новые даты вставляются в отсортированный список по одной,
+# если их немного, иначе список пересортировывается целиком
+INSORT_LIMIT = 1000
+
+DAY_SECONDS = 24 * 60 * 60
+
+# ─────────────────────────────────────────────────────────────
+# ДАТЫ
+# ─────────────────────────────────────────────────────────────
+
+def date_key(value):
+    """Дата регистрации -> секунды (None, если дата не распознана)."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and len(value) == 10:
+        value += ' 00:00:00'
+    value = date_to_epoch(value)
+    return value if isinstance(value, int) else None
+
+def parse_date_range(date_from=None, date_to=None):
+    """
+    📅 Границы выборки 'ГГГГ-ММ-ДД' или 'ГГГГ-ММ-ДД ЧЧ:ММ:СС' (обе включительно,
+    дата без времени - весь день) -> полуинтервал [low, high) в секундах.
+    Отсутствующая граница - None.
+    """
+    bounds = []
+    for text, is_end in ((date_from, False), (date_to, True)):
+        if text is None or text == '':
+            bounds.append(None)
+            continue
+        text = str(text).strip()
+        seconds = date_key(text)
+        if seconds is None:
+            raise ValueError(f"неверная дата: {text!r} (ожидается ГГГГ-ММ-ДД [ЧЧ:ММ:СС])")
+        if is_end:
+            seconds += DAY_SECONDS if len(text) == 10 else 1
+        bounds.append(seconds)
+    return tuple(bounds)
+
+def date_range_strings(low, high):
+    """Границы [low, high) в виде строк даты (как в базе)."""
+    return (epoch_to_date(low) if low is not None else None,
+            epoch_to_date(high) if high is not None else None)
+
+# ─────────────────────────────────────────────────────────────
+# ИНДЕКС
+# ─────────────────────────────────────────────────────────────
+
+class SecondaryIndex:
+    """Вторичные индексы над списком студентов, который только пополняется."""
+
+    def __init__(self, students=()):
+        self._students = []
+        self._by_field = {field: {} for field in INDEXED_FIELDS}
+        self._dates = []         # отсортированные (секунды, номер записи)
+        self._unsorted = []      # даты, ещё не вставленные в _dates
+        self.add_many(students)
+
+    def __len__(self):
+        return len(self._students)
+
+    def add(self, student):
+        """➕ Добавляет студента в индексы."""
+        position = len(self._students)
+        self._students.append(student)
+        for field in INDEXED_FIELDS:
+            value = getattr(student, field)
+            positions = self._by_field[field].get(value)
+            if positions is None:
+                positions = self._by_field[field][value] = array('I')
+            positions.append(position)
+        seconds = date_key(student.registration_date)
+        if seconds is not None:
+            self._unsorted.append((seconds, position))
+
+    def add_many(self, students):
+        for student in students:
+            self.add(student)
+
+    def _sort_pending(self):
+        if not self._unsorted:
+            return
+        if len(self._unsorted) <= INSORT_LIMIT:
+            for item in self._unsorted:
+                insort(self._dates, item)
+        else:
+            self._dates.extend(self._unsorted)
+            self._dates.sort()
+        self._unsorted = []
+
+    def query(self, college=None, course=None, group=None, date_from=None, date_to=None):
+        """
+        🗃️ Студенты, подходящие под все заданные условия (None - без условия).
+        Порядок - порядок добавления, а если выборка идёт по диапазону
+        дат (он короче списков по полям) - порядок дат регистрации.
+        Неверная дата - ValueError сразу, а не при первой записи.
+        """
+        low, high = parse_date_range(date_from, date_to)
+        filters = [(field, value) for field, value in
+                   (('college', college), ('course', course), ('group', group))
+                   if value is not None]
+
+        candidates, driver = None, None
+        for field, value in filters:
+            positions = self._by_field[field].get(value)
+            if positions is None:
+                return iter(())
+            if candidates is None or len(positions) < len(candidates):
+                candidates, driver = positions, field
+        check_dates = low is not None or high is not None
+        if check_dates:
+            self._sort_pending()
+            start = bisect_left(self._dates, (low,)) if low is not None else 0
+            end = bisect_left(self._dates, (high,)) if high is not None else len(self._dates)
+            if candidates is None or end - start < len(candidates):
+                candidates = (self._dates[index][1] for index in range(start, end))
+                check_dates, driver = False, None
+        if candidates is None:
+            candidates = range(len(self._students))
+        # Условие, по которому взяты кандидаты, уже выполнено
+        filters = [(field, value) for field, value in filters if field != driver]
+        return self._matches(candidates, filters, low, high, check_dates)
+
+    def _matches(self, candidates, filters, low, high, check_dates):
+        students = self._students
+        for position in candidates:
+            student = students[position]
+            matched = True
+            for field, value in filters:
+                if getattr(student, field) != value:
+                    matched = False
+                    break
+            if not matched:
+                continue
+            if check_dates:
+                seconds = date_key(student.registration_date)
+                if (seconds is None or (low is not None and seconds < low) or
+                        (high is not None and seconds >= high)):
+                    continue
+            yield student
@@ -0,0 +1,425 @@
+"""
+🧩 ШАРДИРОВАННОЕ ХРАНИЛИЩЕ СТУДЕНТОВ
+===========================================================
+База делится на N файлов-шардов в одном каталоге
+(students.shards/shard-000.json ...). Каждый шард - обычное
+JSON хранилище StudentStore со своими индексом, журналом,
+статистикой и блокировкой.
+
+Студент попадает в шард по устойчивому хэшу (ФИО, группа, ID)
+или, по выбору, по хэшу колледжа. Поиск и регистрация по ключу
+читают и пишут только один шард (при разбиении по колледжу
+поиск по ключу проверяет все шарды, зато выборка по колледжу
+читает один). Статистика и выборки по полям обходят шарды
+параллельно в пуле процессов и объединяют результаты.
+
+Каталог описывается файлом shards.json (число шардов и способ
+разбиения); изменить их можно командой reshard (Tarakan.py).
+Создание каталога и переразбиение идут под блокировкой всей базы
+('<каталог>.lock' рядом с каталогом).
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from db_stats import StudentStats
+from file_lock import FileLock
+from secondary_index import parse_date_range
+from student_record import Student, as_student
+from student_store import CorruptDatabaseError, StorageBackend, StudentStore, file_stamp, record_key
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+META_FILE = 'shards.json'
+LAYOUT_VERSION = 1
+
+DEFAULT_SHARDS = 16
+
+# Способы разбиения: по ключу студента или по колледжу
+PARTITIONS = ('key', 'college')
+DEFAULT_PARTITION = 'key'
+
+def shard_file(index):
+    return f'shard-{index:03d}.json'
+
+def stable_hash(*values):
+    """Хэш, одинаковый во всех процессах и запусках (в отличие от hash())."""
+    data = '\x1f'.join('' if value is None else str(value) for value in values)
+    return int.from_bytes(hashlib.blake2b(data.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def read_layout(path):
+    """📐 Читает shards.json: (число шардов, способ разбиения) или None, если каталога нет."""
+    meta_path = os.path.join(path, META_FILE)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return int(meta['shards']), meta['partition']
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        raise CorruptDatabaseError(f"файл {meta_path} повреждён: {e}") from e
+
+def write_layout(path, shards, partition):
+    """Атомарно записывает shards.json (временный файл - свой у каждого процесса)."""
+    meta = {'version': LAYOUT_VERSION, 'shards': shards, 'partition': partition}
+    tmp_path = os.path.join(path, f'{META_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(path, META_FILE))
+
+# ─────────────────────────────────────────────────────────────
+# ОБХОД ШАРДОВ В ДОЧЕРНИХ ПРОЦЕССАХ
+# ─────────────────────────────────────────────────────────────
+
+# Шарды, открытые в дочернем процессе: загружаются один раз,
+# дальше перечитываются только при изменении файлов
+_worker_stores = {}
+
+def _worker_store(path, journal):
+    store = _worker_stores.get(path)
+    if store is None:
+        store = _worker_stores[path] = StudentStore(path, journal=journal)
+    return store
+
+def _student_row(student):
+    # Дата остаётся числом: Student(*row) не разбирает её заново
+    return (student.college, student.course, student.name, student.group, student.id,
+            student.registration_date, student.status, student.extra)
+
+def _shard_stats(path, journal):
+    return _worker_store(path, journal).stats().to_dict()
+
+def _shard_query(path, journal, filters):
+    return [_student_row(student) for student in _worker_store(path, journal).query(*filters)]
+
+class ShardPool:
+    """
+    Процессы для обхода шардов. Шард i всегда обрабатывает процесс
+    i % workers, поэтому каждый процесс держит в памяти только свои
+    шарды и не загружает их заново от запроса к запросу.
+    """
+
+    def __init__(self, workers):
+        self._executors = [ProcessPoolExecutor(max_workers=1) for _ in range(workers)]
+
+    def map(self, func, paths, *args):
+        count = len(self._executors)
+        futures = [self._executors[index % count].submit(func, path, *args)
+                   for index, path in enumerate(paths)]
+        return [future.result() for future in futures]
+
+    def close(self):
+        for executor in self._executors:
+            executor.shutdown()
+
+# ─────────────────────────────────────────────────────────────
+# ХРАНИЛИЩЕ
+# ─────────────────────────────────────────────────────────────
+
+class ShardedStore(StorageBackend):
+    """
+    Хранилище из N шардов StudentStore в каталоге path.
+    workers - число процессов для обхода шардов (по умолчанию - число
+    ядер, но не больше числа шардов); при 1 шарды обходятся в текущем процессе.
+
+    Запись держит блокировку всей базы: общую, а при разбиении по колледжу
+    (проверка дубликата по всем шардам и вставка в один) - исключительную;
+    reshard держит исключительную до конца. После reshard другим
+    процессом хранилище само переходит на новую раскладку.
+    """
+
+    backend_name = 'sharded'
+
+    def __init__(self, path, journal=False, workers=None,
+                 shards=DEFAULT_SHARDS, partition=DEFAULT_PARTITION):
+        self.path = path
+        self.journal = journal
+        # Блокировка всей базы: файл рядом с каталогом, чтобы пережить reshard
+        self._lock = FileLock(os.path.normpath(path))
+        layout = read_layout(path)
+        if layout is None:
+            with self._lock.exclusive():
+                # Другой процесс мог создать базу, пока мы ждали блокировку
+                layout = read_layout(path)
+                if layout is None:
+                    # Новая база: каталог создаётся с параметрами по умолчанию
+                    os.makedirs(path, exist_ok=True)
+                    write_layout(path, shards, partition)
+                    layout = (shards, partition)
+        self._meta_path = os.path.join(path, META_FILE)
+        self._layout_stamp = file_stamp(self._meta_path)
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._open_shards(layout)
+
+    def _open_shards(self, layout):
+        self.shard_count, self.partition = layout
+        if self.partition not in PARTITIONS:
+            raise CorruptDatabaseError(f"неизвестный способ разбиения: {self.partition}")
+        self.shard_paths = [os.path.join(self.path, shard_file(index))
+                            for index in range(self.shard_count)]
+        self._shards = [StudentStore(shard_path, journal=self.journal)
+                        for shard_path in self.shard_paths]
+        self.workers = max(1, min(self._workers, self.shard_count))
+
+    def _sync_layout(self):
+        """
+        Переоткрывает шарды, если shards.json изменился: reshard подменил
+        каталог (открытые журналы шардов остались бы в старом).
+        """
+        if file_stamp(self._meta_path) == self._layout_stamp:
+            return
+        # Ждём, пока reshard закончит подмену каталога
+        with self._lock.shared():
+            stamp = file_stamp(self._meta_path)
+            layout = read_layout(self.path)
+            if layout is not None and stamp != self._layout_stamp:
+                self._close_shards()
+                self._open_shards(layout)
+                self._layout_stamp = stamp
+
+    @contextmanager
+    def _writing(self):
+        """Блокировка базы для записи (см. описание класса) при актуальной раскладке."""
+        while True:
+            self._sync_layout()
+            partition = self.partition
+            with (self._lock.exclusive() if partition == 'college' else self._lock.shared()):
+                # reshard мог сменить раскладку, пока мы ждали блокировку
+                self._sync_layout()
+                if self.partition == partition:
+                    yield
+                    return
+
+    # ── Выбор шарда ──────────────────────────────────────────
+
+    def shard_index(self, student):
+        """Номер шарда для записи студента."""
+        if self.partition == 'college':
+            return stable_hash(student['college']) % self.shard_count
+        return stable_hash(*record_key(student)) % self.shard_count
+
+    def _key_indexes(self, name, group, id):
+        """Номера шардов, в которых может быть студент с этим ключом."""
+        if self.partition == 'college':
+            return range(self.shard_count)
+        return (stable_hash(name, group, id) % self.shard_count,)
+
+    def _key_shards(self, name, group, id):
+        """Шарды, в которых может быть студент с этим ключом."""
+        return [self._shards[index] for index in self._key_indexes(name, group, id)]
+
+    def _fan_out(self, func, local, *args):
+        """
+        Выполняет операцию на всех шардах: в пуле процессов func(путь, journal, *args),
+        в текущем процессе - local(шард, *args). Возвращает список результатов по шардам.
+        """
+        if self.workers <= 1:
+            return [local(shard, *args) for shard in self._shards]
+        if self._pool is None:
+            self._pool = ShardPool(self.workers)
+        return self._pool.map(func, self.shard_paths, self.journal, *args)
+
+    # ── Чтение ───────────────────────────────────────────────
+
+    def refresh(self):
+        self._sync_layout()
+        for shard in self._shards:
+            shard.refresh()
+
+    def find(self, name, group, id):
+        """🔍 Ищет студента в его шарде."""
+        self._sync_layout()
+        for shard in self._key_shards(name, group, id):
+            student = shard.find(name, group, id)
+            if student is not None:
+                return student
+        return None
+
+    def lookup(self, name, group, id):
+        for shard in self._key_shards(name, group, id):
+            student = shard.lookup(name, group, id)
+            if student is not None:
+                return student
+        return None
+
+    def all(self):
+        """📋 Все студенты (шард за шардом)."""
+        self._sync_layout()
+        records = []
+        for shard in self._shards:
+            records.extend(shard.all())
+        return records
+
+    def __len__(self):
+        self._sync_layout()
+        return sum(len(shard) for shard in self._shards)
+
+    def students_named(self, name):
+        """👥 Студенты с таким ФИО: у каждого шарда свой индекс ФИО."""
+        self._sync_layout()
+        return [student for shard in self._shards for student in shard.students_named(name)]
+
+    def query(self, college=None, course=None, group=None, date_from=None, date_to=None):
+        """
+        🗃️ Выборка обходит шарды параллельно; порядок - шард за шардом.
+        При разбиении по колледжу выборка с колледжем читает один шард.
+        """
+        # Неверная дата - ошибка сразу, до рассылки по шардам
+        parse_date_range(date_from, date_to)
+        self._sync_layout()
+        filters = (college, course, group, date_from, date_to)
+        if self.partition == 'college' and college is not None:
+            shard = self._shards[stable_hash(college) % self.shard_count]
+            return shard.query(*filters)
+        results = self._fan_out(_shard_query, _local_query, filters)
+        return (Student(*row) if isinstance(row, tuple) else row
+                for rows in results for row in rows)
+
+    def stats(self):
+        """📊 Статистика: шарды считаются параллельно, результаты складываются."""
+        self._sync_layout()
+        results = self._fan_out(_shard_stats, _local_stats)
+        return StudentStats.merge([StudentStats.from_dict(data) for data in results])
+
+    # ── Запись ───────────────────────────────────────────────
+
+    def _split(self, students):
+        """Раскладывает записи по шардам: {номер шарда: [записи]}."""
+        parts = {}
+        for student in students:
+            parts.setdefault(self.shard_index(student), []).append(student)
+        return parts
+
+    def add(self, student):
+        """➕ Добавляет студента в его шард; False, если такой уже есть."""
+        student = as_student(student)
+        with self._writing():
+            if self.partition == 'college' and self.find(*record_key(student)) is not None:
+                return False
+            return self._shards[self.shard_index(student)].add(student)
+
+    def add_many(self, students):
+        """➕ Добавляет пачку: каждый шард получает свою часть одной записью."""
+        students = [as_student(student) for student in students]
+        with self._writing():
+            if self.partition == 'college':
+                # Ключ уникален во всей базе, а шард выбирается по колледжу
+                students = [student for student in students
+                            if self.find(*record_key(student)) is None]
+            added = []
+            for index, part in self._split(students).items():
+                added.extend(self._shards[index].add_many(part))
+            return added
+
+    def replace_many(self, replacements):
+        """
+        🔁 Замена по ключу в шардах, где лежат записи. При разбиении по колледжу
+        запись с другим колледжем переезжает в свой шард.
+        """
+        with self._writing():
+            parts = {}
+            moved = []
+            for key, student in replacements.items():
+                for index in self._key_indexes(*key):
+                    if self._shards[index].find(*key) is None:
+                        continue
+                    if student is not None:
+                        student = as_student(student)
+                        target = self.shard_index(student)
+                        if target != index:
+                            moved.append(student)
+                            student = None
+                    parts.setdefault(index, {})[key] = student
+                    break
+            changed = sum(self._shards[index].replace_many(part) for index, part in parts.items())
+            for index, part in self._split(moved).items():
+                self._shards[index].add_many(part)
+            return changed
+
+    def save(self, records):
+        """💾 Полностью перезаписывает все шарды."""
+        records = [as_student(student) for student in records]
+        with self._lock.exclusive():
+            self._sync_layout()
+            parts = self._split(records)
+            for index, shard in enumerate(self._shards):
+                shard.save(parts.get(index, []))
+
+    def compact(self):
+        with self._lock.shared():
+            self._sync_layout()
+            return sum(shard.compact() for shard in self._shards)
+
+    def _close_shards(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        for shard in self._shards:
+            shard.close()
+
+    def close(self):
+        self._close_shards()
+
+def _local_query(shard, filters):
+    return shard.query(*filters)
+
+def _local_stats(shard):
+    return shard.stats().to_dict()
+
+# ─────────────────────────────────────────────────────────────
+# ПЕРЕРАЗБИЕНИЕ
+# ─────────────────────────────────────────────────────────────
+
+def reshard(source, target_path, shards=DEFAULT_SHARDS, partition=DEFAULT_PARTITION):
+    """
+    🔀 Переносит всех студентов из хранилища source в шардированную базу
+    target_path с новым числом шардов и способом разбиения. Новая база
+    собирается рядом и подменяет старую (если она была) только целиком;
+    всё это время база заблокирована, и запись в старые шарды ждёт.
+    Возвращает список размеров шардов.
+    """
+    if partition not in PARTITIONS:
+        raise ValueError(f"Неизвестный способ разбиения: {partition}")
+    if shards < 1:
+        raise ValueError("Число шардов должно быть положительным")
+    target_path = os.path.normpath(target_path)
+    if os.path.exists(target_path) and not os.path.isdir(target_path):
+        raise ValueError(f"{target_path} - не каталог шардированной базы")
+    if isinstance(source, ShardedStore) and os.path.normpath(source.path) == target_path:
+        # Та же база: её блокировка уже может быть у нас (она повторно входимая)
+        lock = source._lock
+    else:
+        lock = FileLock(target_path)
+    with lock.exclusive():
+        building = target_path + '.resharding'
+        shutil.rmtree(building, ignore_errors=True)
+        os.makedirs(building)
+        write_layout(building, shards, partition)
+
+        layout = ShardedStore(building, workers=1)
+        parts = layout._split(source.all())
+        sizes = []
+        for index, path in enumerate(layout.shard_paths):
+            part = parts.get(index, [])
+            store = StudentStore(path)
+            store.save(part)
+            store.close()
+            sizes.append(len(part))
+        layout.close()
+
+        if os.path.exists(target_path):
+            retired = target_path + '.old'
+            shutil.rmtree(retired, ignore_errors=True)
+            os.rename(target_path, retired)
+            os.rename(building, target_path)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.rename(building, target_path)
+    return sizes
@@ -0,0 +1,328 @@
+"""
+🗄️ ХРАНИЛИЩЕ СТУДЕНТОВ В SQLITE
+===========================================================
+Реализация интерфейса StorageBackend на стандартном модуле
+sqlite3: режим WAL, уникальный индекс по (ФИО, группа, ID)
+и параметризованные запросы. Поиск и проверка дубликатов
+выполняются внутри базы данных, без загрузки всех записей.
+
+Чтение идёт через отдельное соединение: в режиме WAL читатели
+не ждут окончания транзакций записи.
+"""
+
+import json
+import sqlite3
+import threading
+
+from db_stats import COUNTED_FIELDS, RECENT_FIELDS, RECENT_LIMIT, StudentStats
+from name_index import NameIndex
+from secondary_index import date_range_strings, parse_date_range
+from student_record import Student, as_student
+from student_store import StorageBackend, open_database_file
+
+# ─────────────────────────────────────────────────────────────
+# СХЕМА И ЗАПРОСЫ
+# ─────────────────────────────────────────────────────────────
+
+COLUMNS = ('college', 'course', 'name', 'group', 'id', 'registration_date', 'status')
+
+def _quote_columns(columns):
+    return ', '.join(f'"{column}"' for column in columns)
+
+_COLUMN_LIST = _quote_columns(COLUMNS)
+_PLACEHOLDERS = ', '.join('?' for _column in COLUMNS)
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS students (
+    "college" TEXT,
+    "course" TEXT,
+    "name" TEXT,
+    "group" TEXT,
+    "id" TEXT,
+    "registration_date" TEXT,
+    "status" TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS students_key ON students ("name", "group", "id");
+CREATE INDEX IF NOT EXISTS students_college_course ON students ("college", "course");
+CREATE INDEX IF NOT EXISTS students_group ON students ("group");
+CREATE INDEX IF NOT EXISTS students_registered ON students ("registration_date");
+'''
+
+# Счётчики статистики ведутся триггерами в той же транзакции, что и вставка.
+# Строка с полем 'total' хранит общее число студентов.
+STATS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS student_counts (
+    "field" TEXT NOT NULL,
+    "value" TEXT NOT NULL,
+    "count" INTEGER NOT NULL,
+    PRIMARY KEY ("field", "value")
+) WITHOUT ROWID;
+'''
+
+_COUNT_EXPRESSIONS = [('total', "''")] + [
+    (field, f'COALESCE({{row}}."{field}", \'\')') for field in COUNTED_FIELDS
+]
+
+for _field, _value in _COUNT_EXPRESSIONS:
+    STATS_SCHEMA += f'''
+CREATE TRIGGER IF NOT EXISTS students_count_{_field}_insert AFTER INSERT ON students BEGIN
+    INSERT INTO student_counts VALUES ('{_field}', {_value.format(row='NEW')}, 1)
+        ON CONFLICT ("field", "value") DO UPDATE SET "count" = "count" + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS students_count_{_field}_delete AFTER DELETE ON students BEGIN
+    UPDATE student_counts SET "count" = "count" - 1
+        WHERE "field" = '{_field}' AND "value" = {_value.format(row='OLD')};
+END;
+'''
+
+STATS_BACKFILL = '''
+DELETE FROM student_counts;
+INSERT INTO student_counts SELECT 'total', '', COUNT(*) FROM students;
+''' + ''.join(f'''
+INSERT INTO student_counts
+    SELECT '{field}', COALESCE("{field}", ''), COUNT(*) FROM students GROUP BY 2;
+''' for field in COUNTED_FIELDS)
+
+# Версия схемы (PRAGMA user_version): 1 - счётчики статистики
+SCHEMA_VERSION = 1
+
+# Запросы - константы: sqlite3 кэширует подготовленные выражения по тексту
+SQL_FIND = f'SELECT {_COLUMN_LIST} FROM students WHERE "name" = ? AND "group" = ? AND "id" = ?'
+SQL_INSERT = f'INSERT OR IGNORE INTO students ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS})'
+SQL_ALL = f'SELECT {_COLUMN_LIST} FROM students ORDER BY rowid'
+SQL_COUNT = 'SELECT COUNT(*) FROM students'
+SQL_CLEAR = 'DELETE FROM students'
+SQL_DELETE = 'DELETE FROM students WHERE "name" = ? AND "group" = ? AND "id" = ?'
+SQL_COUNTS = 'SELECT "field", "value", "count" FROM student_counts WHERE "count" > 0'
+SQL_SINCE = f'SELECT rowid, {_COLUMN_LIST} FROM students WHERE rowid > ? ORDER BY rowid'
+SQL_QUERY = f'SELECT {_COLUMN_LIST} FROM students WHERE {{where}} ORDER BY {{order}}'
+
+# Сколько строк выборки читается за одно обращение к базе
+QUERY_FETCH = 1000
+
+SQL_RECENT = f'SELECT {_quote_columns(RECENT_FIELDS)} FROM students ORDER BY rowid DESC LIMIT ?'
+
+# ─────────────────────────────────────────────────────────────
+# ХРАНИЛИЩЕ
+# ─────────────────────────────────────────────────────────────
+
+def _row_to_student(row):
+    return Student(*row)
+
+def _student_to_row(student):
+    return tuple(student[column] for column in COLUMNS)
+
+class SqliteStudentStore(StorageBackend):
+    """Хранилище студентов в файле SQLite."""
+
+    backend_name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._migrate_schema()
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                       isolation_level=None)
+        # Индекс ФИО в памяти: последний учтённый rowid и число записей
+        self._names = None
+        self._names_rowid = 0
+        self._names_count = 0
+
+    def _migrate_schema(self):
+        """Создаёт таблицу счётчиков и заполняет её для старых баз."""
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        try:
+            self._conn.executescript(
+                'BEGIN IMMEDIATE;' + STATS_SCHEMA + STATS_BACKFILL +
+                f'PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;')
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute('ROLLBACK')
+            raise
+
+    def find(self, name, group, id):
+        """🔍 Ищет студента по уникальному индексу (name, group, id)."""
+        with self._read_lock:
+            row = self._reader.execute(SQL_FIND, (name, group, id)).fetchone()
+        return _row_to_student(row) if row else None
+
+    def all(self):
+        """📋 Возвращает список всех студентов в порядке добавления."""
+        with self._read_lock:
+            return [_row_to_student(row) for row in self._reader.execute(SQL_ALL)]
+
+    def __len__(self):
+        with self._read_lock:
+            return self._reader.execute(SQL_COUNT).fetchone()[0]
+
+    def _name_index(self):
+        """
+        Индекс ФИО (NameIndex) в памяти дочитывает строки с rowid больше
+        последнего учтённого, а если записи удалялись (число строк
+        не сходится) - строится заново.
+        """
+        with self._read_lock:
+            self._reader.execute('BEGIN')
+            try:
+                rows = self._reader.execute(SQL_SINCE, (self._names_rowid,)).fetchall()
+                count = self._reader.execute(SQL_COUNT).fetchone()[0]
+                if self._names is None or self._names_count + len(rows) != count:
+                    self._names = NameIndex()
+                    rows = self._reader.execute(SQL_SINCE, (0,)).fetchall()
+            finally:
+                self._reader.execute('COMMIT')
+            for row in rows:
+                student = _row_to_student(row[1:])
+                self._names.add(student.name, student)
+            if rows:
+                self._names_rowid = rows[-1][0]
+            self._names_count = count
+            return self._names
+
+    def query(self, college=None, course=None, group=None, date_from=None, date_to=None):
+        """
+        🗃️ Выборка по индексам базы (колледж и курс, группа, дата
+        регистрации). Строки читаются порциями по QUERY_FETCH: с диапазоном
+        дат - в порядке дат, без него - в порядке добавления.
+        """
+        low, high = date_range_strings(*parse_date_range(date_from, date_to))
+        conditions, params = [], []
+        for column, operator, value in (('college', '=', college), ('course', '=', course),
+                                        ('group', '=', group),
+                                        ('registration_date', '>=', low),
+                                        ('registration_date', '<', high)):
+            if value is not None:
+                conditions.append(f'"{column}" {operator} ?')
+                params.append(value)
+        order = '"registration_date", rowid' if low is not None or high is not None else 'rowid'
+        sql = SQL_QUERY.format(where=' AND '.join(conditions) or '1', order=order)
+        return self._fetch_rows(sql, params)
+
+    def _fetch_rows(self, sql, params):
+        with self._read_lock:
+            cursor = self._reader.execute(sql, params)
+        while True:
+            with self._read_lock:
+                rows = cursor.fetchmany(QUERY_FETCH)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_student(row)
+
+    def save(self, records):
+        """💾 Заменяет содержимое таблицы одной транзакцией."""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(SQL_CLEAR)
+                self._conn.executemany(SQL_INSERT, (_student_to_row(as_student(student))
+                                                    for student in records))
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def add(self, student):
+        """➕ Добавляет студента; дубликат отсекает уникальный индекс."""
+        with self._lock:
+            cursor = self._conn.execute(SQL_INSERT, _student_to_row(as_student(student)))
+        return cursor.rowcount == 1
+
+    def add_many(self, students):
+        """➕ Добавляет пачку студентов одной транзакцией."""
+        added = []
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for student in map(as_student, students):
+                    cursor = self._conn.execute(SQL_INSERT, _student_to_row(student))
+                    if cursor.rowcount == 1:
+                        added.append(student)
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+        return added
+
+    def replace_many(self, replacements):
+        """
+        🔁 Замена и удаление по ключу одной транзакцией. Счётчики ведут
+        триггеры вставки и удаления, поэтому запись удаляется и вставляется
+        заново (в порядке добавления она становится последней).
+        """
+        changed = 0
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for key, student in replacements.items():
+                    if self._conn.execute(SQL_DELETE, key).rowcount:
+                        changed += 1
+                        if student is not None:
+                            self._conn.execute(SQL_INSERT, _student_to_row(as_student(student)))
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+        return changed
+
+    def stats(self):
+        """📊 Статистика из таблицы счётчиков - без чтения всех записей."""
+        stats = StudentStats()
+        with self._read_lock:
+            # Оба запроса - в одной транзакции чтения, чтобы счётчики
+            # и последние записи относились к одному состоянию базы
+            self._reader.execute('BEGIN')
+            try:
+                counts = self._reader.execute(SQL_COUNTS).fetchall()
+                recent = self._reader.execute(SQL_RECENT, (RECENT_LIMIT,)).fetchall()
+            finally:
+                self._reader.execute('COMMIT')
+        for field, value, count in counts:
+            if field == 'total':
+                stats.total = count
+            else:
+                stats.counts[field][value] = count
+        for row in reversed(recent):
+            stats.recent.append(dict(zip(RECENT_FIELDS, row)))
+        return stats
+
+    def compact(self):
+        """🗜️ Переносит журнал WAL в основной файл базы."""
+        with self._lock:
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return 0
+
+    def close(self):
+        """🔒 Закрывает соединения с базой."""
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
+
+# ─────────────────────────────────────────────────────────────
+# МИГРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+def migrate_json_to_sqlite(json_path, db_path, batch_size=10000):
+    """
+    🔁 Переносит студентов из JSON файла в базу SQLite.
+    Возвращает (прочитано записей, добавлено записей).
+    """
+    with open_database_file(json_path) as f:
+        records = json.load(f)
+    store = SqliteStudentStore(db_path)
+    added = 0
+    try:
+        for start in range(0, len(records), batch_size):
+            added += len(store.add_many(records[start:start + batch_size]))
+    finally:
+        store.close()
+    return len(records), added
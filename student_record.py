@@ -0,0 +1,207 @@
+"""
+🧾 ЗАПИСЬ СТУДЕНТА
+===========================================================
+Компактное представление студента в памяти. Вместо словаря
+с семью строковыми ключами используется класс со __slots__,
+повторяющиеся значения (колледж, курс, группа, статус)
+интернируются и хранятся в одном экземпляре на всю базу,
+а дата регистрации хранится целым числом секунд.
+
+В JSON запись по-прежнему сохраняется словарём со строковой
+датой, поэтому формат файла базы не меняется. Поля, которых нет
+в FIELDS (добавленные в файл вручную или другими программами),
+хранятся в словаре extra и записываются обратно без изменений.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+FIELDS = ('college', 'course', 'name', 'group', 'id', 'registration_date', 'status')
+_FIELD_SET = frozenset(FIELDS)
+
+# Поля с небольшим числом различных значений - интернируются
+CATEGORICAL_FIELDS = ('college', 'course', 'group', 'status')
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Дата хранится как число секунд от 1970-01-01 без учёта часового
+# пояса: так строка даты из базы восстанавливается без искажений
+_EPOCH = datetime(1970, 1, 1)
+
+# ─────────────────────────────────────────────────────────────
+# ДАТЫ
+# ─────────────────────────────────────────────────────────────
+
+def date_to_epoch(value):
+    """🕒 Строка 'ГГГГ-ММ-ДД ЧЧ:ММ:СС' -> целое число секунд (или исходное значение)."""
+    if not isinstance(value, str) or len(value) != 19 or value[10] != ' ':
+        return value
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if moment.tzinfo is not None:
+        return value
+    return (moment - _EPOCH) // timedelta(seconds=1)
+
+def epoch_to_date(value):
+    """🕒 Целое число секунд -> строка 'ГГГГ-ММ-ДД ЧЧ:ММ:СС'."""
+    if not isinstance(value, int):
+        return value
+    return _format_epoch(value)
+
+# Студенты одной пачки регистрируются в одну и ту же секунду -
+# строка даты форматируется один раз
+@lru_cache(maxsize=4096)
+def _format_epoch(value):
+    return (_EPOCH + timedelta(seconds=value)).strftime(DATE_FORMAT)
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _plain(value):
+    """
+    Значение дополнительного поля в исходном виде. Загрузчик базы
+    (object_hook=Student.from_dict) превращает в Student и вложенные
+    словари - возвращаем их обратно.
+    """
+    if isinstance(value, Student):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+# ─────────────────────────────────────────────────────────────
+# ЗАПИСЬ
+# ─────────────────────────────────────────────────────────────
+
+class Student:
+    """
+    Студент в базе данных.
+    Доступ по ключу (student['name'], student.get('status')) возвращает
+    значения так же, как словарь из JSON, включая строковую дату.
+    """
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, college=None, course=None, name=None, group=None, id=None,
+                 registration_date=None, status=None, extra=None):
+        self.college = _intern(college)
+        self.course = _intern(course)
+        self.name = name
+        self.group = _intern(group)
+        self.id = id
+        self.registration_date = date_to_epoch(registration_date)
+        self.status = _intern(status)
+        # Неизвестные поля записи (или None, если их нет)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """📥 Создаёт запись из словаря JSON; неизвестные поля попадают в extra."""
+        if len(data) == len(FIELDS):
+            # Обычная запись - ровно семь известных полей
+            try:
+                return cls(data['college'], data['course'], data['name'], data['group'],
+                           data['id'], data['registration_date'], data['status'])
+            except KeyError:
+                pass
+        extra = {key: _plain(value) for key, value in data.items()
+                 if key not in _FIELD_SET} or None
+        absent = _FIELD_SET.difference(data)
+        if absent:
+            cls = _PartialStudent
+        student = cls(data.get('college'), data.get('course'), data.get('name'),
+                      data.get('group'), data.get('id'), data.get('registration_date'),
+                      data.get('status'), extra)
+        if absent:
+            student.absent = absent
+        return student
+
+    def to_dict(self):
+        """📤 Словарь для JSON (дата - строкой, дополнительные поля - после основных)."""
+        data = {
+            'college': self.college,
+            'course': self.course,
+            'name': self.name,
+            'group': self.group,
+            'id': self.id,
+            'registration_date': epoch_to_date(self.registration_date),
+            'status': self.status,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def key(self):
+        """🔑 Ключ уникальности (ФИО, группа, ID)."""
+        return (self.name, self.group, self.id)
+
+    # ── Доступ как к словарю ─────────────────────────────────
+
+    def __getitem__(self, field):
+        if field not in _FIELD_SET:
+            if self.extra and field in self.extra:
+                return self.extra[field]
+            raise KeyError(field)
+        value = getattr(self, field)
+        if field == 'registration_date':
+            return epoch_to_date(value)
+        return value
+
+    def __setitem__(self, field, value):
+        if field not in _FIELD_SET:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+            return
+        if field == 'registration_date':
+            value = date_to_epoch(value)
+        elif field in CATEGORICAL_FIELDS:
+            value = _intern(value)
+        setattr(self, field, value)
+
+    def get(self, field, default=None):
+        if field not in _FIELD_SET:
+            return self.extra.get(field, default) if self.extra else default
+        value = self[field]
+        return default if value is None else value
+
+    def __eq__(self, other):
+        if isinstance(other, Student):
+            return (all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+                    and (self.extra or None) == (other.extra or None))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Student({', '.join(f'{f}={self[f]!r}' for f in FIELDS)})"
+
+class _PartialStudent(Student):
+    """
+    Запись из словаря, в котором есть не все поля FIELDS (в том числе
+    вложенный словарь дополнительного поля). Отсутствовавшие поля (absent),
+    если им так и не присвоили значение, не попадают в to_dict.
+    """
+
+    __slots__ = ('absent',)
+
+    def to_dict(self):
+        data = Student.to_dict(self)
+        for field in self.absent:
+            if data[field] is None:
+                del data[field]
+        return data
+
+def as_student(record):
+    """🧾 Приводит словарь или Student к Student."""
+    if isinstance(record, Student):
+        return record
+    return Student.from_dict(record)
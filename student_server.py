@@ -0,0 +1,517 @@
+"""
+🛰️ СЕРВЕР БАЗЫ СТУДЕНТОВ
+===========================================================
+Долгоживущий процесс на asyncio держит хранилище студентов
+в памяти и отвечает на запросы поиска, регистрации и статистики
+через локальный сокет. Протокол - JSON по строке на запрос:
+
+    {"op": "lookup", "name": ..., "group": ..., "id": ...}
+    {"op": "register", "student": {...}}
+    {"op": "register_many", "students": [...]}
+    {"op": "save", "students": [...]}
+    {"op": "replace", "replacements": [[[ФИО, группа, ID], {...} или null], ...]}
+    {"op": "search", "query": ..., "limit": 10}
+    {"op": "named", "name": ...}
+    {"op": "suggest", "name": ..., "max_distance": 2, "limit": 5}
+    {"op": "query", "college": ..., "date_from": ..., "offset": 0, "limit": 1000}
+    {"op": "stats"} / {"op": "count"} / {"op": "all"} / {"op": "ping"}
+
+Ответ: {"ok": true, "result": ...} или {"ok": false, "error": "..."}.
+
+Поиск выполняется прямо в цикле событий по индексу в памяти,
+а запись - в пуле потоков, поэтому поиски не ждут диска.
+Одновременные регистрации собираются хранилищем в одну запись
+(групповой коммит).
+
+RemoteStore - клиент с интерфейсом хранилища: с ним интерактивное
+меню Tarakan.py работает через сервер (параметр --server).
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import asyncio
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from db_stats import StudentStats
+from fuzzy_search import DEFAULT_MAX_DISTANCE, DEFAULT_SUGGESTIONS
+from secondary_index import parse_date_range
+from student_record import Student
+from student_store import StorageBackend
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+# Адрес по умолчанию: unix-сокет рядом с базой, на Windows - TCP
+if hasattr(socket, 'AF_UNIX'):
+    DEFAULT_ADDRESS = 'students.sock'
+else:
+    DEFAULT_ADDRESS = '127.0.0.1:8765'
+
+# Максимальная длина строки запроса (пакетная регистрация бывает большой)
+LINE_LIMIT = 16 * 1024 * 1024
+
+# Потоки записи: одновременные регистрации попадают в групповой коммит
+WRITER_THREADS = 4
+
+# Как часто сервер подхватывает изменения базы другими процессами (секунды)
+REFRESH_INTERVAL = 1.0
+
+# Сколько студентов выборки (op query) передаётся за один ответ
+QUERY_PAGE = 1000
+
+QUERY_FILTERS = ('college', 'course', 'group', 'date_from', 'date_to')
+
+class ServerError(Exception):
+    """Сервер вернул ошибку в ответ на запрос."""
+
+def parse_address(address):
+    """🧭 'хост:порт' -> ('tcp', (хост, порт)), иначе ('unix', путь к сокету)."""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return 'tcp', (host or '127.0.0.1', int(port))
+    return 'unix', address
+
+async def open_connection(address):
+    """🔌 Открывает асинхронное соединение с сервером."""
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        return await asyncio.open_unix_connection(target, limit=LINE_LIMIT)
+    return await asyncio.open_connection(*target, limit=LINE_LIMIT)
+
+def encode_message(message):
+    return json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n'
+
+# ─────────────────────────────────────────────────────────────
+# СЕРВЕР
+# ─────────────────────────────────────────────────────────────
+
+class StudentServer:
+    """Обработчик запросов поверх одного долгоживущего хранилища."""
+
+    def __init__(self, store, writers=WRITER_THREADS, refresh_interval=REFRESH_INTERVAL):
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.requests = 0
+        self._clients = set()
+        self._writers = ThreadPoolExecutor(max_workers=writers,
+                                           thread_name_prefix='student-writer')
+        self._handlers = {
+            'ping': self.op_ping,
+            'lookup': self.op_lookup,
+            'register': self.op_register,
+            'register_many': self.op_register_many,
+            'save': self.op_save,
+            'replace': self.op_replace,
+            'search': self.op_search,
+            'named': self.op_named,
+            'suggest': self.op_suggest,
+            'query': self.op_query,
+            'stats': self.op_stats,
+            'count': self.op_count,
+            'all': self.op_all,
+        }
+
+    async def _in_writer(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._writers, func, *args)
+
+    # ── Операции ─────────────────────────────────────────────
+
+    async def op_ping(self, request):
+        return 'pong'
+
+    async def op_lookup(self, request):
+        student = self.store.lookup(request['name'], request['group'], request['id'])
+        return student.to_dict() if student is not None else None
+
+    async def op_register(self, request):
+        return await self._in_writer(self.store.add, request['student'])
+
+    async def op_register_many(self, request):
+        added = await self._in_writer(self.store.add_many, request['students'])
+        return [student.to_dict() for student in added]
+
+    async def op_save(self, request):
+        students = request['students']
+        if not isinstance(students, list):
+            raise TypeError("students должен быть списком")
+        await self._in_writer(self.store.save, students)
+        return len(students)
+
+    async def op_replace(self, request):
+        replacements = {tuple(key): student for key, student in request['replacements']}
+        return await self._in_writer(self.store.replace_many, replacements)
+
+    async def op_search(self, request):
+        limit = int(request.get('limit', 10))
+        students = await self._in_writer(self.store.search_name, request['query'], limit)
+        return [student.to_dict() for student in students]
+
+    async def op_named(self, request):
+        students = await self._in_writer(self.store.students_named, request['name'])
+        return [student.to_dict() for student in students]
+
+    async def op_suggest(self, request):
+        max_distance = int(request.get('max_distance', DEFAULT_MAX_DISTANCE))
+        limit = int(request.get('limit', DEFAULT_SUGGESTIONS))
+        found = await self._in_writer(self.store.suggest_names, request['name'], max_distance, limit)
+        return [[distance, student.to_dict()] for distance, student in found]
+
+    async def op_query(self, request):
+        filters = {name: request.get(name) for name in QUERY_FILTERS}
+        offset = int(request.get('offset', 0))
+        limit = int(request.get('limit', QUERY_PAGE))
+
+        def page():
+            return [student.to_dict() for student in
+                    islice(self.store.query(**filters), offset, offset + limit)]
+
+        return await self._in_writer(page)
+
+    async def op_stats(self, request):
+        stats = await self._in_writer(self.store.stats)
+        return stats.to_dict()
+
+    async def op_count(self, request):
+        return await self._in_writer(len, self.store)
+
+    async def op_all(self, request):
+        students = await self._in_writer(self.store.all)
+        return [student.to_dict() for student in students]
+
+    # ── Соединения ───────────────────────────────────────────
+
+    async def dispatch(self, line):
+        """Выполняет один запрос и возвращает ответ (словарь)."""
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            handler = self._handlers.get(request.get('op'))
+            if handler is None:
+                return {'ok': False, 'error': f"неизвестная операция: {request.get('op')!r}"}
+            return {'ok': True, 'result': await handler(request)}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {'ok': False, 'error': f"неверный запрос: {e!r}"}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    async def handle_client(self, reader, writer):
+        """Обслуживает одно соединение: запросы по строке, ответы по порядку."""
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(encode_message(await self.dispatch(line)))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # Клиент отключился или прислал слишком длинную строку
+            pass
+        except asyncio.CancelledError:
+            # Сервер останавливается (close_clients): соединение просто закрывается
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    async def close_clients(self):
+        """Отключает оставшихся клиентов при остановке сервера и ждёт их."""
+        clients = list(self._clients)
+        for task in clients:
+            task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+
+    async def refresh_loop(self):
+        """
+        Периодически подхватывает изменения базы другими процессами.
+        Идёт в пуле записи рядом с регистрациями: хранилище само
+        сверяет журнал под блокировкой, которую держит коммит.
+        """
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self._in_writer(self.store.refresh)
+            except Exception as e:
+                print(f"❌ Ошибка при обновлении базы данных: {e}")
+
+    def close(self):
+        self._writers.shutdown(wait=True)
+
+def _check_stale_socket(path):
+    """Удаляет сокет, оставшийся от упавшего сервера; если сервер жив - ошибка."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise OSError(f"сервер уже запущен на {path}")
+    finally:
+        probe.close()
+
+async def serve(store, address=DEFAULT_ADDRESS, ready=None):
+    """
+    🛰️ Запускает сервер и обслуживает запросы до отмены.
+    ready - необязательное asyncio.Event, выставляется после запуска.
+    """
+    handler = StudentServer(store)
+    # Загружаем базу до приёма соединений, чтобы первый поиск был быстрым
+    await handler._in_writer(store.refresh)
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        _check_stale_socket(target)
+        server = await asyncio.start_unix_server(handler.handle_client, path=target,
+                                                 limit=LINE_LIMIT)
+    else:
+        server = await asyncio.start_server(handler.handle_client, *target, limit=LINE_LIMIT)
+    refresher = asyncio.create_task(handler.refresh_loop())
+    print(f"✅ Сервер базы студентов запущен: {address} ({len(store)} студентов)")
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        refresher.cancel()
+        await asyncio.gather(refresher, return_exceptions=True)
+        await handler.close_clients()
+        handler.close()
+        if kind == 'unix' and os.path.exists(target):
+            os.remove(target)
+        print(f"🛑 Сервер остановлен, обработано запросов: {handler.requests}")
+
+# ─────────────────────────────────────────────────────────────
+# КЛИЕНТ
+# ─────────────────────────────────────────────────────────────
+
+class StudentClient:
+    """Синхронный клиент сервера: один запрос - одна строка ответа."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=30):
+        self.address = address
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def _connect(self):
+        kind, target = parse_address(self.address)
+        if kind == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+        except OSError as e:
+            sock.close()
+            raise ConnectionError(f"сервер {self.address} недоступен: {e}") from e
+        self._sock = sock
+        self._file = sock.makefile('rb')
+
+    def request(self, op, **params):
+        """📨 Отправляет запрос и возвращает поле result ответа."""
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(encode_message(dict(params, op=op)))
+            line = self._file.readline()
+        except OSError as e:
+            # Обрыв сокета - ConnectionError, а не BrokenPipeError:
+            # так его не спутать с закрытым выводом программы (| head)
+            self.close()
+            raise ConnectionError(f"соединение с сервером {self.address} прервано: {e}") from e
+        if not line:
+            self.close()
+            raise ConnectionError("сервер закрыл соединение")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise ServerError(response.get('error'))
+        return response['result']
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+class RemoteStore(StorageBackend):
+    """Хранилище, которое пересылает все операции серверу базы студентов."""
+
+    backend_name = 'server'
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        self.client = StudentClient(address)
+
+    def find(self, name, group, id):
+        data = self.client.request('lookup', name=name, group=group, id=id)
+        return Student.from_dict(data) if data is not None else None
+
+    def all(self):
+        return [Student.from_dict(data) for data in self.client.request('all')]
+
+    def __len__(self):
+        return self.client.request('count')
+
+    def add(self, student):
+        if isinstance(student, Student):
+            student = student.to_dict()
+        return self.client.request('register', student=student)
+
+    def add_many(self, students):
+        students = [student.to_dict() if isinstance(student, Student) else student
+                    for student in students]
+        added = self.client.request('register_many', students=students)
+        return [Student.from_dict(data) for data in added]
+
+    def search_name(self, query, limit=10):
+        data = self.client.request('search', query=query, limit=limit)
+        return [Student.from_dict(item) for item in data]
+
+    def students_named(self, name):
+        return [Student.from_dict(item) for item in self.client.request('named', name=name)]
+
+    def suggest_names(self, name, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_SUGGESTIONS):
+        data = self.client.request('suggest', name=name, max_distance=max_distance, limit=limit)
+        return [(distance, Student.from_dict(item)) for distance, item in data]
+
+    def query(self, college=None, course=None, group=None, date_from=None, date_to=None):
+        """🗃️ Выборка через сервер: студенты запрашиваются страницами по QUERY_PAGE."""
+        parse_date_range(date_from, date_to)  # неверная дата - ValueError до запроса
+        filters = {'college': college, 'course': course, 'group': group,
+                   'date_from': date_from, 'date_to': date_to}
+        first = self.client.request('query', offset=0, limit=QUERY_PAGE, **filters)
+        return self._query_pages(first, filters)
+
+    def _query_pages(self, data, filters):
+        offset = 0
+        while True:
+            for item in data:
+                yield Student.from_dict(item)
+            if len(data) < QUERY_PAGE:
+                return
+            offset += len(data)
+            data = self.client.request('query', offset=offset, limit=QUERY_PAGE, **filters)
+
+    def save(self, records):
+        """💾 Полная перезапись базы на сервере (вся база - один запрос до LINE_LIMIT)."""
+        students = [student.to_dict() if isinstance(student, Student) else student
+                    for student in records]
+        self.client.request('save', students=students)
+
+    def replace_many(self, replacements):
+        """🔁 Замена по ключу на сервере - одним запросом, под блокировкой сервера."""
+        data = [[list(key), student.to_dict() if isinstance(student, Student) else student]
+                for key, student in replacements.items()]
+        return self.client.request('replace', replacements=data)
+
+    def stats(self):
+        return StudentStats.from_dict(self.client.request('stats'))
+
+    def close(self):
+        self.client.close()
+
+# ─────────────────────────────────────────────────────────────
+# ГЕНЕРАТОР НАГРУЗКИ
+# ─────────────────────────────────────────────────────────────
+
+def percentile(sorted_values, fraction):
+    """Перцентиль по отсортированному списку (ближайший ранг)."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def _loadgen_student(run, client, number):
+    return {
+        'college': 'Нагрузочный колледж',
+        'course': str(number % 4 + 1),
+        'name': f"Нагрузка {run} Клиент {client} Студент {number}",
+        'group': f"НГ-{number % 10}",
+        'id': f"{run}-{client}-{number}",
+        'registration_date': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'status': 'новый студент',
+    }
+
+async def _loadgen_client(address, run, client, count, write_ratio, known, latencies, seed):
+    rng = random.Random(seed + client)
+    reader, writer = await open_connection(address)
+    try:
+        for number in range(count):
+            if rng.random() < write_ratio:
+                op = 'register'
+                request = {'op': op, 'student': _loadgen_student(run, client, number)}
+            else:
+                op = 'lookup'
+                name, group, id = rng.choice(known)
+                request = {'op': op, 'name': name, 'group': group, 'id': id}
+            started = time.perf_counter()
+            writer.write(encode_message(request))
+            await writer.drain()
+            line = await reader.readline()
+            latencies[op].append(time.perf_counter() - started)
+            if not line or not json.loads(line).get('ok'):
+                raise ServerError(f"ошибка в ответе сервера: {line[:200]!r}")
+    finally:
+        writer.close()
+
+async def run_loadgen(address=DEFAULT_ADDRESS, clients=16, requests=500,
+                      write_ratio=0.1, preload=1000, seed=42):
+    """
+    📈 Нагружает сервер: clients одновременных соединений по requests запросов
+    (доля регистраций - write_ratio). Поиски идут по заранее
+    зарегистрированным preload студентам. Возвращает сводку задержек.
+    """
+    run = f"{os.getpid()}-{int(time.time())}"
+    reader, writer = await open_connection(address)
+    try:
+        students = [_loadgen_student(run, 'preload', number) for number in range(preload)]
+        writer.write(encode_message({'op': 'register_many', 'students': students}))
+        await writer.drain()
+        await reader.readline()
+    finally:
+        writer.close()
+    known = [(s['name'], s['group'], s['id']) for s in students] or [('', '', '')]
+
+    latencies = {'lookup': [], 'register': []}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _loadgen_client(address, run, client, requests, write_ratio, known, latencies, seed)
+        for client in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies['all'] = latencies['lookup'] + latencies['register']
+    summary = {'clients': clients, 'seconds': elapsed, 'operations': {}}
+    for op, values in latencies.items():
+        values.sort()
+        summary['operations'][op] = {
+            'count': len(values),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+            'max_ms': (values[-1] if values else 0.0) * 1000,
+        }
+    total = len(latencies['all'])
+    summary['requests'] = total
+    summary['requests_per_second'] = total / elapsed if elapsed > 0 else 0.0
+    return summary
+
+def print_loadgen_report(summary):
+    """📊 Выводит отчёт генератора нагрузки."""
+    print("\n📈 Нагрузочный тест сервера:")
+    print("═" * 60)
+    print(f"🔌 Клиентов: {summary['clients']}, запросов: {summary['requests']} "
+          f"за {summary['seconds']:.2f} с ({summary['requests_per_second']:.0f} запросов/с)")
+    print(f"{'операция':<12} {'запросов':>9} {'p50, мс':>9} {'p99, мс':>9} {'макс, мс':>9}")
+    for op, data in summary['operations'].items():
+        print(f"{op:<12} {data['count']:>9} {data['p50_ms']:>9.3f} "
+              f"{data['p99_ms']:>9.3f} {data['max_ms']:>9.3f}")
+    print("═" * 60)
@@ -0,0 +1,843 @@
+"""
+🗂️ ХРАНИЛИЩЕ СТУДЕНТОВ
+===========================================================
+Долгоживущее хранилище базы данных студентов в памяти.
+Файл читается один раз, поиск и проверка дубликатов идут
+через хеш-индекс по (ФИО, группа, ID). Файл перечитывается
+только если изменились его время модификации или размер.
+
+Базы с расширением .json.gz и .json.xz хранятся сжатыми (gzip,
+xz) и распаковываются на лету. Первый поиск в ещё не загруженной
+базе разбирает файл потоком и останавливается на совпадении.
+
+В режиме журнала новые студенты дописываются отдельными
+JSON-строками в файл '<база>.log', а снимок базы
+пересобирается только при сжатии журнала (compact).
+
+Несколько процессов могут работать с одной базой: запись идёт
+под исключительной блокировкой '<база>.lock' после перечитывания
+чужих изменений, а добавления из нескольких потоков одного
+процесса собираются в одну запись (групповой коммит).
+"""
+
+import os
+import re
+import gzip
+import json
+import lzma
+import time
+import threading
+
+from db_stats import StudentStats
+from file_lock import FileLock
+from fuzzy_search import DEFAULT_MAX_DISTANCE, DEFAULT_SUGGESTIONS
+from name_index import DEFAULT_LIMIT, NameIndex
+from secondary_index import SecondaryIndex
+from student_record import FIELDS, Student, as_student
+
+# ─────────────────────────────────────────────────────────────
+# КОНФИГУРАЦИЯ
+# ─────────────────────────────────────────────────────────────
+
+JOURNAL_SUFFIX = '.log'
+
+# Файл инкрементальной статистики рядом с базой
+STATS_SUFFIX = '.stats'
+
+# Групповой fsync: журнал сбрасывается на диск раз в N записей
+# или раз в указанное число секунд (что наступит раньше)
+FSYNC_EVERY = 32
+FSYNC_INTERVAL = 1.0
+
+# Сжатые базы: степень сжатия gzip (1-9) и xz (0-9). Большие значения
+# почти не уменьшают файл базы, но в разы замедляют сохранение
+GZIP_LEVEL = 6
+XZ_PRESET = 2
+
+# По сколько символов читается база при потоковом разборе
+STREAM_CHUNK = 1 << 16
+
+# ─────────────────────────────────────────────────────────────
+# ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
+# ─────────────────────────────────────────────────────────────
+
+class CorruptDatabaseError(Exception):
+    """Файл базы данных не удаётся разобрать (его нельзя считать пустой базой)."""
+
+def student_key(name, group, id):
+    """🔑 Составной ключ студента для индекса."""
+    return (name, group, id)
+
+def record_key(student):
+    """🔑 Составной ключ для записи студента (Student или словаря)."""
+    if isinstance(student, Student):
+        return (student.name, student.group, student.id)
+    return (student.get('name'), student.get('group'), student.get('id'))
+
+def compression_of(path):
+    """📦 Сжатие файла базы по расширению: 'gzip', 'xz' или None."""
+    lowered = path.lower()
+    if lowered.endswith('.gz'):
+        return 'gzip'
+    if lowered.endswith('.xz'):
+        return 'xz'
+    return None
+
+# Ошибки распаковки повреждённого или оборванного сжатого файла
+COMPRESSION_ERRORS = (EOFError, gzip.BadGzipFile, lzma.LZMAError)
+
+def open_database_file(path, mode='r', compression=None):
+    """
+    📂 Открывает файл базы как текст UTF-8. Сжатие берётся из compression
+    или по расширению path; сжатые файлы (рас)паковываются на лету.
+    """
+    compression = compression or compression_of(path)
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=GZIP_LEVEL)
+    if compression == 'xz':
+        options = {'preset': XZ_PRESET} if 'w' in mode else {}
+        return lzma.open(path, mode + 't', encoding='utf-8', **options)
+    return open(path, mode, encoding='utf-8')
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+def iter_json_array(file, chunk_size=STREAM_CHUNK):
+    """
+    📜 Потоково разбирает JSON-список студентов из текстового файла:
+    записи (Student) выдаются по мере чтения, файл целиком в память
+    не загружается. Ошибки формата - json.JSONDecodeError.
+    """
+    decoder = json.JSONDecoder(object_hook=Student.from_dict)
+    buffer, pos, eof = '', 0, False
+    started = False
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer) and not eof:
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = chunk, 0, not chunk
+            continue
+        if not started:
+            if pos == len(buffer):
+                return
+            if buffer[pos] != '[':
+                raise json.JSONDecodeError("ожидался список студентов", buffer, pos)
+            started = True
+            pos += 1
+            continue
+        if pos == len(buffer):
+            raise json.JSONDecodeError("файл оборван", buffer, pos)
+        if buffer[pos] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # Значение у самого конца буфера могло оборваться на границе чтения
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        yield value
+        pos = end
+
+def file_stamp(path):
+    """🕒 Отпечаток файла (mtime, размер) или None, если файла нет."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def read_journal(path, offset=0):
+    """
+    📜 Читает записи журнала начиная с offset: (студенты, длина прочитанного,
+    оборвана ли последняя строка) или None, если журнала нет.
+    Незавершённая последняя строка в длину не входит.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            tail = f.read()
+    except FileNotFoundError:
+        return None
+    end = tail.rfind(b'\n') + 1
+    students = []
+    for line in tail[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            students.append(Student.from_dict(json.loads(line)))
+        except (json.JSONDecodeError, AttributeError):
+            continue
+    return students, end, end < len(tail)
+
+# Снимок базы пишется в том же виде, что json.dump(..., indent=2),
+# но из частей, закодированных C-кодировщиком: json с indent
+# переходит на медленный кодировщик на чистом Python
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_encode_nested = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+_RECORD_TEMPLATE = ('  {\n' + ',\n'.join(f'    {_encode(field)}: %s' for field in FIELDS)
+                    + '\n  }')
+
+def snapshot_record(data):
+    """Словарь записи как элемент списка в json.dump(..., indent=2)."""
+    if len(data) == len(FIELDS):
+        try:
+            return _RECORD_TEMPLATE % tuple(_encode(data[field]) for field in FIELDS)
+        except KeyError:
+            pass
+    # Дополнительные поля (см. Student.extra) могут быть вложенными
+    return '  {\n' + ',\n'.join(
+        f'    {_encode(key)}: ' + (_encode_nested(value).replace('\n', '\n    ')
+                                   if isinstance(value, (dict, list)) else _encode(value))
+        for key, value in data.items()) + '\n  }'
+
+def journal_lines(students):
+    """Записи журнала: по JSON-строке на студента, в байтах."""
+    return ''.join(json.dumps(student.to_dict(), ensure_ascii=False) + '\n'
+                   for student in students).encode('utf-8')
+
+# ─────────────────────────────────────────────────────────────
+# ИНТЕРФЕЙС ХРАНИЛИЩА
+# ─────────────────────────────────────────────────────────────
+
+class StorageBackend:
+    """
+    Общий интерфейс хранилищ студентов.
+    Хранилища возвращают записи Student (доступ по ключу как у словаря:
+    college, course, name, group, id, registration_date и status),
+    а на вход принимают и Student, и словари; ключ уникальности -
+    (name, group, id).
+    """
+
+    backend_name = None
+    journal = False
+
+    def refresh(self):
+        """🔄 Подхватывает изменения, сделанные другими процессами."""
+
+    def find(self, name, group, id):
+        """🔍 Возвращает запись студента или None."""
+        raise NotImplementedError
+
+    def lookup(self, name, group, id):
+        """
+        🔍 Быстрый поиск для долгоживущего процесса (сервера): не ждёт
+        записи и может не видеть чужих изменений до следующего refresh().
+        """
+        return self.find(name, group, id)
+
+    def contains(self, name, group, id):
+        """❓ Проверяет, есть ли студент в базе."""
+        return self.find(name, group, id) is not None
+
+    def _name_index(self):
+        """Индекс ФИО по текущему содержимому базы."""
+        return NameIndex((student['name'], student) for student in self.all())
+
+    def search_name(self, query, limit=DEFAULT_LIMIT):
+        """🔤 Студенты, чьё ФИО начинается с query или содержит его (лучшие первыми)."""
+        return self._name_index().search(query, limit)
+
+    def students_named(self, name):
+        """👥 Все студенты с таким ФИО (без учёта регистра, ё/е и лишних пробелов)."""
+        return self._name_index().get(name)
+
+    def suggest_names(self, name, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_SUGGESTIONS):
+        """
+        🤔 «Возможно, вы имели в виду»: пары (число опечаток, студент)
+        для ФИО на расстоянии не больше max_distance, ближайшие первыми.
+        """
+        return self._name_index().suggest(name, max_distance, limit)
+
+    def _secondary_index(self):
+        """Вторичные индексы по текущему содержимому базы."""
+        return SecondaryIndex(map(as_student, self.all()))
+
+    def query(self, college=None, course=None, group=None, date_from=None, date_to=None):
+        """
+        🗃️ Выборка студентов по колледжу, курсу, группе и диапазону дат
+        регистрации ('ГГГГ-ММ-ДД', включительно); None - без условия.
+        Возвращает итератор: записи выдаются по мере нахождения.
+        """
+        return self._secondary_index().query(college, course, group, date_from, date_to)
+
+    def all(self):
+        """📋 Возвращает список всех студентов."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def save(self, records):
+        """💾 Полностью заменяет содержимое базы."""
+        raise NotImplementedError
+
+    def add(self, student):
+        """➕ Добавляет студента; False, если такой уже есть."""
+        raise NotImplementedError
+
+    def add_many(self, students):
+        """➕ Добавляет пачку студентов; возвращает список добавленных."""
+        raise NotImplementedError
+
+    def replace_many(self, replacements):
+        """
+        🔁 Заменяет записи по ключу: {(ФИО, группа, ID): новая запись с тем же
+        ключом или None - удалить}. Отсутствующие ключи пропускаются.
+        Возвращает число заменённых и удалённых записей.
+        """
+        records = []
+        changed = 0
+        for student in self.all():
+            key = record_key(student)
+            if key in replacements:
+                changed += 1
+                if replacements[key] is not None:
+                    records.append(as_student(replacements[key]))
+                continue
+            records.append(student)
+        if changed:
+            self.save(records)
+        return changed
+
+    def stats(self):
+        """📊 Возвращает статистику базы (StudentStats)."""
+        return StudentStats.from_records(self.all())
+
+    def compact(self):
+        """🗜️ Обслуживание хранилища; возвращает число перенесённых записей."""
+        return 0
+
+    def close(self):
+        """🔒 Закрывает файлы и соединения."""
+
+# ─────────────────────────────────────────────────────────────
+# JSON ХРАНИЛИЩЕ
+# ─────────────────────────────────────────────────────────────
+
+class _PendingWrite:
+    """Запрос на запись в очереди группового коммита."""
+
+    __slots__ = ('students', 'durable', 'added', 'done', 'error')
+
+    def __init__(self, students, durable):
+        self.students = students
+        self.durable = durable
+        self.added = []
+        self.done = False
+        self.error = None
+
+class StudentStore(StorageBackend):
+    """
+    Хранилище студентов в JSON файле с индексом по (ФИО, группа, ID).
+    Данные загружаются один раз и перечитываются с диска
+    только при изменении файла другим процессом.
+    """
+
+    backend_name = 'json'
+
+    def __init__(self, path, journal=False,
+                 fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.journal = journal
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.stats_path = path + STATS_SUFFIX
+        self.compression = compression_of(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._records = []
+        self._index = {}
+        self._stamp = None
+        self._loaded = False
+        self._scanned = False
+        self._stats = None
+        self._names = None
+        self._secondary = None
+        # Состояние журнала
+        self._log_file = None
+        self._log_offset = 0
+        self._log_stamp = None
+        self._log_torn = False
+        self._journal_records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Межпроцессная блокировка и очередь группового коммита
+        self._lock = FileLock(path)
+        self._commit_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._queue = []
+
+    # ── Загрузка ─────────────────────────────────────────────
+
+    def _read_file(self):
+        """
+        Читает список студентов из JSON файла. Записи превращаются
+        в Student прямо при разборе, без промежуточного списка словарей.
+        Повреждённый файл не считается пустой базой: следующая запись
+        затёрла бы всех студентов, поэтому выбрасывается CorruptDatabaseError.
+        """
+        try:
+            with open_database_file(self.path) as f:
+                text = f.read()
+        except FileNotFoundError:
+            return []
+        except (UnicodeDecodeError, *COMPRESSION_ERRORS) as e:
+            raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: {e}") from e
+        if not text.strip():
+            return []
+        try:
+            data = json.loads(text, object_hook=Student.from_dict)
+        except json.JSONDecodeError as e:
+            raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: {e}") from e
+        if not isinstance(data, list):
+            raise CorruptDatabaseError(
+                f"файл базы данных {self.path} повреждён: ожидался список студентов")
+        return [item for item in data if isinstance(item, Student)]
+
+    def _rebuild_index(self):
+        """Перестраивает хеш-индекс по всем записям."""
+        index = {}
+        for student in self._records:
+            # При дубликатах в файле побеждает первая запись,
+            # как и при линейном поиске
+            index.setdefault(record_key(student), student)
+        self._index = index
+
+    def _replay_journal(self):
+        """
+        Дочитывает хвост журнала начиная с последней известной позиции.
+        Незавершённая последняя строка (оборванная запись) пропускается
+        до следующего чтения, уже применённые записи не дублируются.
+        """
+        tail = read_journal(self.journal_path, self._log_offset)
+        if tail is None:
+            self._log_offset = 0
+            self._log_stamp = None
+            self._log_torn = False
+            return
+        students, end, self._log_torn = tail
+        for student in students:
+            key = record_key(student)
+            if key not in self._index:
+                self._index[key] = student
+                self._records.append(student)
+                self._journal_records += 1
+                if self._stats is not None:
+                    self._stats.add(student)
+                if self._names is not None:
+                    self._names.add(student.name, student)
+                if self._secondary is not None:
+                    self._secondary.add(student)
+        self._log_offset += end
+        self._log_stamp = file_stamp(self.journal_path)
+
+    def reload(self):
+        """🔄 Принудительно перечитывает базу данных с диска."""
+        # Общая блокировка: снимок и журнал читаются согласованно,
+        # сжатие журнала другим процессом не вклинится между ними
+        with self._lock.shared():
+            stamp = file_stamp(self.path)
+            self._load(self._read_file() if stamp is not None else [], stamp)
+
+    def _load(self, records, stamp):
+        """Делает records содержимым базы и дочитывает журнал (под общей блокировкой)."""
+        self._records = records
+        self._rebuild_index()
+        self._stamp = stamp
+        self._stats = None
+        self._names = None
+        self._secondary = None
+        if self.journal:
+            self._log_offset = 0
+            self._journal_records = 0
+            self._replay_journal()
+        self._loaded = True
+
+    def _changed(self):
+        """Изменились ли файлы базы с последнего чтения (без блокировки)."""
+        if not self._loaded or file_stamp(self.path) != self._stamp:
+            return True
+        return self.journal and file_stamp(self.journal_path) != self._log_stamp
+
+    def refresh(self):
+        """🔄 Перечитывает базу, только если файлы изменились."""
+        if not self._changed():
+            return
+        # Проверка повторяется под блокировкой: _commit другого потока
+        # держит её, пока пишет журнал и сдвигает _log_offset, - иначе
+        # его строки прочитались бы как чужие и попали в базу дважды
+        with self._lock.shared():
+            if not self._loaded or file_stamp(self.path) != self._stamp:
+                self.reload()
+            elif self.journal and file_stamp(self.journal_path) != self._log_stamp:
+                log_stamp = file_stamp(self.journal_path)
+                if log_stamp is None or log_stamp[1] < self._log_offset:
+                    # Журнал усечён чужим сжатием - читаем всё заново
+                    self.reload()
+                else:
+                    self._replay_journal()
+
+    # ── Чтение ───────────────────────────────────────────────
+
+    def find(self, name, group, id):
+        """🔍 Ищет студента по (ФИО, группа, ID) за O(1)."""
+        if not self._loaded and not self._scanned:
+            return self._scan_find(student_key(name, group, id))
+        self.refresh()
+        return self._index.get(student_key(name, group, id))
+
+    def _scan_find(self, key):
+        """
+        Первый поиск в ещё не загруженной базе: файл (сжатый - с распаковкой)
+        разбирается потоком до первого совпадения. Если совпадения нет,
+        база прочитана целиком и становится загруженной; после найденного
+        следующие поиски загружают базу и идут по индексу.
+        """
+        self._scanned = True
+        with self._lock.shared():
+            stamp = file_stamp(self.path)
+            records = []
+            try:
+                with open_database_file(self.path) as f:
+                    for student in iter_json_array(f):
+                        if not isinstance(student, Student):
+                            continue
+                        if record_key(student) == key:
+                            return student
+                        records.append(student)
+            except FileNotFoundError:
+                stamp = None
+            except (UnicodeDecodeError, json.JSONDecodeError, *COMPRESSION_ERRORS) as e:
+                raise CorruptDatabaseError(f"файл базы данных {self.path} повреждён: {e}") from e
+            self._load(records, stamp)
+        # Совпадение могло быть только в журнале
+        return self._index.get(key)
+
+    def lookup(self, name, group, id):
+        """🔍 Поиск по индексу в памяти без проверки файлов на диске."""
+        if not self._loaded:
+            self.refresh()
+        return self._index.get(student_key(name, group, id))
+
+    def all(self):
+        """📋 Возвращает список всех студентов (без копирования)."""
+        self.refresh()
+        return self._records
+
+    def __len__(self):
+        self.refresh()
+        return len(self._records)
+
+    def _name_index(self):
+        """
+        Индекс ФИО (NameIndex) строится при первом поиске по ФИО
+        и дальше пополняется вместе с базой.
+        """
+        self.refresh()
+        if self._names is None:
+            self._names = NameIndex((student.name, student) for student in self._records)
+        return self._names
+
+    def _secondary_index(self):
+        """
+        Вторичные индексы (SecondaryIndex) строятся при первой выборке
+        и дальше пополняются вместе с базой.
+        """
+        self.refresh()
+        if self._secondary is None:
+            self._secondary = SecondaryIndex(self._records)
+        return self._secondary
+
+    # ── Статистика ───────────────────────────────────────────
+
+    def _disk_stamp(self):
+        """Отпечаток файлов базы в виде, пригодном для JSON."""
+        stamps = [file_stamp(self.path)]
+        if self.journal:
+            stamps.append(file_stamp(self.journal_path))
+        return [list(stamp) if stamp else None for stamp in stamps]
+
+    def _read_stats_file(self):
+        """Читает статистику из файла, если она соответствует базе на диске."""
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('stamp') != self._disk_stamp():
+                return None
+            return StudentStats.from_dict(data['stats'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_stats_file(self):
+        """Атомарно сохраняет статистику вместе с отпечатком базы."""
+        data = {'stamp': self._disk_stamp(), 'stats': self._stats.to_dict()}
+        # Статистику могут записывать несколько читателей сразу - у каждого свой файл
+        tmp_path = f'{self.stats_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.stats_path)
+        except OSError:
+            # Статистика - только кэш: при ошибке она будет пересчитана
+            pass
+
+    def _ensure_stats(self):
+        """Готовит статистику в памяти: из файла или полным пересчётом."""
+        if self._stats is None:
+            self._stats = self._read_stats_file()
+            if self._stats is None:
+                self._stats = StudentStats.from_records(self._records)
+                self._write_stats_file()
+
+    def stats(self):
+        """
+        📊 Возвращает статистику базы. Если база ещё не загружена,
+        а файл статистики актуален, сама база не читается.
+        """
+        if not self._loaded:
+            cached = self._read_stats_file()
+            if cached is not None:
+                return cached
+        with self._lock.shared():
+            self.refresh()
+            self._ensure_stats()
+        return self._stats
+
+    # ── Запись ───────────────────────────────────────────────
+
+    def _write_snapshot(self, records):
+        """Атомарно записывает снимок базы через временный файл."""
+        tmp_path = self.path + '.tmp'
+        with open_database_file(tmp_path, 'w', self.compression) as f:
+            if records:
+                f.write('[\n')
+                f.write(',\n'.join(snapshot_record(student.to_dict()) for student in records))
+                f.write('\n]')
+            else:
+                f.write('[]')
+        if self.journal:
+            # Сжатый файл дописывается при закрытии - сбрасываем на диск после него
+            fd = os.open(tmp_path, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        os.replace(tmp_path, self.path)
+
+    def _truncate_journal(self):
+        """Очищает журнал после того, как его записи попали в снимок."""
+        self._close_journal()
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'wb'):
+                pass
+        self._log_offset = 0
+        self._log_torn = False
+        self._journal_records = 0
+        self._log_stamp = file_stamp(self.journal_path)
+
+    def _save_records(self, records, keep_indexes=False):
+        """
+        Перезаписывает снимок базы и обновляет состояние в памяти.
+        keep_indexes - прежние записи сохранены в том же порядке
+        (индекс ФИО и вторичные индексы остаются в силе).
+        """
+        records = [as_student(student) for student in records]
+        self._write_snapshot(records)
+        if not keep_indexes:
+            self._names = None
+            self._secondary = None
+        self._records = records
+        self._rebuild_index()
+        self._stamp = file_stamp(self.path)
+        if self.journal:
+            self._truncate_journal()
+        self._loaded = True
+
+    def save(self, records):
+        """💾 Полностью перезаписывает базу данных."""
+        with self._lock.exclusive():
+            self._save_records(records)
+            self._stats = StudentStats.from_records(self._records)
+            self._write_stats_file()
+
+    def replace_many(self, replacements):
+        """🔁 Замена по ключу: чтение и перезапись базы - под одной исключительной блокировкой."""
+        with self._lock.exclusive():
+            return super().replace_many(replacements)
+
+    def _append_journal(self, students):
+        """Дописывает записи в журнал одним вызовом write с групповым fsync."""
+        if self._log_file is None:
+            self._log_file = open(self.journal_path, 'ab')
+        if self._log_torn:
+            # Оборванная запись после сбоя: начинаем с новой строки
+            self._log_file.write(b'\n')
+            self._log_offset = self._log_file.tell()
+            self._log_torn = False
+        data = journal_lines(students)
+        self._log_file.write(data)
+        self._log_file.flush()
+        self._unsynced += len(students)
+        if (self._unsynced >= self.fsync_every or
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+        self._log_offset += len(data)
+        self._log_stamp = file_stamp(self.journal_path)
+
+    def add(self, student):
+        """
+        Добавляет студента, если его ещё нет в базе.
+        Возвращает True, если запись добавлена, и False для дубликата.
+        """
+        return bool(self._submit([as_student(student)], durable=False))
+
+    def add_many(self, students):
+        """
+        Добавляет пачку студентов одной записью на диск.
+        Дубликаты (в базе и внутри пачки) пропускаются.
+        Возвращает список действительно добавленных записей.
+        """
+        return self._submit([as_student(student) for student in students], durable=True)
+
+    # ── Групповой коммит ─────────────────────────────────────
+
+    def _submit(self, students, durable):
+        """
+        Ставит студентов в очередь и дожидается записи. Первый поток,
+        получивший _commit_lock, записывает на диск всю накопившуюся
+        очередь одним вызовом (и за своих соседей тоже), остальные
+        находят свои записи уже сохранёнными.
+        """
+        pending = _PendingWrite(students, durable)
+        with self._queue_lock:
+            self._queue.append(pending)
+        with self._commit_lock:
+            if not pending.done:
+                with self._queue_lock:
+                    batch, self._queue = self._queue, []
+                try:
+                    self._commit(batch)
+                except BaseException as e:
+                    for waiting in batch:
+                        waiting.error = e
+                finally:
+                    for waiting in batch:
+                        waiting.done = True
+        if pending.error is not None:
+            raise pending.error
+        return pending.added
+
+    def _commit(self, batch):
+        """
+        Записывает очередь под исключительной блокировкой: перечитывает
+        изменения других процессов, отсекает дубликаты и сохраняет
+        новых студентов одной записью (снимок или журнал).
+        """
+        with self._lock.exclusive():
+            self.refresh()
+            added = []
+            seen = set()
+            for pending in batch:
+                for student in pending.students:
+                    key = record_key(student)
+                    if key in self._index or key in seen:
+                        continue
+                    seen.add(key)
+                    pending.added.append(student)
+                    added.append(student)
+            if not added:
+                return
+            self._ensure_stats()
+            if self.journal:
+                self._append_journal(added)
+                if any(pending.durable for pending in batch):
+                    self.sync()
+                for student in added:
+                    self._index[record_key(student)] = student
+                self._records.extend(added)
+                self._journal_records += len(added)
+            else:
+                self._save_records(self._records + added, keep_indexes=True)
+            for student in added:
+                self._stats.add(student)
+                if self._names is not None:
+                    self._names.add(student.name, student)
+                if self._secondary is not None:
+                    self._secondary.add(student)
+            self._write_stats_file()
+
+    # ── Журнал ───────────────────────────────────────────────
+
+    def sync(self):
+        """💽 Сбрасывает накопленные записи журнала на диск (fsync)."""
+        if self._log_file is not None and self._unsynced:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_journal(self):
+        if self._log_file is not None:
+            self.sync()
+            self._log_file.close()
+            self._log_file = None
+
+    def compact(self):
+        """
+        🗜️ Сжимает журнал: переносит все записи в снимок базы
+        и очищает журнал. Возвращает число перенесённых записей.
+        """
+        if not self.journal:
+            return 0
+        with self._lock.exclusive():
+            self.refresh()
+            moved = self._journal_records
+            if not self._log_offset:
+                return 0
+            self._ensure_stats()
+            self._save_records(self._records, keep_indexes=True)
+            self._write_stats_file()
+        return moved
+
+    def close(self):
+        """🔒 Сбрасывает журнал на диск и закрывает файлы."""
+        self._close_journal()
+
+# ─────────────────────────────────────────────────────────────
+# ВЫБОР ХРАНИЛИЩА
+# ─────────────────────────────────────────────────────────────
+
+BACKENDS = ('json', 'sqlite', 'sharded', 'binary')
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+BINARY_EXTENSIONS = ('.bin',)
+SHARDED_EXTENSIONS = ('.shards',)
+
+def detect_backend(path):
+    """🧭 Определяет тип хранилища по расширению файла (каталог - шардированная база)."""
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return 'sqlite'
+    if path.lower().endswith(BINARY_EXTENSIONS):
+        return 'binary'
+    if path.lower().rstrip('/\\').endswith(SHARDED_EXTENSIONS) or os.path.isdir(path):
+        return 'sharded'
+    return 'json'
+
+def open_store(path, backend=None, journal=False):
+    """🗂️ Открывает хранилище нужного типа (по умолчанию - по расширению файла)."""
+    backend = backend or detect_backend(path)
+    if backend == 'sqlite':
+        from sqlite_store import SqliteStudentStore
+        return SqliteStudentStore(path)
+    if backend == 'json':
+        return StudentStore(path, journal=journal)
+    if backend == 'sharded':
+        from sharded_store import ShardedStore
+        return ShardedStore(path, journal=journal)
+    if backend == 'binary':
+        from binary_snapshot import BinaryStore
+        return BinaryStore(path, journal=journal)
+    raise ValueError(f"Неизвестный тип хранилища: {backend}")